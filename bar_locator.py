@@ -0,0 +1,64 @@
+import json
+import os
+import threading
+
+
+class BarLocationPrior:
+    """Learned minigame bar position, persisted per casting area and screen geometry.
+
+    Each key keeps a running mean of where the bar was found. The mean weights
+    the last `MAX_WEIGHT` catches, so it follows a window that was moved.
+    """
+
+    MAX_WEIGHT = 20
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._load()
+
+    @staticmethod
+    def make_key(casting_area, desktop):
+        x, y, w, h = casting_area
+        return f"{x},{y},{w},{h}@{desktop['width']}x{desktop['height']}{desktop['left']:+d}{desktop['top']:+d}"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def predict(self, key):
+        """Returns the expected absolute (x, y) of the bar's top-left corner, or None if never seen."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            return int(round(entry["x"])), int(round(entry["y"]))
+
+    def update(self, key, region):
+        """Records where the bar was actually found (absolute x, y, w, h)."""
+        x, y = region[0], region[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {"x": float(x), "y": float(y), "count": 0}
+                self._entries[key] = entry
+            weight = min(entry["count"], self.MAX_WEIGHT - 1)
+            entry["x"] = (entry["x"] * weight + x) / (weight + 1)
+            entry["y"] = (entry["y"] * weight + y) / (weight + 1)
+            entry["count"] += 1
+            try:
+                self._save()
+            except OSError:
+                pass
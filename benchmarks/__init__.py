@@ -0,0 +1 @@
+"""Headless benchmarks for the detection core. Run from the repository root, e.g. `python -m benchmarks.hotpaths`."""
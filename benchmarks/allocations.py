@@ -0,0 +1,157 @@
+"""Per-frame allocations of the detection paths, plain cv2 outputs vs reused FrameBuffers.
+
+    python -m benchmarks.allocations [--iterations N] [--json PATH]
+
+Runs bobber detection (template match and tracked) and the full-screen bar
+search on a synthetic screen, first with every FrameBuffers in the core
+allocating on each call (reuse=False, the same as plain cv2 calls) and then
+reusing its buffers. The frame source hands out the same frame every time,
+so the grab itself allocates nothing and only the preprocessing is measured.
+
+Per case the results report:
+- FrameBuffers arrays created per frame;
+- peak transient bytes per frame (tracemalloc, which tracks numpy buffers);
+- minor page faults per frame, the kernel side of large allocations;
+- garbage collections and their time over the run (gc.callbacks).
+The case time is the per-frame latency of a separate run without tracemalloc.
+"""
+import gc
+import time
+import tracemalloc
+
+from benchmarks.common import SyntheticFrameSource, make_core, make_parser, measure, write_results
+
+try:
+    import resource
+except ImportError: # Windows: no page fault counters
+    resource = None
+
+
+class StaticFrameSource(SyntheticFrameSource):
+    """Synthetic screen whose grabs return one cached frame per region, so grabbing does not allocate."""
+
+    def __init__(self, resolution, casting_area):
+        super().__init__(resolution, casting_area)
+        self._frames = {}
+
+    def grab(self, monitor):
+        key = (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = self._frames[key] = super().grab(monitor)
+        return frame
+
+
+class GcTimer:
+    """Counts collections and their time via gc.callbacks while active."""
+
+    def __init__(self):
+        self.collections = 0
+        self.seconds = 0.0
+        self._start = None
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.collections += 1
+            self.seconds += time.perf_counter() - self._start
+            self._start = None
+
+    def __enter__(self):
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self._callback)
+
+
+def frame_buffers(core):
+    return [buffers for buffers in (
+        core.buffers,
+        core.bobber_tracker.buffers,
+        core.bobber_bank.buffers if core.bobber_bank is not None else None,
+        core.bar_matcher.buffers if core.bar_matcher is not None else None,
+    ) if buffers is not None]
+
+
+def minor_faults():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt if resource else 0
+
+
+def run_case(label, step, core, reuse, iterations):
+    buffers = frame_buffers(core)
+    for b in buffers:
+        b.reuse = reuse
+        b.clear()
+    for _ in range(5): # Warm up: first-frame buffer allocations are not per-frame cost
+        step()
+
+    allocations = sum(b.allocations for b in buffers)
+    faults = minor_faults()
+    peak_bytes = 0
+    tracemalloc.start()
+    with GcTimer() as gc_timer:
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            step()
+            peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    faults = minor_faults() - faults
+    allocations = sum(b.allocations for b in buffers) - allocations
+
+    stats = measure(step, iterations)
+    return dict(
+        name=f"{label} ({'reused buffers' if reuse else 'allocating'})",
+        allocations_per_frame=allocations / iterations,
+        peak_transient_bytes=peak_bytes,
+        minor_faults_per_frame=faults / iterations,
+        gc_collections=gc_timer.collections,
+        gc_ms=gc_timer.seconds * 1000.0,
+        buffer_bytes=sum(b.nbytes for b in buffers),
+        **stats,
+    )
+
+
+def main():
+    parser = make_parser("Measure per-frame allocations with and without reused frame buffers.")
+    args = parser.parse_args()
+
+    resolution, casting_area = (1920, 1080), (660, 300, 600, 400)
+    source = StaticFrameSource(resolution, casting_area)
+    core = make_core(source, casting_area)
+
+    def detect_bobber():
+        # Like the bite loop: the last detection selects the ROI and keeps the tracker alive
+        result = core._get_bobber_image()
+        core.previous_bobber_image = result if result[0] is not None else None
+
+    def bobber_match():
+        core.BOBBER_TRACKING = False
+        detect_bobber()
+
+    def bobber_tracked():
+        core.BOBBER_TRACKING = True
+        core.bobber_tracker.reanchor_interval = 1 << 30
+        detect_bobber()
+
+    cases = [
+        ("bobber template match", bobber_match, args.iterations),
+        ("bobber tracked", bobber_tracked, args.iterations),
+        ("bar search 1920x1080", core._find_minigame_bar_region, max(10, args.iterations // 10)),
+    ]
+    results = [run_case(label, step, core, reuse, iterations)
+               for label, step, iterations in cases for reuse in (False, True)]
+
+    write_results("allocations", results, args.json)
+    if args.json != "-":
+        print()
+        for case in results:
+            print(f"{case['name']:<48} {case['allocations_per_frame']:4.1f} arrays/frame, "
+                  f"peak {case['peak_transient_bytes'] / 1024:8.1f} KiB, {case['minor_faults_per_frame']:6.1f} faults/frame, "
+                  f"{case['gc_collections']} GCs ({case['gc_ms']:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Minigame bar search: direct full-resolution matchTemplate vs the coarse-to-fine PyramidMatcher.
+
+    python -m benchmarks.bar_search [--iterations N] [--json PATH]
+
+For each screen resolution, both matchers run on the same synthetic desktop
+(bar present, bar absent, and a bar of 1 px vertical stripes at an odd
+offset, which downscaling washes out). The pyramid matcher is configured as
+the core uses it (min_score = BAR_MATCH_THRESHOLD), so a coarse miss falls
+back to the full-resolution search. The results report latency, whether the
+pyramid search made the same decision at the same location as the direct
+search, and how many of its searches fell back.
+"""
+import cv2
+import numpy as np
+
+from benchmarks.common import RESOLUTIONS, SyntheticFrameSource, make_parser, measure, write_results
+from fishing_bot_core import FishingBotCore
+from template_search import PyramidMatcher
+
+
+def direct_match(gray, template):
+    _, max_val, _, max_loc = cv2.minMaxLoc(cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED))
+    return max_val, max_loc
+
+
+def striped_template(shape=(40, 200)):
+    """Alternating 1 px bright/dark columns, like a ticked gauge; halving the resolution blurs it flat."""
+    template = np.full(shape, 30, dtype=np.uint8)
+    template[:, ::2] = 220
+    return template
+
+
+def main():
+    parser = make_parser("Compare direct and pyramid minigame bar search.")
+    parser.add_argument("--levels", type=int, default=FishingBotCore.BAR_PYRAMID_LEVELS, help="Pyramid levels")
+    args = parser.parse_args()
+    iterations = max(10, args.iterations // 10)
+
+    template = cv2.imread(FishingBotCore.MINIGAME_BAR_TEMPLATE_FILENAME, cv2.IMREAD_GRAYSCALE)
+    threshold = FishingBotCore.BAR_MATCH_THRESHOLD
+    stripes = striped_template()
+
+    results = []
+    for width, height in RESOLUTIONS:
+        source = SyntheticFrameSource((width, height), (0, 0, 300, 200))
+        present = cv2.cvtColor(source.grab(source.monitors[0]), cv2.COLOR_BGRA2GRAY)
+        absent = present.copy()
+        bar_x, bar_y = source.bar_pos
+        absent[bar_y:bar_y + template.shape[0], bar_x:bar_x + template.shape[1]] = 40
+        striped = absent.copy()
+        striped[bar_y + 1:bar_y + 1 + stripes.shape[0], bar_x + 1:bar_x + 1 + stripes.shape[1]] = stripes
+
+        for case, gray, tmpl in (("present", present, template), ("absent", absent, template), ("striped, odd offset", striped, stripes)):
+            label = f"{width}x{height} bar {case}"
+            matcher = PyramidMatcher(tmpl, levels=args.levels, min_score=threshold)
+            direct = direct_match(gray, tmpl)
+            pyramid = matcher.match(gray)
+            agrees = (direct[0] >= threshold) == (pyramid[0] >= threshold) and (direct[0] < threshold or direct[1] == pyramid[1])
+
+            results.append(dict(name=f"direct {label}", score=direct[0], **measure(lambda: direct_match(gray, tmpl), iterations)))
+            stats = measure(lambda: matcher.match(gray), iterations)
+            results.append(dict(name=f"pyramid L{matcher.levels} {label}", score=pyramid[0], agrees_with_direct=agrees,
+                                fallback_rate=matcher.fallbacks / (iterations + 6), **stats))
+
+    write_results("bar_search", results, args.json)
+    if args.json != "-":
+        for case in results:
+            if "agrees_with_direct" in case:
+                print(f"{case['name']:<48} score {case['score']:.3f}  same decision/location as direct: {case['agrees_with_direct']}  "
+                      f"full-resolution fallback {case['fallback_rate'] * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from frame_source import FrameSource, ReplayFrameSource
+from fishing_bot_core import FishingBotCore
+
+# Screen resolutions (width, height) and casting area sizes benchmarked by default
+RESOLUTIONS = [(1280, 720), (1920, 1080), (2560, 1440), (3840, 1080)]
+CASTING_AREAS = [(300, 200), (600, 400), (1200, 700)]
+
+
+# --- 1. Synthetic Screen ---
+class SyntheticFrameSource(FrameSource):
+    """A fake desktop with the bobber and minigame bar templates pasted onto textured noise.
+
+    Every grab returns a fresh copy of the requested region, like mss does.
+    """
+
+    def __init__(self, resolution, casting_area, seed=0):
+        width, height = resolution
+        self._monitors = [
+            {"left": 0, "top": 0, "width": width, "height": height},
+            {"left": 0, "top": 0, "width": width, "height": height},
+        ]
+        self.casting_area = casting_area
+
+        rng = np.random.default_rng(seed)
+        noise = rng.integers(0, 90, size=(height // 8 + 1, width // 8 + 1), dtype=np.uint8)
+        background = cv2.resize(noise, (width, height), interpolation=cv2.INTER_LINEAR)
+        self.screen = cv2.cvtColor(background, cv2.COLOR_GRAY2BGRA)
+        self.background = self.screen.copy()
+
+        self.bobber = cv2.imread(FishingBotCore.TEMPLATE_FILENAME, cv2.IMREAD_GRAYSCALE)
+        bar = cv2.imread(FishingBotCore.MINIGAME_BAR_TEMPLATE_FILENAME, cv2.IMREAD_GRAYSCALE)
+
+        # Bobber in the middle of the casting area
+        x, y, w, h = casting_area
+        b_h, b_w = self.bobber.shape
+        self.bobber_home = (x + (w - b_w) // 2, y + (h - b_h) // 2)
+        self.bobber_pos = self.bobber_home
+        self._paste(self.bobber, *self.bobber_pos)
+
+        # Minigame bar just below the screen centre, with a bright marker on its scan line
+        t_h, t_w = bar.shape
+        self.bar_pos = ((width - t_w) // 2, height // 2 + 60)
+        self._paste(bar, *self.bar_pos)
+
+    def _paste(self, gray, x, y):
+        h, w = gray.shape
+        self.screen[y:y + h, x:x + w, :3] = gray[..., np.newaxis]
+
+    def move_bobber(self, x, y):
+        """Moves the bobber's top-left corner to absolute (x, y), restoring the background behind it."""
+        old_x, old_y = self.bobber_pos
+        b_h, b_w = self.bobber.shape
+        self.screen[old_y:old_y + b_h, old_x:old_x + b_w] = self.background[old_y:old_y + b_h, old_x:old_x + b_w]
+        self.bobber_pos = (x, y)
+        self._paste(self.bobber, x, y)
+
+    def add_marker(self, scan_monitor, position, width=6):
+        """Paints a bright minigame marker onto a scan line region."""
+        top, left = scan_monitor["top"], scan_monitor["left"]
+        rows = scan_monitor["height"]
+        self.screen[top:top + rows, left + position:left + position + width, :3] = 255
+
+    @property
+    def monitors(self):
+        return self._monitors
+
+    def grab(self, monitor):
+        top, left = monitor["top"], monitor["left"]
+        return self.screen[top:top + monitor["height"], left:left + monitor["width"]].copy()
+
+
+# --- 2. Recorded Screen ---
+class RecordedFrameSource(FrameSource):
+    """Serves recorded frames by region: each grab cycles through the frames recorded for that region.
+
+    A request for a region that was never recorded exactly is served as a slice
+    of a recorded region that contains it.
+    """
+
+    def __init__(self, path):
+        self.replay = ReplayFrameSource(path)
+        self.regions = {}
+        for index in range(len(self.replay)):
+            _, monitor, frame = self.replay.frame(index)
+            key = (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+            self.regions.setdefault(key, []).append(frame)
+        self._cursor = {}
+
+    @property
+    def monitors(self):
+        return self.replay.monitors
+
+    def grab(self, monitor):
+        key = (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+        if key not in self.regions:
+            for left, top, width, height in self.regions:
+                x, y = key[0] - left, key[1] - top
+                if x >= 0 and y >= 0 and x + key[2] <= width and y + key[3] <= height:
+                    frames = self.regions[(left, top, width, height)]
+                    index = self._cursor.get(key, 0)
+                    self._cursor[key] = (index + 1) % len(frames)
+                    return frames[index][y:y + key[3], x:x + key[2]]
+            raise ValueError(f"No recorded frames cover {monitor}.")
+
+        frames = self.regions[key]
+        index = self._cursor.get(key, 0)
+        self._cursor[key] = (index + 1) % len(frames)
+        return frames[index]
+
+
+
+# --- 3. Timing ---
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(pct / 100.0 * (len(sorted_samples) - 1)))))
+    return sorted_samples[index]
+
+
+def measure(fn, iterations, warmup=5):
+    """Runs fn() repeatedly and returns latency percentiles (ms) and throughput (calls/sec)."""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    total = time.perf_counter() - start
+    return summarize(samples, total)
+
+
+def summarize(samples, total=None):
+    """Percentiles (ms) of latency samples in ms; throughput over `total` seconds (default: sum of samples)."""
+    samples = sorted(samples)
+    if total is None:
+        total = sum(samples) / 1000.0
+    return {
+        "iterations": len(samples),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+        "mean_ms": sum(samples) / len(samples),
+        "throughput_per_sec": len(samples) / total if total > 0 else 0.0,
+    }
+
+
+# --- 4. Command Line / Output ---
+def make_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per case")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON to PATH ('-' for stdout)")
+    parser.add_argument("--recording", metavar="PATH", help="Use frames from a FrameRecorder file instead of synthetic ones")
+    parser.add_argument("--area", metavar="X,Y,W,H", help="Casting area of the recording (default: largest recorded region)")
+    return parser
+
+
+def recorded_casting_area(source, area_arg=None):
+    """Casting area for a recording: --area if given, else the largest recorded region that is not the full desktop."""
+    if area_arg:
+        return tuple(int(v) for v in area_arg.split(","))
+    desktop = source.monitors[0]
+    desktop_key = (desktop["left"], desktop["top"], desktop["width"], desktop["height"])
+    candidates = [key for key in source.regions if key != desktop_key and key[3] > 10]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda key: key[2] * key[3])
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def print_table(results):
+    header = f"{'case':<48} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>10}"
+    print(header)
+    print("-" * len(header))
+    for case in results:
+        print(f"{case['name']:<48} {case['p50_ms']:>9.3f} {case['p95_ms']:>9.3f} {case['p99_ms']:>9.3f} {case['throughput_per_sec']:>10.1f}")
+
+
+def write_results(suite, results, json_path, extra=None):
+    """Prints the result table and optionally writes JSON for run-to-run comparison."""
+    if json_path != "-":
+        print_table(results)
+    if not json_path:
+        return
+
+    payload = {"suite": suite, "environment": environment(), "results": results}
+    if extra:
+        payload.update(extra)
+    text = json.dumps(payload, indent=2)
+    if json_path == "-":
+        print(text)
+    else:
+        with open(json_path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"\nResults written to {json_path}", file=sys.stderr)
+
+
+def make_core(frame_source, casting_area, input_backend=None, pipelined=False):
+    """Builds a core on `frame_source` (inline unless `pipelined`) with logging silenced."""
+    return FishingBotCore(
+        casting_area_ref={"area": casting_area},
+        log_callback=lambda message: None,
+        frame_source=frame_source,
+        pipelined=pipelined,
+        input_backend=input_backend,
+    )
@@ -0,0 +1,73 @@
+"""Full-area bobber search: cv2.matchTemplate vs FFT correlation with cached template spectra.
+
+    python -m benchmarks.fft_match [--iterations N] [--json PATH]
+
+Runs FftMatcher's direct and FFT paths and its automatic choice over whole
+synthetic casting areas and full screens (no ROI). The automatic matcher
+is calibrated on each area before it is timed. Per case the results report:
+- the cost per search;
+- the largest difference from cv2.matchTemplate's TM_CCOEFF_NORMED map;
+- whether the best location agrees.
+The auto cases also report the measured crossover (None: direct was faster
+at every calibrated size) and the path it chose.
+"""
+import cv2
+import numpy as np
+
+from benchmarks.common import CASTING_AREAS, RESOLUTIONS, SyntheticFrameSource, make_parser, measure, write_results
+from fishing_bot_core import FishingBotCore
+from template_search import FftMatcher
+
+
+def search_areas():
+    """(label, gray image) for each casting area and each full screen, bobber present."""
+    areas = []
+    for area_w, area_h in CASTING_AREAS:
+        casting_area = ((1920 - area_w) // 2, (1080 - area_h) // 3, area_w, area_h)
+        source = SyntheticFrameSource((1920, 1080), casting_area)
+        x, y, w, h = casting_area
+        areas.append((f"casting area {w}x{h}", cv2.cvtColor(source.screen[y:y + h, x:x + w], cv2.COLOR_BGRA2GRAY)))
+    for width, height in RESOLUTIONS:
+        source = SyntheticFrameSource((width, height), (width // 4, height // 4, width // 2, height // 2))
+        areas.append((f"full screen {width}x{height}", cv2.cvtColor(source.screen, cv2.COLOR_BGRA2GRAY)))
+    return areas
+
+
+def main():
+    parser = make_parser("Compare direct and FFT template correlation over full search areas.")
+    args = parser.parse_args()
+    iterations = max(10, args.iterations // 10)
+
+    template = cv2.imread(FishingBotCore.TEMPLATE_FILENAME, cv2.IMREAD_GRAYSCALE)
+    results = []
+    for label, gray in search_areas():
+        reference = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
+        _, _, _, reference_loc = cv2.minMaxLoc(reference)
+        for method in ("direct", "fft", "auto"):
+            matcher = FftMatcher(template, method)
+            if method == "auto":
+                matcher.calibrate(gray)
+            result = matcher.match(gray)
+            _, _, _, max_loc = cv2.minMaxLoc(result)
+            case = dict(
+                name=f"{method} {label}",
+                max_abs_diff=float(np.abs(result - reference).max()),
+                same_location=max_loc == reference_loc,
+                **measure(lambda: matcher.match(gray), iterations),
+            )
+            if method == "auto":
+                case.update(crossover_pixels=matcher.crossover_pixels, chose="fft" if matcher.uses_fft(gray) else "direct")
+            results.append(case)
+
+    write_results("fft_match", results, args.json, extra={"template_shape": list(template.shape)})
+    if args.json != "-":
+        print()
+        for case in results:
+            line = f"{case['name']:<40} max diff vs matchTemplate {case['max_abs_diff']:.2e}, same location: {case['same_location']}"
+            if "chose" in case:
+                line += f", crossover {case['crossover_pixels']} px -> {case['chose']}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
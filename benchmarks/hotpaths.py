@@ -0,0 +1,133 @@
+"""Latency and throughput of the detection hot paths.
+
+    python -m benchmarks.hotpaths [--iterations N] [--json PATH] [--recording FILE [--area X,Y,W,H]]
+
+Cases: _get_bobber_image (full-area, ROI and tracked), _check_for_bite,
+_find_minigame_bar_region and one minigame_loop scan iteration, over every
+screen resolution x casting area size (synthetic frames) or over the regions
+found in a recording.
+"""
+from benchmarks.common import (
+    CASTING_AREAS, RESOLUTIONS, RecordedFrameSource, SyntheticFrameSource,
+    make_core, make_parser, measure, recorded_casting_area, write_results,
+)
+
+
+def scan_monitor_for(core, bar_region):
+    """Same scan-line region minigame_loop computes for a bar at `bar_region`."""
+    x_bar, y_bar, w_bar, _ = bar_region
+    return {
+        "top": y_bar + core.MINIGAME_SCAN_Y_OFFSET - core.MINIGAME_SCAN_ROWS // 2,
+        "left": x_bar + w_bar // 2 - core.MINIGAME_SCAN_WIDTH // 2,
+        "width": core.MINIGAME_SCAN_WIDTH,
+        "height": core.MINIGAME_SCAN_ROWS,
+    }
+
+
+def bobber_cases(core, label, iterations):
+    results = []
+
+    def full_area():
+        core.previous_bobber_image = None
+        core._get_bobber_image()
+
+    results.append(dict(name=f"get_bobber_image/full {label}", **measure(full_area, iterations)))
+
+    first = core._get_bobber_image()
+    if first[0] is None:
+        return results
+
+    # The ROI case measures the template match itself, so the tracker is dropped before each call
+    def roi():
+        core.previous_bobber_image = first
+        core.bobber_tracker.reset()
+        core._get_bobber_image()
+
+    results.append(dict(name=f"get_bobber_image/roi {label}", **measure(roi, iterations)))
+
+    def tracked():
+        core.previous_bobber_image = first
+        core._get_bobber_image()
+
+    core.bobber_tracker.reset()
+    results.append(dict(name=f"get_bobber_image/tracked {label}", **measure(tracked, iterations)))
+
+    core.previous_bobber_image = first
+    core.initial_bobber_y = first[2][1]
+    results.append(dict(name=f"check_for_bite {label}", **measure(core._check_for_bite, iterations)))
+    return results
+
+
+def minigame_cases(core, label, iterations, scan_monitor=None):
+    results = []
+    results.append(dict(name=f"find_minigame_bar_region {label}", **measure(core._find_minigame_bar_region, max(10, iterations // 10))))
+
+    bar_region = core._find_minigame_bar_region()
+    if scan_monitor is None and bar_region is not None:
+        scan_monitor = scan_monitor_for(core, bar_region)
+    if scan_monitor is None:
+        return results, None
+
+    def scan_iteration():
+        core.scanline_analyzer.analyze(core.frame_source.grab(scan_monitor))
+
+    results.append(dict(name=f"minigame_scan {label}", **measure(scan_iteration, iterations)))
+    return results, scan_monitor
+
+
+def run_synthetic(iterations):
+    results = []
+    for resolution in RESOLUTIONS:
+        for area_w, area_h in CASTING_AREAS:
+            if area_w > resolution[0] or area_h > resolution[1]:
+                continue
+            casting_area = ((resolution[0] - area_w) // 2, (resolution[1] - area_h) // 3, area_w, area_h)
+            source = SyntheticFrameSource(resolution, casting_area)
+            core = make_core(source, casting_area)
+            label = f"{resolution[0]}x{resolution[1]} area {area_w}x{area_h}"
+            results += bobber_cases(core, label, iterations)
+
+        # Bar search and minigame scan depend only on the screen size
+        source = SyntheticFrameSource(resolution, casting_area)
+        core = make_core(source, casting_area)
+        bar_region = core._find_minigame_bar_region()
+        if bar_region is not None:
+            source.add_marker(scan_monitor_for(core, bar_region), position=120)
+        results += minigame_cases(core, f"{resolution[0]}x{resolution[1]}", iterations)[0]
+    return results
+
+
+def run_recording(path, area_arg, iterations):
+    source = RecordedFrameSource(path)
+    casting_area = recorded_casting_area(source, area_arg)
+    core = make_core(source, casting_area)
+    results = []
+
+    if casting_area:
+        results += bobber_cases(core, f"recorded area {casting_area[2]}x{casting_area[3]}", iterations)
+
+    desktop = source.monitors[0]
+    desktop_key = (desktop["left"], desktop["top"], desktop["width"], desktop["height"])
+    if desktop_key in source.regions:
+        scan_keys = [key for key in source.regions if key[2] == core.MINIGAME_SCAN_WIDTH and key[3] <= 10]
+        scan_monitor = None
+        if scan_keys:
+            left, top, width, height = scan_keys[0]
+            scan_monitor = {"left": left, "top": top, "width": width, "height": height}
+        results += minigame_cases(core, f"recorded {desktop['width']}x{desktop['height']}", iterations, scan_monitor)[0]
+    return results
+
+
+def main():
+    parser = make_parser("Benchmark the detection hot paths on synthetic or recorded frames.")
+    args = parser.parse_args()
+
+    if args.recording:
+        results = run_recording(args.recording, args.area, args.iterations)
+    else:
+        results = run_synthetic(args.iterations)
+    write_results("hotpaths", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Minigame input: level-triggered pyautogui calls with PAUSE vs the edge-triggered backend.
+
+    python -m benchmarks.input_latency [--duration S] [--pause S] [--json PATH]
+
+Runs minigame_loop against a synthetic marker that swings across
+MINIGAME_REEL_STOP_X, with input going to a RecordingInputBackend. The old
+behaviour is emulated by sending the reel button on every iteration
+(force=True) with `--pause` seconds of cost per event. That is pyautogui's
+default PAUSE of 0.1 s. The new path sends only transitions, and each event
+costs `--event-cost` (a no-pause OS call). Both run inline and pipelined.
+
+Reaction time is measured from the moment the marker crosses the stop
+column to the button event that follows. minigame_loop's random hold delays
+are off unless --hold-delays is given, so only the input path is compared. The results report:
+- reaction time per transition (p50/p95/mean);
+- the events sent and the redundant calls that were skipped;
+- minigame iterations per second.
+"""
+import math
+import random
+import time
+
+import cv2
+
+from benchmarks.common import SyntheticFrameSource, make_core, make_parser, summarize, write_results
+from fishing_bot_core import FishingBotCore
+from input_backend import RecordingInputBackend
+
+SWING_PERIOD = 0.8 # Seconds per marker swing across the stop column
+
+
+class MarkerFrameSource(SyntheticFrameSource):
+    """Synthetic screen whose minigame marker swings across the reel stop column in real time."""
+
+    def __init__(self, resolution, casting_area, duration):
+        super().__init__(resolution, casting_area)
+        bar_h, bar_w = cv2.imread(FishingBotCore.MINIGAME_BAR_TEMPLATE_FILENAME, cv2.IMREAD_GRAYSCALE).shape
+        self.bar_region = self.bar_pos + (bar_w, bar_h)
+        self.scan_monitor = None # Set from the core's scan-line constants
+        self.stop_x = FishingBotCore.MINIGAME_REEL_STOP_X
+        self.duration = duration
+        self.start = time.perf_counter()
+
+    def position(self, t):
+        return int(self.stop_x - 60 * math.cos(2 * math.pi * t / SWING_PERIOD)) # Starts left of the stop column
+
+    def grab(self, monitor):
+        if monitor == self.scan_monitor:
+            t = time.perf_counter() - self.start
+            top, left = monitor["top"], monitor["left"]
+            rows, width = monitor["height"], monitor["width"]
+            self.screen[top:top + rows, left:left + width] = self.background[top:top + rows, left:left + width]
+            if t < self.duration:
+                self.add_marker(monitor, self.position(t))
+        return super().grab(monitor)
+
+
+def reaction_times(source, events, step=0.0001):
+    """ms from each moment the marker crosses the stop column to the button event that follows it."""
+    button_events = [(t, name == "mouse_down") for t, name, _ in events if name in ("mouse_down", "mouse_up")]
+    samples = []
+    state = False # Released at minigame start
+    for i in range(int(source.duration / step)):
+        held = source.position(i * step) <= source.stop_x
+        if held == state:
+            continue
+        state = held
+        crossed = source.start + i * step
+        sent = next((t for t, down in button_events if down == held and t >= crossed), None)
+        if sent is not None:
+            samples.append((sent - crossed) * 1000.0)
+    return samples
+
+
+def run_case(args, edge_triggered, pipelined):
+    random.seed(0) # Same random hold delays in every case
+    random_random = random.random
+    if not args.hold_delays:
+        random.random = lambda: 1.0 # minigame_loop never draws its 1/3 hold delay
+    resolution, casting_area = (1920, 1080), (660, 300, 600, 400)
+    backend = RecordingInputBackend(resolution, event_cost=args.event_cost if edge_triggered else args.pause)
+    source = MarkerFrameSource(resolution, casting_area, args.duration)
+    core = make_core(source, casting_area, input_backend=backend, pipelined=pipelined)
+    bar_region = source.bar_region
+    source.scan_monitor = {
+        "top": bar_region[1] + core.MINIGAME_SCAN_Y_OFFSET - core.MINIGAME_SCAN_ROWS // 2,
+        "left": bar_region[0] + bar_region[2] // 2 - core.MINIGAME_SCAN_WIDTH // 2,
+        "width": core.MINIGAME_SCAN_WIDTH,
+        "height": core.MINIGAME_SCAN_ROWS,
+    }
+
+    if not edge_triggered:
+        # Old path: the reel button call is sent on every iteration
+        core._set_reel = lambda held: core._dispatch_input(
+            backend.mouse_down if held else backend.mouse_up, "left", force=True, key="left_button")
+
+    core.current_minigame_region = bar_region
+    core.is_running.set()
+    if pipelined:
+        core.pipeline.start()
+    source.start = time.perf_counter()
+    try:
+        core.minigame_loop()
+    finally:
+        random.random = random_random
+        if pipelined:
+            core.pipeline.stop()
+        core.is_running.clear()
+
+    reactions = reaction_times(source, backend.events)
+    elapsed = time.perf_counter() - source.start
+    label = f"{'edge-triggered, no pause' if edge_triggered else f'every iteration, {args.pause * 1000:.0f} ms pause'}" \
+            f" ({'pipelined' if pipelined else 'inline'})"
+    return dict(name=label, transitions=len(reactions), events_sent=backend.sent, redundant_skipped=backend.suppressed,
+                iterations_per_sec=core.scanline_analyzer.scan_count / elapsed, **summarize(reactions or [0.0]))
+
+
+def main():
+    parser = make_parser("Compare minigame input reaction time of the old and new input paths.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of minigame per case")
+    parser.add_argument("--pause", type=float, default=0.1, help="Per-call pause of the old path (pyautogui.PAUSE)")
+    parser.add_argument("--event-cost", type=float, default=0.0005, help="Cost of one OS input event (seconds)")
+    parser.add_argument("--hold-delays", action="store_true", help="Keep minigame_loop's random 0.2~0.3 s hold delays (off: input path only)")
+    args = parser.parse_args()
+
+    results = [run_case(args, edge, pipelined) for pipelined in (False, True) for edge in (False, True)]
+    write_results("input_latency", results, args.json,
+                  extra={"pause_s": args.pause, "event_cost_s": args.event_cost, "hold_delays": args.hold_delays})
+    if args.json != "-":
+        print()
+        for case in results:
+            print(f"{case['name']:<48} reaction {case['mean_ms']:6.1f} ms mean over {case['transitions']} transitions, "
+                  f"{case['events_sent']} events sent, {case['redundant_skipped']} skipped, {case['iterations_per_sec']:.0f} it/s")
+
+
+if __name__ == "__main__":
+    main()
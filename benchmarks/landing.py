@@ -0,0 +1,107 @@
+"""Bobber landing latency: visual settle detection vs the old fixed post-cast wait.
+
+    python -m benchmarks.landing [--casts N] [--json PATH]
+
+A synthetic cast flies the bobber across the casting area, lets it bob with
+a decaying amplitude, and then leaves it at rest. Flight and settle times
+vary per cast. _wait_for_landing runs against this in real time, at the
+core's landing pacing rate. The results report:
+- the latency from the end of the cast to the landing call;
+- how early or late that call was, relative to the bobber coming to rest;
+- the vertical error of the stored initial position.
+The old path always slept 2.0 s and then matched once. Its row is that
+fixed wait plus the measured cost of one match.
+"""
+import math
+import random
+import time
+
+from benchmarks.common import SyntheticFrameSource, make_core, make_parser, measure, summarize, write_results
+
+FLIGHT_TIME = (0.5, 0.9)   # Seconds in the air (random per cast)
+SETTLE_TIME = (0.2, 0.5)   # Seconds of decaying bobbing after touching the water
+SETTLE_AMPLITUDE = 6       # Pixels of the first bob
+OLD_FIXED_WAIT = 2.0
+
+
+class CastFrameSource(SyntheticFrameSource):
+    """SyntheticFrameSource whose bobber follows a cast trajectory in real time."""
+
+    def __init__(self, resolution, casting_area, seed=0):
+        super().__init__(resolution, casting_area, seed)
+        self.rng = random.Random(seed)
+        self.cast()
+
+    def cast(self):
+        self.cast_start = time.perf_counter()
+        self.flight = self.rng.uniform(*FLIGHT_TIME)
+        self.settle = self.rng.uniform(*SETTLE_TIME)
+        x, y, w, h = self.casting_area
+        b_h, b_w = self.bobber.shape
+        self.launch = (x + w // 4, y + h - b_h - 1) # Enters from the lower left of the casting area
+
+    @property
+    def rest_time(self):
+        return self.flight + self.settle
+
+    def grab(self, monitor):
+        t = time.perf_counter() - self.cast_start
+        home_x, home_y = self.bobber_home
+        if t < self.flight:
+            f = t / self.flight
+            x = self.launch[0] + (home_x - self.launch[0]) * f
+            y = self.launch[1] + (home_y - self.launch[1]) * f - 40 * math.sin(math.pi * f) # Arc
+        elif t < self.rest_time:
+            s = (t - self.flight) / self.settle
+            x, y = home_x, home_y + SETTLE_AMPLITUDE * (1 - s) * math.sin(s * 4 * math.pi)
+        else:
+            x, y = home_x, home_y
+        self.move_bobber(int(round(x)), int(round(y)))
+        return super().grab(monitor)
+
+
+def main():
+    parser = make_parser("Compare visual bobber landing detection with the old fixed post-cast wait.")
+    parser.add_argument("--casts", type=int, default=10, help="Synthetic casts")
+    args = parser.parse_args()
+
+    casting_area = (660, 300, 600, 400)
+    source = CastFrameSource((1920, 1080), casting_area)
+    core = make_core(source, casting_area)
+    core.is_running.set()
+    rest_center_y = source.bobber_home[1] - casting_area[1] + source.bobber.shape[0] // 2
+
+    latencies, offsets, errors, failures = [], [], [], 0
+    for _ in range(args.casts):
+        source.cast()
+        latency = core._wait_for_landing()
+        if latency is None:
+            failures += 1
+            continue
+        latencies.append(latency * 1000.0)
+        offsets.append((latency - source.rest_time) * 1000.0)
+        errors.append(abs(core.previous_bobber_image[2][1] - rest_center_y))
+
+    # Old path: fixed sleep, then one match of the (resting) bobber
+    source.cast_start -= 10.0
+    core.previous_bobber_image = None
+    match = measure(core._get_bobber_image, 20)
+
+    results = [
+        dict(name=f"fixed {OLD_FIXED_WAIT:.1f} s wait + 1 match (old)", **summarize([OLD_FIXED_WAIT * 1000.0 + match["mean_ms"]])),
+        dict(name="visual landing detection", failures=failures, after_rest_ms_mean=sum(offsets) / max(1, len(offsets)),
+             after_rest_ms_min=min(offsets, default=0.0), max_initial_y_error_px=max(errors, default=0), **summarize(latencies)),
+    ]
+    core.is_running.clear()
+    write_results("landing", results, args.json, extra={
+        "stable_frames": core.LANDING_STABLE_FRAMES, "stable_px": core.LANDING_STABLE_PX,
+        "landing_rate_hz": core.PACING_RATES["landing"],
+    })
+    if args.json != "-":
+        visual = results[1]
+        print(f"\nLanded {visual['after_rest_ms_mean']:.0f} ms after the bobber came to rest on average (earliest {visual['after_rest_ms_min']:.0f} ms), "
+              f"initial Y error <= {visual['max_initial_y_error_px']} px, {failures} failed casts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""CPU cost of drawing the 3D fish logo: immediate mode vs display lists.
+
+    python -m benchmarks.logo_render [--iterations N] [--json PATH]
+
+Opens a hidden FishGLCanvas and times on_draw() (with glFinish) in both
+modes. Mesa's software rasterizer is used unless LIBGL_ALWAYS_SOFTWARE is
+already set. The results report wall time per frame and the CPU time the
+drawing thread spends per frame, which is the GUI thread's cost in the
+app. A separate case times the per-frame Python normal computation that
+the old code did and is now done once at import.
+
+Needs wxPython, PyOpenGL and a display (on a headless Linux box: xvfb-run).
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("LIBGL_ALWAYS_SOFTWARE", "1")
+
+from benchmarks.common import make_parser, measure, write_results
+
+try:
+    import wx
+    from OpenGL.GL import glFinish
+    import fish
+except ImportError as e:
+    wx = None
+    IMPORT_ERROR = e
+
+
+def timed_frames(canvas, retained, iterations):
+    canvas.retained_mode = retained
+    cpu_ms = []
+
+    def frame():
+        start = time.thread_time()
+        canvas.on_timer(None)
+        canvas.on_draw()
+        glFinish()
+        cpu_ms.append((time.thread_time() - start) * 1000.0)
+
+    stats = measure(frame, iterations)
+    samples = cpu_ms[-iterations:]
+    stats["gui_thread_cpu_ms_mean"] = sum(samples) / len(samples)
+    return stats
+
+
+def main():
+    parser = make_parser("Compare immediate-mode and display-list drawing of the 3D fish logo.")
+    args = parser.parse_args()
+    if wx is None:
+        sys.exit(f"logo_render needs wxPython and PyOpenGL: {IMPORT_ERROR}")
+
+    app = wx.App(False)
+    frame = wx.Frame(None, size=(260, 220))
+    canvas = fish.FishGLCanvas(frame, size=(200, 150))
+    canvas.timer.Stop() # Frames are driven by the benchmark
+    frame.Show()
+    wx.SafeYield()
+    canvas.SetCurrent(canvas.context)
+
+    faces = fish.FISH_FACES_BODY_MAIN + fish.FISH_FACES_TAIL + fish.FISH_FACES_FINS
+    results = [
+        dict(name="per-frame normals (old, pure Python)",
+             **measure(lambda: [fish._calculate_normal(*face) for face in faces], args.iterations)),
+        dict(name="draw immediate mode", **timed_frames(canvas, False, args.iterations)),
+        dict(name="draw display lists", **timed_frames(canvas, True, args.iterations)),
+    ]
+
+    write_results("logo_render", results, args.json, extra={"gl_software": os.environ.get("LIBGL_ALWAYS_SOFTWARE")})
+    if args.json != "-":
+        for case in results[1:]:
+            print(f"{case['name']:<48} GUI thread CPU {case['gui_thread_cpu_ms_mean']:.3f} ms/frame")
+
+    canvas.release_display_lists()
+    frame.Destroy()
+    app.Destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Threshold vs predictive minigame reel controller on a simulated marker.
+
+    python -m benchmarks.minigame_controller [--seconds S] [--latency MS,MS,...] [--json PATH]
+
+The marker is modelled as a mass pushed right while the reel is held and
+pulled left while it is released, with drag and a slowly varying random
+pull from the fish. The controller samples it at the minigame pacing rate
+(PACING_RATES["minigame"]), with +-1 px of scan jitter. Each decision takes effect `latency` ms after
+the frame it was made on, which stands for capture age, input queue and
+the OS call. Both controllers get the same seed per latency.
+
+Per case the results report:
+- how far the marker overshoots past the stop column (max and p95);
+- the mean distance from the stop column;
+- reel transitions per second.
+The case time is the controller's per-sample cost.
+"""
+import random
+import time
+from collections import deque
+
+from benchmarks.common import make_parser, summarize, write_results
+from fishing_bot_core import FishingBotCore
+from minigame_controller import make_controller
+
+SCAN_WIDTH = FishingBotCore.MINIGAME_SCAN_WIDTH
+REEL_ACCEL = 900.0   # px/s^2 while held (to the right)
+SINK_ACCEL = 700.0   # px/s^2 while released (to the left)
+DRAG = 2.0           # 1/s velocity damping
+FISH_PULL = 300.0    # px/s^2 amplitude of the fish's random pull
+SIM_STEP = 0.0005    # Seconds per physics step
+SCAN_JITTER = (-1, 0, 0, 1) # Pixels of detection noise per scan
+
+
+def simulate(kind, latency, seconds, rate_hz, seed):
+    rng = random.Random(seed)
+    stop_x = FishingBotCore.MINIGAME_REEL_STOP_X
+    controller = make_controller(kind, stop_x, FishingBotCore.MINIGAME_HYSTERESIS_PX, FishingBotCore.MINIGAME_VELOCITY_WINDOW)
+
+    x, v, held = stop_x - 60.0, 0.0, False
+    pull, next_pull_change = 0.0, 0.0
+    pending = deque() # (apply time, held)
+    period = 1.0 / rate_hz
+    next_sample = 0.0
+    past_stop, errors, cost_ms = [], [], []
+
+    t = 0.0
+    while t < seconds:
+        if t >= next_pull_change:
+            pull = rng.uniform(-FISH_PULL, FISH_PULL)
+            next_pull_change = t + rng.uniform(0.2, 0.8)
+        while pending and pending[0][0] <= t:
+            held = pending.popleft()[1]
+
+        if t >= next_sample:
+            next_sample += period
+            position = int(min(SCAN_WIDTH - 1, max(0, x + rng.choice(SCAN_JITTER))))
+            t0 = time.perf_counter()
+            decision = controller.update(position, t, latency)
+            cost_ms.append((time.perf_counter() - t0) * 1000.0)
+            pending.append((t + latency, decision))
+            past_stop.append(max(0, position - stop_x))
+            errors.append(abs(position - stop_x))
+
+        accel = (REEL_ACCEL if held else -SINK_ACCEL) + pull - DRAG * v
+        v += accel * SIM_STEP
+        x += v * SIM_STEP
+        if x < 0 or x > SCAN_WIDTH - 1:
+            x, v = min(SCAN_WIDTH - 1, max(0.0, x)), 0.0
+        t += SIM_STEP
+
+    past_sorted = sorted(past_stop)
+    return dict(
+        max_past_stop_px=past_sorted[-1],
+        p95_past_stop_px=past_sorted[int(0.95 * (len(past_sorted) - 1))],
+        mean_abs_error_px=sum(errors) / len(errors),
+        transitions_per_sec=controller.transitions / seconds,
+        **summarize(cost_ms),
+    )
+
+
+def main():
+    parser = make_parser("Compare the threshold and predictive minigame controllers on a simulated marker.")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Simulated minigame seconds per case")
+    parser.add_argument("--latency", default="10,30,60", help="Capture-to-input latencies to simulate (ms, comma-separated)")
+    args = parser.parse_args()
+
+    rate_hz = FishingBotCore.PACING_RATES["minigame"]
+    results = []
+    for latency_ms in [float(v) for v in args.latency.split(",")]:
+        for kind in ("threshold", "predictive"):
+            stats = simulate(kind, latency_ms / 1000.0, args.seconds, rate_hz, seed=int(latency_ms))
+            results.append(dict(name=f"{kind} @ {latency_ms:.0f} ms latency", latency_ms=latency_ms, **stats))
+
+    write_results("minigame_controller", results, args.json, extra={"rate_hz": rate_hz})
+    if args.json != "-":
+        print()
+        for case in results:
+            print(f"{case['name']:<36} past stop max {case['max_past_stop_px']:3d} px / p95 {case['p95_past_stop_px']:3d} px, "
+                  f"mean error {case['mean_abs_error_px']:5.1f} px, {case['transitions_per_sec']:5.1f} transitions/s")
+
+
+if __name__ == "__main__":
+    main()
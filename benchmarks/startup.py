@@ -0,0 +1,98 @@
+"""Startup cost: import time per module and GUI time-to-first-paint.
+
+    python -m benchmarks.startup [--runs N] [--json PATH]
+
+Every measurement runs in a fresh interpreter.
+- import/<module>: cumulative import time reported by `python -X importtime`.
+  The table shows the GUI's imports first (wx, the GUI modules, main),
+  then the ones that now load after the window is up (fish/OpenGL,
+  fishing_bot_core and its dependencies).
+- gui/first_paint and gui/core_ready: main.py started with the startup
+  probe. The values are ms from the start of main.py's imports to the
+  first paint of the window and to the detection engine being ready.
+  These cases need wxPython and a display.
+Modules that are not installed are listed as unavailable.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+
+from benchmarks.common import make_parser, summarize, write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded before the window is shown
+EAGER_MODULES = ["wx", "keyboard", "log_sink", "gui_components", "main"]
+# Loaded after the window is shown (detection engine thread) or on first use (Settings tab logo)
+DEFERRED_MODULES = ["numpy", "cv2", "mss", "pyautogui", "fishing_bot_core", "OpenGL.GL", "fish"]
+
+FIRST_PAINT_TIMEOUT = 60.0
+
+
+def run_python(args, env=None, timeout=60.0):
+    return subprocess.run([sys.executable] + args, cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+
+
+def import_time_ms(module):
+    """Cumulative import time of `module` in a fresh interpreter (None if it cannot be imported)."""
+    proc = run_python(["-X", "importtime", "-c", f"import {module}"])
+    if proc.returncode != 0:
+        return None
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s?(.*)$", line)
+        if match and match.group(2).strip() == module and not match.group(2).startswith(" "):
+            cumulative = int(match.group(1)) / 1000.0
+    return cumulative
+
+
+def startup_probe():
+    """(first_paint_ms, core_ready_ms) of one main.py start, or None without wx / a display."""
+    env = dict(os.environ, FISHING_BOT_STARTUP_PROBE="1")
+    try:
+        proc = run_python(["main.py"], env=env, timeout=FIRST_PAINT_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return None
+    match = re.search(r"STARTUP core_ready_ms=([\d.]+) first_paint_ms=([\d.]+)", proc.stdout)
+    if not match:
+        return None
+    return float(match.group(2)), float(match.group(1))
+
+
+def main():
+    parser = make_parser("Measure import time per module and GUI time-to-first-paint.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per case")
+    args = parser.parse_args()
+
+    results, unavailable = [], []
+    for phase, modules in (("before window", EAGER_MODULES), ("deferred", DEFERRED_MODULES)):
+        for module in modules:
+            samples = [import_time_ms(module) for _ in range(args.runs)]
+            if any(sample is None for sample in samples):
+                unavailable.append(module)
+                continue
+            results.append(dict(name=f"import/{module} ({phase})", **summarize(samples)))
+
+    interpreter = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        run_python(["-c", "pass"])
+        interpreter.append((time.perf_counter() - start) * 1000.0)
+    results.append(dict(name="interpreter start (python -c pass)", **summarize(interpreter)))
+
+    probes = [startup_probe() for _ in range(args.runs)]
+    if all(probes):
+        results.append(dict(name="gui/first_paint", **summarize([p[0] for p in probes])))
+        results.append(dict(name="gui/core_ready", **summarize([p[1] for p in probes])))
+    else:
+        unavailable.append("gui (needs wxPython and a display)")
+
+    write_results("startup", results, args.json, extra={"unavailable": unavailable})
+    if unavailable and args.json != "-":
+        print(f"\nUnavailable here: {', '.join(unavailable)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Bobber template bank: sequential vs thread-pool matching of several templates.
+
+    python -m benchmarks.template_bank [--iterations N] [--json PATH] [--templates N] [--bank DIR]
+
+The bank is the bobber template plus the *.png files of --bank, or
+synthetic lighting variants of the bobber template (gamma tone curves,
+some blurred) when no directory is given. For each casting area, the
+most extreme variant is pasted as the bobber and the bank is matched with 1, 2,
+4... threads. The results report the cost per frame, the speedup over one
+thread, the winning template and its score, and the single-template score
+as a baseline.
+"""
+import os
+
+import cv2
+import numpy as np
+
+from benchmarks.common import CASTING_AREAS, SyntheticFrameSource, make_parser, measure, write_results
+from fishing_bot_core import FishingBotCore
+from template_bank import TemplateBank
+
+
+def lighting_variants(template, count):
+    """`count` templates: the original, then gamma/blur variants mimicking other lighting.
+
+    TM_CCOEFF_NORMED ignores plain gain and offset, so the variants use
+    non-linear tone curves (night, glare) to make the templates differ.
+    """
+    variants, names = [template], ["original"]
+    gammas = np.geomspace(0.35, 3.0, max(1, count - 1))
+    normalized = template.astype(np.float32) / 255.0
+    for i, gamma in enumerate(gammas[:count - 1]):
+        variant = (np.power(normalized, gamma) * 255.0).astype(np.uint8)
+        if i % 2:
+            variant = cv2.GaussianBlur(variant, (5, 5), 0)
+        variants.append(variant)
+        names.append(f"gamma{gamma:.2f}{'_blur' if i % 2 else ''}")
+    return variants, names
+
+
+def worker_counts(bank_size):
+    """1, 2, 4, ... threads up to one per template, plus one per CPU core."""
+    counts, n = [], 1
+    while n < bank_size:
+        counts.append(n)
+        n *= 2
+    counts += [bank_size, min(bank_size, os.cpu_count() or 1)]
+    return sorted(set(counts))
+
+
+def main():
+    parser = make_parser("Compare sequential and thread-pool matching of a bobber template bank.")
+    parser.add_argument("--templates", type=int, default=8, help="Synthetic bank size (ignored with --bank)")
+    parser.add_argument("--bank", help="Directory of extra bobber templates (*.png)")
+    args = parser.parse_args()
+
+    primary = cv2.imread(FishingBotCore.TEMPLATE_FILENAME, cv2.IMREAD_GRAYSCALE)
+    if args.bank:
+        loaded = TemplateBank.load(FishingBotCore.TEMPLATE_FILENAME, args.bank)
+        templates, names = loaded.templates, loaded.names
+    else:
+        templates, names = lighting_variants(primary, max(1, args.templates))
+    scene_template = templates[-1]
+
+    results = []
+    for area_w, area_h in CASTING_AREAS:
+        casting_area = ((1920 - area_w) // 2, (1080 - area_h) // 3, area_w, area_h)
+        source = SyntheticFrameSource((1920, 1080), casting_area)
+        source.bobber = scene_template
+        source.move_bobber(*source.bobber_home)
+        monitor = {"left": casting_area[0], "top": casting_area[1], "width": area_w, "height": area_h}
+        gray = cv2.cvtColor(source.grab(monitor), cv2.COLOR_BGRA2GRAY)
+        label = f"area {area_w}x{area_h}"
+
+        single = TemplateBank([primary], ["original"], workers=1)
+        score = single.match(gray)[0]
+        results.append(dict(name=f"single template {label}", score=score, **measure(lambda: single.match(gray), args.iterations)))
+
+        sequential_p50 = None
+        for workers in worker_counts(len(templates)):
+            bank = TemplateBank(templates, names, workers=workers)
+            max_val, _, index = bank.match(gray)
+            stats = measure(lambda: bank.match(gray), args.iterations)
+            bank.close()
+            if sequential_p50 is None:
+                sequential_p50 = stats["p50_ms"]
+            results.append(dict(name=f"bank x{len(templates)} {workers} thread(s) {label}", workers=workers,
+                                score=max_val, winner=names[index],
+                                speedup=sequential_p50 / stats["p50_ms"] if stats["p50_ms"] else 0.0, **stats))
+
+    write_results("template_bank", results, args.json, extra={"bank": names, "cpu_count": os.cpu_count()})
+    if args.json != "-":
+        for case in results:
+            if "winner" in case:
+                print(f"{case['name']:<48} winner {case['winner']:<16} score {case['score']:.3f}  speedup x{case['speedup']:.2f}")
+            else:
+                print(f"{case['name']:<48} score {case['score']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
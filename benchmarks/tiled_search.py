@@ -0,0 +1,71 @@
+"""Full-screen bar search: one cv2.matchTemplate pass vs overlapping tiles on a thread pool.
+
+    python -m benchmarks.tiled_search [--iterations N] [--workers N,N,...] [--json PATH]
+
+For each screen resolution (including multi-monitor desktops) the minigame bar
+template is matched over the whole synthetic desktop at full resolution, as
+_find_minigame_bar_region does with BAR_PYRAMID_LEVELS = 0. The single pass is
+cv2.matchTemplate + minMaxLoc; the tiled cases use TiledMatcher with each
+--workers count. The results report latency, speedup over the single pass,
+the number of tiles, and whether the merged maximum has the same location
+and score (to float32 rounding) as the single pass. Speedup is bounded by
+the CPU cores available (reported as cpu_count).
+"""
+import os
+
+import cv2
+
+from benchmarks.common import RESOLUTIONS, SyntheticFrameSource, make_parser, measure, write_results
+from fishing_bot_core import FishingBotCore
+from template_search import TiledMatcher
+
+MULTI_MONITOR = [(5760, 1080), (5120, 1440)]
+SCORE_TOLERANCE = 1e-4
+
+
+def main():
+    parser = make_parser("Compare single-pass and tile-parallel full-screen template search.")
+    default_workers = ",".join(str(n) for n in sorted({2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--workers", default=default_workers, help="Thread counts to test (comma-separated)")
+    args = parser.parse_args()
+    iterations = max(5, args.iterations // 20)
+    worker_counts = [int(n) for n in args.workers.split(",")]
+
+    template = cv2.imread(FishingBotCore.MINIGAME_BAR_TEMPLATE_FILENAME, cv2.IMREAD_GRAYSCALE)
+    results = []
+    for width, height in RESOLUTIONS + MULTI_MONITOR:
+        source = SyntheticFrameSource((width, height), (width // 4, height // 4, width // 2, height // 2))
+        gray = cv2.cvtColor(source.screen, cv2.COLOR_BGRA2GRAY)
+        label = f"{width}x{height}"
+
+        def single_pass():
+            _, max_val, _, max_loc = cv2.minMaxLoc(cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED))
+            return max_val, max_loc
+
+        reference_val, reference_loc = single_pass()
+        baseline = measure(single_pass, iterations)
+        results.append(dict(name=f"single pass {label}", speedup=1.0, tiles=1, **baseline))
+
+        for workers in worker_counts:
+            matcher = TiledMatcher(workers)
+            max_val, max_loc = matcher.match(gray, template)
+            stats = measure(lambda: matcher.match(gray, template), iterations)
+            results.append(dict(
+                name=f"tiled x{workers} {label}",
+                speedup=baseline["mean_ms"] / stats["mean_ms"],
+                tiles=len(matcher.bands(gray.shape, template.shape)),
+                same_result=max_loc == reference_loc and abs(max_val - reference_val) <= SCORE_TOLERANCE,
+                **stats,
+            ))
+            matcher.close()
+
+    write_results("tiled_search", results, args.json, extra={"cpu_count": os.cpu_count()})
+    if args.json != "-":
+        print(f"\n{os.cpu_count()} CPU cores")
+        for case in results:
+            if "same_result" in case:
+                print(f"{case['name']:<32} {case['tiles']} tiles, speedup {case['speedup']:.2f}x, same result as single pass: {case['same_result']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Bobber tracking vs per-frame template matching over a frame sequence.
+
+    python -m benchmarks.tracker [--iterations N] [--json PATH] [--recording FILE [--area X,Y,W,H]]
+
+Synthetic mode plays a bobber that bobs a few pixels and then drops (a bite).
+Recording mode replays the casting-area frames of a FrameRecorder file in order.
+Each sequence runs twice through _get_bobber_image, with BOBBER_TRACKING off
+and on. The results report per-frame cost, tracker loss rate and
+re-anchors, and the largest position difference between the two runs.
+"""
+import math
+
+from benchmarks.common import (
+    CASTING_AREAS, RecordedFrameSource, SyntheticFrameSource,
+    make_core, make_parser, measure, recorded_casting_area, write_results,
+)
+from frame_source import FrameSource
+
+
+class SequenceFrameSource(FrameSource):
+    """Plays a fixed list of casting-area frames in order (looping)."""
+
+    def __init__(self, frames, monitors):
+        self.frames = frames
+        self._monitors = monitors
+        self.index = 0
+
+    @property
+    def monitors(self):
+        return self._monitors
+
+    def grab(self, monitor):
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return frame
+
+
+def synthetic_sequence(casting_area, length):
+    """Casting-area frames of a bobber bobbing +-3 px, then sinking 12 px over the last fifth."""
+    source = SyntheticFrameSource((1920, 1080), casting_area)
+    home_x, home_y = source.bobber_home
+    monitor = {"left": casting_area[0], "top": casting_area[1], "width": casting_area[2], "height": casting_area[3]}
+
+    frames = []
+    for i in range(length):
+        dy = int(round(3 * math.sin(i / 6.0)))
+        if i > length * 4 // 5:
+            dy += min(12, (i - length * 4 // 5) // 2)
+        source.move_bobber(home_x + int(round(2 * math.cos(i / 9.0))), home_y + dy)
+        frames.append(source.grab(monitor))
+    return frames, source.monitors
+
+
+def run_sequence(frames, monitors, casting_area, tracking):
+    source = SequenceFrameSource(frames, monitors)
+    core = make_core(source, casting_area)
+    core.BOBBER_TRACKING = tracking
+
+    positions = []
+
+    def step():
+        result = core._get_bobber_image()
+        if result[0] is not None:
+            core.previous_bobber_image = result
+        positions.append(result[2])
+
+    core.previous_bobber_image = None
+    stats = measure(step, len(frames), warmup=0)
+    tracker = core.bobber_tracker
+    stats.update(
+        tracked_frames=tracker.tracked_frames,
+        lost_frames=tracker.lost_frames,
+        loss_rate=tracker.loss_rate,
+        anchors=tracker.anchors,
+        missed_frames=sum(1 for p in positions if p is None),
+    )
+    return stats, positions
+
+
+def compare(frames, monitors, casting_area, label):
+    results = []
+    match_stats, match_positions = run_sequence(frames, monitors, casting_area, tracking=False)
+    track_stats, track_positions = run_sequence(frames, monitors, casting_area, tracking=True)
+
+    max_diff = 0
+    for a, b in zip(match_positions, track_positions):
+        if a is not None and b is not None:
+            max_diff = max(max_diff, abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+    results.append(dict(name=f"template match {label}", **match_stats))
+    results.append(dict(name=f"tracker {label}", max_position_diff_px=max_diff, **track_stats))
+    return results
+
+
+def main():
+    parser = make_parser("Compare incremental bobber tracking with per-frame template matching.")
+    args = parser.parse_args()
+
+    results = []
+    if args.recording:
+        source = RecordedFrameSource(args.recording)
+        casting_area = recorded_casting_area(source, args.area)
+        key = tuple(casting_area)
+        frames = source.regions.get(key)
+        if not frames:
+            parser.error(f"The recording has no frames of exactly the casting area {casting_area}.")
+        results += compare(frames, source.monitors, casting_area, f"recorded {casting_area[2]}x{casting_area[3]}")
+    else:
+        for area_w, area_h in CASTING_AREAS:
+            casting_area = ((1920 - area_w) // 2, (1080 - area_h) // 3, area_w, area_h)
+            frames, monitors = synthetic_sequence(casting_area, args.iterations)
+            results += compare(frames, monitors, casting_area, f"synthetic {area_w}x{area_h}")
+
+    write_results("tracker", results, args.json)
+    if args.json != "-":
+        for case in results:
+            if "max_position_diff_px" in case:
+                print(f"{case['name']:<48} loss rate {case['loss_rate'] * 100:.1f}%  anchors {case['anchors']}  "
+                      f"missed {case['missed_frames']}  max diff vs template match {case['max_position_diff_px']} px")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import time
+
+import cv2
+
+from frame_buffers import FrameBuffers
+
+
+class BobberTracker:
+    """Follows the bobber between frames by correlating its last appearance in a small window.
+
+    anchor() stores the bobber patch found by the full template match. track()
+    then searches only `search_radius` pixels around the last position with
+    TM_CCOEFF_NORMED against that patch. When confidence drops below
+    `min_confidence`, or after `reanchor_interval` tracked frames, track()
+    returns None so the caller re-anchors with the template match
+    (`reanchor_due` tells the periodic re-anchor apart from a loss). All
+    coordinates are relative to the casting-area frame. The search window and
+    its match result are reused between frames; the anchored patch is a copy.
+    """
+
+    def __init__(self, search_radius=8, min_confidence=0.85, reanchor_interval=30):
+        self.search_radius = search_radius
+        self.min_confidence = min_confidence
+        self.reanchor_interval = reanchor_interval
+
+        self.patch = None
+        self.rect = None # (x, y, w, h) of the last tracked position
+        self.confidence = 0.0
+        self._frames_since_anchor = 0
+        self.buffers = FrameBuffers()
+
+        self.reset_stats()
+
+    def reset(self):
+        self.patch = None
+        self.rect = None
+        self.confidence = 0.0
+        self._frames_since_anchor = 0
+
+    def reset_stats(self):
+        self.tracked_frames = 0
+        self.lost_frames = 0 # Confidence dropped below min_confidence
+        self.anchors = 0
+        self.total_cost_us = 0.0
+
+    @property
+    def is_active(self):
+        return self.patch is not None
+
+    @property
+    def reanchor_due(self):
+        """True when the next track() returns None only because reanchor_interval frames were tracked."""
+        return self.patch is not None and self._frames_since_anchor >= self.reanchor_interval
+
+    @property
+    def loss_rate(self):
+        attempts = self.tracked_frames + self.lost_frames
+        return self.lost_frames / attempts if attempts else 0.0
+
+    @property
+    def mean_cost_us(self):
+        attempts = self.tracked_frames + self.lost_frames
+        return self.total_cost_us / attempts if attempts else 0.0
+
+    def anchor(self, frame, rect):
+        """Starts tracking the bobber at `rect` in a BGRA frame."""
+        x, y, w, h = rect
+        self.patch = cv2.cvtColor(frame[y:y + h, x:x + w], cv2.COLOR_BGRA2GRAY)
+        self.rect = rect
+        self.confidence = 1.0
+        self._frames_since_anchor = 0
+        self.anchors += 1
+
+    def track(self, frame):
+        """Returns (rect, confidence) of the bobber in a BGRA frame, or None when it must be re-anchored."""
+        if self.patch is None or self._frames_since_anchor >= self.reanchor_interval:
+            return None
+
+        start = time.perf_counter()
+        x, y, w, h = self.rect
+        frame_h, frame_w = frame.shape[:2]
+        r = self.search_radius
+        x0, y0 = max(0, x - r), max(0, y - r)
+        x1, y1 = min(frame_w, x + w + r), min(frame_h, y + h + r)
+
+        result = None
+        if x1 - x0 >= w and y1 - y0 >= h:
+            window = self.buffers.gray(frame[y0:y1, x0:x1], "window")
+            _, max_val, _, max_loc = cv2.minMaxLoc(self.buffers.match(window, self.patch, "track"))
+            self.confidence = max_val
+            if max_val >= self.min_confidence:
+                self.rect = (x0 + max_loc[0], y0 + max_loc[1], w, h)
+                self._frames_since_anchor += 1
+                result = (self.rect, max_val)
+
+        self.total_cost_us += (time.perf_counter() - start) * 1e6
+        if result is None:
+            self.lost_frames += 1
+            self.patch = None
+        else:
+            self.tracked_frames += 1
+        return result
@@ -0,0 +1,52 @@
+import threading
+import time
+from collections import deque
+
+
+class CaptureEngine:
+    """Grabs the casting area once per tick and hands out zero-copy views of that frame.
+
+    The bobber ROI used for template matching and the full debug view are both
+    NumPy slices of the same BGRA buffer, so a tick costs exactly one grab.
+    The engine also keeps a rolling grabs/sec figure.
+    """
+
+    RATE_WINDOW = 120  # Number of recent grabs used for the grabs/sec figure
+
+    def __init__(self, frame_source):
+        self.frame_source = frame_source
+        self._lock = threading.Lock()
+        self._grab_times = deque(maxlen=self.RATE_WINDOW)
+        self.grab_count = 0
+
+        # Last frame (BGRA) and where it was captured from
+        self.frame = None
+        self.monitor = None
+        self.timestamp = None
+
+    def grab(self, monitor):
+        """Captures `monitor` once and makes it the current frame."""
+        frame = self.frame_source.grab(monitor)
+        now = time.perf_counter()
+
+        with self._lock:
+            self.frame = frame
+            self.monitor = monitor
+            self.timestamp = now
+            self.grab_count += 1
+            self._grab_times.append(now)
+        return frame
+
+    @property
+    def grabs_per_sec(self):
+        """Rolling capture rate over the last RATE_WINDOW grabs"""
+        with self._lock:
+            if len(self._grab_times) < 2:
+                return 0.0
+            elapsed = self._grab_times[-1] - self._grab_times[0]
+            return (len(self._grab_times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def reset_stats(self):
+        with self._lock:
+            self._grab_times.clear()
+            self.grab_count = 0
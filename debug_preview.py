@@ -0,0 +1,120 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class DebugPreviewChannel:
+    """Rate-limited, latest-frame-wins debug preview rendered on a worker thread.
+
+    The detection loop calls wants_frame() (a flag check and a clock read) and,
+    only when it returns True, submit() with the raw BGRA frame and a list of
+    overlays. The worker downscales with cv2, draws the overlays and passes an
+    RGB uint8 array of `size` to `deliver`. Frames submitted while the worker
+    is busy replace each other, and nothing is done at all while the channel
+    is disabled. Render errors are reported through `log`.
+
+    Overlays (coordinates in source-frame pixels, colours RGB):
+        ("rect", (x, y, w, h), (r, g, b), thickness)
+        ("text", (x, y), "message", (r, g, b))
+    """
+
+    def __init__(self, deliver, size=(150, 150), max_fps=10.0, log=print):
+        self.deliver = deliver
+        self.log = log
+        self.size = size
+        self.max_fps = max_fps
+        self.enabled = False
+
+        self._cond = threading.Condition()
+        self._pending = None
+        self._last_submit = 0.0
+        self._worker = None
+        self._stopped = False
+
+        self.submitted = 0
+        self.rendered = 0
+        self.replaced = 0
+
+    # --- Producer side (detection thread) ---
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        with self._cond:
+            if not self.enabled or self._worker is not None:
+                return
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, daemon=True, name="DebugPreview")
+            self._worker.start()
+
+    def set_max_fps(self, max_fps):
+        self.max_fps = max_fps
+
+    def wants_frame(self):
+        """True when a frame submitted now would be shown."""
+        if not self.enabled or self.max_fps <= 0:
+            return False
+        return time.perf_counter() - self._last_submit >= 1.0 / self.max_fps
+
+    def submit(self, frame, overlays=()):
+        if not self.wants_frame():
+            return
+        with self._cond:
+            if self._pending is not None:
+                self.replaced += 1
+            self._pending = (frame, list(overlays))
+            self._last_submit = time.perf_counter()
+            self.submitted += 1
+            self._cond.notify()
+
+    def submit_blank(self):
+        """Shows an all-black preview (e.g. after a capture error)."""
+        self.submit(np.zeros((self.size[1], self.size[0], 4), dtype=np.uint8))
+
+    def stop(self, timeout=1.0):
+        """Stops the worker and waits for it, so a later set_enabled(True) starts exactly one new worker."""
+        with self._cond:
+            worker, self._worker = self._worker, None
+            self._stopped = True
+            self._pending = None
+            self._cond.notify()
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout)
+
+    # --- Worker side ---
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                frame, overlays = self._pending
+                self._pending = None
+
+            try:
+                image = self.render(frame, overlays)
+                self.rendered += 1
+                self.deliver(image)
+            except Exception as e:
+                self.log(f"❌ Debug preview render error: {e}")
+
+    def render(self, frame, overlays):
+        """Downscales a BGRA frame to `size` and draws the overlays; returns an RGB array."""
+        src_h, src_w = frame.shape[:2]
+        out_w, out_h = self.size
+        small = cv2.resize(frame, (out_w, out_h), interpolation=cv2.INTER_AREA)
+        image = cv2.cvtColor(small, cv2.COLOR_BGRA2RGB)
+
+        sx = out_w / max(1, src_w)
+        sy = out_h / max(1, src_h)
+        for overlay in overlays:
+            if overlay[0] == "rect":
+                _, (x, y, w, h), color, thickness = overlay
+                p1 = (int(x * sx), int(y * sy))
+                p2 = (int((x + w) * sx), int((y + h) * sy))
+                cv2.rectangle(image, p1, p2, color, max(1, int(thickness)))
+            elif overlay[0] == "text":
+                _, (x, y), text, color = overlay
+                cv2.putText(image, text, (int(x * sx), int(y * sy) + 10), cv2.FONT_HERSHEY_SIMPLEX, 0.35, color, 1, cv2.LINE_AA)
+        return image
@@ -4,6 +4,7 @@ from OpenGL.GL import *
 from OpenGL.GLU import *
 import math 
 import random 
+import time
 
 FISH_VERTICES = [
     ( 1.0, 0.0, 0.0), 
@@ -77,10 +78,34 @@ def _calculate_normal(v1_idx, v2_idx, v3_idx):
     
     return N
 
+# Face normals never change, so they are computed once at import
+FISH_NORMALS_BODY_MAIN = [_calculate_normal(*face) for face in FISH_FACES_BODY_MAIN]
+FISH_NORMALS_TAIL = [_calculate_normal(*face) for face in FISH_FACES_TAIL]
+FISH_NORMALS_FINS = [_calculate_normal(*face) for face in FISH_FACES_FINS]
+
+def _emit_triangles(faces, normals):
+    glBegin(GL_TRIANGLES)
+    for (v1_idx, v2_idx, v3_idx), normal in zip(faces, normals):
+        glNormal3fv(normal)
+        
+        glVertex3fv(FISH_VERTICES[v1_idx])
+        glVertex3fv(FISH_VERTICES[v2_idx])
+        glVertex3fv(FISH_VERTICES[v3_idx])
+    glEnd()
+
 class FishGLCanvas(GLCanvas):
     
     MOVE_FORWARD = 1
     
+    # Static geometry (scene, fish parts) is compiled into display lists on first draw;
+    # per frame only the transforms, colours and the tail rotation are sent.
+    RETAINED_MODE = True
+    
+    # Animation timer: stopped while hidden, slowed while the bot runs
+    FRAME_INTERVAL_MS = 30
+    LOW_POWER_INTERVAL_MS = 200
+    MAX_TICK_STEP = 0.25 # Most animation time (seconds) advanced by one tick, so resuming does not jump
+    
     def __init__(self, parent, size):
         
         attribList = [wx.glcanvas.WX_GL_RGBA, wx.glcanvas.WX_GL_DOUBLEBUFFER, wx.glcanvas.WX_GL_DEPTH_SIZE, 24]
@@ -112,13 +137,22 @@ class FishGLCanvas(GLCanvas):
 
         self.structures = []
         self._initialize_structures(15) 
+        
+        self.retained_mode = self.RETAINED_MODE
+        self._display_lists = {} # name -> GL display list id
+        
+        self.frames_rendered = 0 # on_draw calls (to confirm the logo is idle when hidden)
+        self._shown = True
+        self._low_power = False
+        self._last_tick = time.perf_counter()
 
         self.Bind(wx.EVT_PAINT, self.on_paint)
         self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
         
         self.timer = wx.Timer(self)
         self.Bind(wx.EVT_TIMER, self.on_timer, self.timer)
-        self.timer.Start(30)
+        self._update_timer()
         
         self._set_new_target() 
 
@@ -162,22 +196,52 @@ class FishGLCanvas(GLCanvas):
         glViewport(0, 0, size.width, size.height)
         event.Skip()
 
+    def set_shown(self, shown):
+        """Runs the animation only while the canvas is on screen (tab selected, window not minimized)."""
+        self._shown = bool(shown)
+        self._update_timer()
+
+    def set_low_power(self, low_power):
+        """Drops to LOW_POWER_INTERVAL_MS ticks (e.g. while the bot is running)."""
+        self._low_power = bool(low_power)
+        self._update_timer()
+
+    def _update_timer(self):
+        if not self._shown:
+            if self.timer.IsRunning():
+                self.timer.Stop()
+            return
+        interval = self.LOW_POWER_INTERVAL_MS if self._low_power else self.FRAME_INTERVAL_MS
+        if not self.timer.IsRunning():
+            self._last_tick = time.perf_counter()
+            self.timer.Start(interval)
+        elif self.timer.GetInterval() != interval:
+            self.timer.Start(interval)
+
     def on_timer(self, event):
-        self.animation_time += 0.1 
-        self.mode_timer += self.TICK_INTERVAL
+        # Advance by the real time since the last tick (in TICK_INTERVAL steps), so a slower
+        # timer moves the fish at the same speed; capped so a resume does not jump
+        now = time.perf_counter()
+        dt = min(now - self._last_tick, self.MAX_TICK_STEP)
+        self._last_tick = now
+        steps = dt / self.TICK_INTERVAL
+        
+        self.animation_time += 0.1 * steps
+        self.mode_timer += dt
         
         if self.mode_timer >= self.mode_duration:
             self.mode_timer = 0.0
             self._set_new_target()
             
-        self.current_yaw = self._smooth_angle(self.current_yaw, self.target_yaw, self.turn_rate)
-        self.current_pitch = self._smooth_angle(self.current_pitch, self.target_pitch, self.turn_rate)
-        self.current_roll = self._smooth_angle(self.current_roll, self.target_roll, self.turn_rate)
+        turn_rate = 1.0 - (1.0 - self.turn_rate) ** steps
+        self.current_yaw = self._smooth_angle(self.current_yaw, self.target_yaw, turn_rate)
+        self.current_pitch = self._smooth_angle(self.current_pitch, self.target_pitch, turn_rate)
+        self.current_roll = self._smooth_angle(self.current_roll, self.target_roll, turn_rate)
 
         yaw_rad = math.radians(self.current_yaw)
         pitch_rad = math.radians(self.current_pitch)
         
-        speed = self.swimming_speed 
+        speed = self.swimming_speed * steps
         
         x_move = speed * math.cos(yaw_rad) * math.cos(pitch_rad)
         y_move = speed * math.sin(pitch_rad)
@@ -199,12 +263,40 @@ class FishGLCanvas(GLCanvas):
 
         self.Refresh(False) 
 
+    def on_destroy(self, event):
+        if event.GetEventObject() is self:
+            self.release_display_lists()
+        event.Skip()
+
+    def release_display_lists(self):
+        if self._display_lists:
+            self.SetCurrent(self.context)
+            for list_id in self._display_lists.values():
+                glDeleteLists(list_id, 1)
+            self._display_lists.clear()
+
+    def _draw_static(self, name, emit):
+        """Draws static geometry from its display list (compiled by emit() on first use), or
+        immediately with emit() when retained mode is off."""
+        if not self.retained_mode:
+            emit()
+            return
+        list_id = self._display_lists.get(name)
+        if list_id is None:
+            list_id = glGenLists(1)
+            glNewList(list_id, GL_COMPILE)
+            emit()
+            glEndList()
+            self._display_lists[name] = list_id
+        glCallList(list_id)
+
     def on_paint(self, event):
         self.SetCurrent(self.context)
         self.on_draw()
         event.Skip()
 
     def on_draw(self):
+        self.frames_rendered += 1
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glClearColor(0.7, 0.9, 1.0, 1.0) 
         glEnable(GL_DEPTH_TEST) 
@@ -244,8 +336,7 @@ class FishGLCanvas(GLCanvas):
         
         glTranslatef(-self.position[0], -self.position[1], -self.position[2])
         
-        self._draw_floor()
-        self._draw_structures() 
+        self._draw_static("scene", self._draw_scene)
         
         glPopMatrix() 
         
@@ -298,19 +389,12 @@ class FishGLCanvas(GLCanvas):
         body_color = self.fish_color
         glColor3fv(body_color) 
         
-        glBegin(GL_TRIANGLES) 
-        for v1_idx, v2_idx, v3_idx in FISH_FACES_BODY_MAIN:
-            normal = _calculate_normal(v1_idx, v2_idx, v3_idx)
-            glNormal3fv(normal)
-            
-            glVertex3fv(FISH_VERTICES[v1_idx])
-            glVertex3fv(FISH_VERTICES[v2_idx])
-            glVertex3fv(FISH_VERTICES[v3_idx])
-        glEnd()
+        self._draw_static("fish_body", lambda: _emit_triangles(FISH_FACES_BODY_MAIN, FISH_NORMALS_BODY_MAIN))
         
         darker_color = [c * 0.8 for c in body_color] 
         glColor3fv(darker_color)
         
+        # The tail rotation is the only per-frame change to the fish geometry
         glPushMatrix() 
         try:
             if tail_wag_angle != 0.0:
@@ -318,34 +402,25 @@ class FishGLCanvas(GLCanvas):
                 glRotatef(tail_wag_angle, 0.0, 1.0, 0.0) 
                 glTranslatef(0.7, 0.0, 0.0) 
             
-            glBegin(GL_TRIANGLES) 
-            for v1_idx, v2_idx, v3_idx in FISH_FACES_TAIL:
-                normal = _calculate_normal(v1_idx, v2_idx, v3_idx)
-                glNormal3fv(normal)
-                
-                glVertex3fv(FISH_VERTICES[v1_idx])
-                glVertex3fv(FISH_VERTICES[v2_idx])
-                glVertex3fv(FISH_VERTICES[v3_idx])
-            glEnd()
+            self._draw_static("fish_tail", lambda: _emit_triangles(FISH_FACES_TAIL, FISH_NORMALS_TAIL))
         finally:
             glPopMatrix() 
 
         lighter_color = [min(1.0, c * 1.1) for c in body_color]
         glColor3fv(lighter_color)
         
-        glBegin(GL_TRIANGLES) 
-        for v1_idx, v2_idx, v3_idx in FISH_FACES_FINS:
-            normal = _calculate_normal(v1_idx, v2_idx, v3_idx)
-            glNormal3fv(normal)
-            
-            glVertex3fv(FISH_VERTICES[v1_idx])
-            glVertex3fv(FISH_VERTICES[v2_idx])
-            glVertex3fv(FISH_VERTICES[v3_idx])
-        glEnd()
+        self._draw_static("fish_fins", lambda: _emit_triangles(FISH_FACES_FINS, FISH_NORMALS_FINS))
+
+        self._draw_static("fish_eyes", self._draw_eyes)
 
+    def _draw_eyes(self):
         self._draw_eye(21, 90.0) 
         self._draw_eye(22, -90.0)
 
+    def _draw_scene(self):
+        self._draw_floor()
+        self._draw_structures()
+
     def _draw_floor(self):
         glColor3f(0.3, 0.5, 0.3) 
         glBegin(GL_QUADS)
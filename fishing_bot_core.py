@@ -1,14 +1,26 @@
 import time
 import random
 import threading
-import pyautogui
-import mss
-from PIL import Image, ImageDraw
 import traceback
 import cv2
-import numpy as np
 import os
-import sys
+
+from frame_source import MssFrameSource
+from frame_buffers import FrameBuffers
+from capture_engine import CaptureEngine
+from minigame_scanner import ScanlineAnalyzer
+from pipeline import FramePipeline
+from template_search import PyramidMatcher
+from bar_locator import BarLocationPrior
+from debug_preview import DebugPreviewChannel
+from bobber_tracker import BobberTracker
+from template_bank import TemplateBank
+from frame_pacer import FramePacer
+from stage_metrics import StageMetrics, MetricsExporter
+from session_store import SessionStore
+from fishing_states import State, StateMachine
+from input_backend import PyAutoGuiBackend, pyautogui
+from minigame_controller import make_controller
 
 # Focusing library (Windows only)
 try:
@@ -18,9 +30,6 @@ except ImportError:
     win32gui = None
     win32con = None
 
-# PyAutoGUI Fail-safe setting
-pyautogui.FAILSAFE = True
-
 class FishingBotCore:
     """Handles all core logic for the fishing bot (detection, actions, loop, minigame)"""
 
@@ -33,6 +42,9 @@ class FishingBotCore:
     # Template filenames
     TEMPLATE_FILENAME = "bobber_template.png"              # Template for the bobber floating on water
     MINIGAME_BAR_TEMPLATE_FILENAME = "minigame_bar_template.png" # Template for the entire minigame bar
+    BOBBER_TEMPLATE_DIR = "bobber_templates"               # Extra bobber templates (*.png: water colour, weather, day/night)
+    BOBBER_MATCH_WORKERS = None        # Threads matching the bobber templates (None = one per CPU core, at most one per template)
+    BOBBER_MATCH_METHOD = "direct"     # "direct" (cv2.matchTemplate), "fft" (cached template spectra) or "auto" (crossover measured before the first cast)
     
     # Minigame timeout (set to 1 minute)
     MINIGAME_TIMEOUT = 120
@@ -44,35 +56,115 @@ class FishingBotCore:
     MINIGAME_SCAN_WIDTH = 260          # Scan width (260px)
     MINIGAME_SCAN_Y_OFFSET = 15        # Scan start Y position from bar top (0)
     MINIGAME_REEL_STOP_X = 180         # X coordinate within the scan area (0~259) to stop reeling
+    MINIGAME_SCAN_ROWS = 1             # Rows scanned around the scan line (majority vote when > 1)
+    
+    # Minigame reel controller
+    MINIGAME_CONTROLLER = "threshold"  # "threshold" (hold while left of the stop column) or "predictive" (marker velocity + hysteresis)
+    MINIGAME_HYSTERESIS_PX = 1         # Predictive: release past stop + N px, hold again below stop - N px
+    MINIGAME_VELOCITY_WINDOW = 5       # Predictive: marker samples in the velocity estimate
+    MINIGAME_EXTRA_LEAD = 0.0          # Seconds added to the measured capture -> input latency (e.g. game render delay)
+    MINIGAME_TRAJECTORY_DIR = None     # Folder for one marker trajectory CSV per minigame; None = off
+    
+    BITE_TIMEOUT = 30                  # Seconds to wait for a bite before recasting
     
     # Minigame bar detection retry constants
     MAX_BAR_SEARCH_ATTEMPTS = 5        # Maximum retry attempts
     BAR_SEARCH_INTERVAL = 0.3          # Retry interval (seconds)
+    BAR_MATCH_THRESHOLD = 0.75         # Minimum full-resolution match score for the minigame bar
+    BAR_PYRAMID_LEVELS = 2             # Downscale levels for the coarse bar search (0 = direct full-resolution search)
+    BAR_SEARCH_WORKERS = None          # Threads for tiled bar search on large screens (None = one per CPU core, 1 = single pass)
+    
+    # Minigame bar location prior / local watcher
+    BAR_PRIOR_FILENAME = "bar_location_prior.json" # Learned bar position per casting area and screen geometry
+    BAR_WATCH_MARGIN = 40              # Pixels watched around the predicted bar position
+    BAR_WATCH_TIMEOUT = 1.5            # Seconds to watch the predicted position before the full-screen search
+    BAR_WATCH_INTERVAL = 0.005         # Poll interval of the local watcher (seconds)
     
     BOBBER_SEARCH_RADIUS = 30
 
     ROI_PADDING = 50
 
+    # Visual landing detection (polled from the mouse-up of the cast)
+    LANDING_STABLE_FRAMES = 5          # Consecutive detections within LANDING_STABLE_PX that count as landed
+    LANDING_STABLE_PX = 2              # Allowed movement (pixels) while the bobber settles
+    LANDING_TIMEOUT = 3.0              # Seconds before the cast counts as failed (the old fixed wait + retries)
+
+    # Incremental bobber tracking (template match only to (re-)anchor)
+    BOBBER_TRACKING = True
+    TRACK_SEARCH_RADIUS = 8            # Pixels searched around the last bobber position per frame
+    TRACK_MIN_CONFIDENCE = 0.85        # Below this the tracker is dropped and the template match re-anchors
+    TRACK_REANCHOR_INTERVAL = 30       # Forced template-match re-anchor (over the full casting area) every N tracked frames
+    TRACK_ANCHOR_THRESHOLD = 0.7       # Template score needed to start tracking (stricter than MATCH_THRESHOLD)
+
+    # Loop pacing (target iterations/sec per phase; the rate backs off while over the CPU budget)
+    PACING_RATES = {"landing": 30, "bite": 60, "minigame": 144}
+    PACING_CPU_BUDGET = 0.5            # Fraction of one core the detection thread may use
+    PACING_MIN_FRACTION = 0.25         # Lowest backed-off rate, as a fraction of the phase target
+
+    # Stage latency metrics (always collected; exported only when configured)
+    METRICS_HTTP_PORT = None           # Local Prometheus endpoint (http://127.0.0.1:PORT/metrics); None = off
+    METRICS_SNAPSHOT_PATH = None       # Periodic JSON snapshot file; None = off
+    METRICS_SNAPSHOT_INTERVAL = 10.0   # Seconds between JSON snapshots
+
+    # Per-cycle session statistics (report: python session_store.py report)
+    SESSION_DB_PATH = None             # SQLite file, e.g. "fishing_sessions.db"; None = off
+
+    # Debug preview (rendered off the detection thread)
+    DEBUG_PREVIEW_SIZE = (150, 150)
+    DEBUG_PREVIEW_FPS = 10             # Maximum preview frames per second (0 disables the preview)
+
     # --- Bot State Variables ---
-    def __init__(self, casting_area_ref, log_callback=None, debug_img_callback=None, game_window_title="Albion Online Client"):
+    def __init__(self, casting_area_ref, log_callback=None, debug_img_callback=None, game_window_title="Albion Online Client", frame_source=None, pipelined=True, input_backend=None):
         self.casting_area_ref = casting_area_ref
         self.log = log_callback if log_callback else print
         self.debug_img_callback = debug_img_callback if debug_img_callback else lambda x: None
+        # Receives RGB arrays of DEBUG_PREVIEW_SIZE; only runs when a callback was given
+        self.debug_preview = DebugPreviewChannel(self.debug_img_callback, size=self.DEBUG_PREVIEW_SIZE, max_fps=self.DEBUG_PREVIEW_FPS, log=self.log)
+        self.debug_preview.set_enabled(debug_img_callback is not None)
         self.GAME_WINDOW_TITLE = game_window_title
         
         # --- Template Loading ---
         self.bobber_template = self._load_template(self.TEMPLATE_FILENAME)
         self.minigame_bar_template = self._load_template(self.MINIGAME_BAR_TEMPLATE_FILENAME)
+        # Every bobber template is matched per frame on a thread pool; the best score wins
+        self.bobber_bank = TemplateBank.load(self.TEMPLATE_FILENAME, self.BOBBER_TEMPLATE_DIR, self.BOBBER_MATCH_WORKERS, self.BOBBER_MATCH_METHOD) if self.bobber_template is not None else None
+        self.bobber_template_name = None # Template of the last successful bobber match
+        if self.bobber_bank is not None and len(self.bobber_bank) > 1:
+            self.log(f"🖼️ Loaded {len(self.bobber_bank)} bobber templates ({self.bobber_bank.workers} matching threads).")
+        self.bar_prior = BarLocationPrior(self.BAR_PRIOR_FILENAME)
+        self.bar_matcher = PyramidMatcher(self.minigame_bar_template, levels=self.BAR_PYRAMID_LEVELS, workers=self.BAR_SEARCH_WORKERS,
+                                          min_score=self.BAR_MATCH_THRESHOLD) if self.minigame_bar_template is not None else None
 
         # --- State Management ---
         self.is_running = threading.Event()
         self.fishing_thread = None
-        self.sct = mss.mss() # Instance for bite detection (used close to the main thread)
+        self.frame_source = frame_source if frame_source else MssFrameSource() # Screen capture (live, recorded or replayed)
+        # Mouse / keyboard (edge-triggered buttons, no implicit pauses); None when pyautogui is unavailable
+        self.input = input_backend if input_backend else (PyAutoGuiBackend() if pyautogui else None)
+        self.reel_held = False # Reel button state last requested by the minigame loop
+        self.capture = CaptureEngine(self.frame_source) # One casting-area grab per bite-loop tick
+        self.scanline_analyzer = ScanlineAnalyzer(self.ROLL_LIMIT) # Vectorized minigame marker scan
+        # Grayscale and match-result arrays reused frame to frame (contents valid until the next frame)
+        self.buffers = FrameBuffers()
+        self.minigame_controller = make_controller(self.MINIGAME_CONTROLLER, self.MINIGAME_REEL_STOP_X,
+                                                   self.MINIGAME_HYSTERESIS_PX, self.MINIGAME_VELOCITY_WINDOW)
+        # Capture thread + input thread around the detection loop (None = capture and act inline)
+        self.pipeline = FramePipeline(self.capture, self.log) if pipelined else None
+        # perf_counter spans per stage (capture, convert, match, bite check, input, bar search, minigame)
+        self.metrics = StageMetrics()
+        self.metrics_exporter = None
+        if self.input is not None:
+            self.input.on_event = lambda event, seconds: self.metrics.observe(f"input_{event}", seconds)
+        self.session_store = None # Open while the fishing loop runs
+        # Paces the landing / bite / minigame loops (and the capture stage with them)
+        self.pacer = FramePacer(self.PACING_RATES, self.PACING_CPU_BUDGET, self.PACING_MIN_FRACTION,
+                                on_rate_change=self.pipeline.set_rate if self.pipeline is not None else None)
         self.is_bite_detected = threading.Event()
         self.previous_bobber_image = None
         
         # 🚨 Add variable to store initial bobber Y coordinate (for vertical drop measurement)
         self.initial_bobber_y = None
+        self.bobber_tracker = BobberTracker(self.TRACK_SEARCH_RADIUS, self.TRACK_MIN_CONFIDENCE, self.TRACK_REANCHOR_INTERVAL)
         
         # 🎣 Casting time setting
         self.min_cast_time = 0.15
@@ -83,10 +175,69 @@ class FishingBotCore:
         self.MAX_MATCH_FAIL_COUNT = 2
         self.current_minigame_region = None # Absolute region of the dynamically found minigame bar (x, y, w, h)
         
+        # Fishing cycle as explicit states (cast → landing → bite_wait → hook → bar_search → minigame → cleanup)
+        self.state_machine = self._build_state_machine()
+        self.cycle = None # Session record of the current cycle
+        self.cycle_start_time = None
+        self.bite_click_time = None
+        self._capture_target = None # Region the capture stage is currently grabbing
+        
         # Safe mouse area
-        screen_width, screen_height = pyautogui.size()
+        if self.input is not None:
+            screen_width, screen_height = self.input.size()
+        else:
+            screen_width, screen_height = self.frame_source.monitors[0]["width"], self.frame_source.monitors[0]["height"]
         self.SAFE_MOUSE_POS = (screen_width - 50, screen_height - 50)
         
+    # --- Pipeline Helpers ---
+    def _next_frame(self, monitor):
+        """Returns the newest BGRA frame of `monitor` (from the capture stage when pipelined)."""
+        if self.pipeline is None or not self.pipeline.is_running:
+            with self.metrics.span("capture"):
+                return self.capture.grab(monitor)
+
+        if monitor != self._capture_target:
+            self._capture_target = monitor
+            self.pipeline.set_target(monitor)
+        with self.metrics.span("capture"): # Wait for the capture stage's next frame
+            frame = self.pipeline.next_frame(monitor)
+        if frame is None:
+            raise RuntimeError("No frame received from the capture stage.")
+        self.metrics.observe("frame_age", self.pipeline.frame_age.last)
+        return frame
+
+    def _pause_capture(self):
+        """Stops the capture stage from grabbing while the loop is waiting on something else."""
+        if self.pipeline is not None and self.pipeline.is_running:
+            self._capture_target = None
+            self.pipeline.set_target(None)
+
+    def _dispatch_input(self, fn, *args, key=None, **kwargs):
+        """Runs an input action on the actuator stage (inline when not pipelined)."""
+        with self.metrics.span("input_dispatch"):
+            if self.pipeline is None or not self.pipeline.is_running:
+                fn(*args, **kwargs)
+            else:
+                self.pipeline.dispatch(fn, *args, key=key, **kwargs)
+
+    def _wait_input_idle(self):
+        if self.pipeline is not None:
+            self.pipeline.wait_idle()
+
+    def _input_lead(self):
+        """Seconds from a frame's capture until an input decided on it lands (frame age + queue + OS call)."""
+        lead = self.MINIGAME_EXTRA_LEAD + self.input.event_latency("mouse_down")
+        if self.pipeline is not None and self.pipeline.is_running:
+            lead += self.pipeline.frame_age.last + self.pipeline.action_latency
+        return lead
+
+    def _set_reel(self, held):
+        """Holds or releases the reel button; only changes are dispatched."""
+        if held == self.reel_held:
+            return
+        self.reel_held = held
+        self._dispatch_input(self.input.mouse_down if held else self.input.mouse_up, 'left', key='left_button')
+
     def _get_roi_monitor(self, full_area, last_center, radius):
         """
         Calculates a monitor dict for MSS centered around the last known bobber position,
@@ -161,6 +312,10 @@ class FishingBotCore:
         if not self.casting_area_ref["area"]:
             self.log("🛑 Bot start failed: Fishing area is not set.")
             return
+
+        if self.input is None:
+            self.log("🛑 Bot start failed: Mouse/keyboard input is unavailable (pyautogui could not be loaded).")
+            return
             
         if win32gui and win32con:
             try:
@@ -198,50 +353,68 @@ class FishingBotCore:
         Uses dynamic ROI if a previous position is known for faster detection.
         """
         area = self.casting_area_ref["area"]
-        if not area or self.bobber_template is None:
+        if not area or self.bobber_bank is None:
             return None, None, None
 
         x_root, y_root, w_root, h_root = area
-        t_w, t_h = self.bobber_template.shape[::-1]
+        t_w, t_h = self.bobber_bank.max_size
         
-        monitor_to_use = None
+        roi_w, roi_h = w_root, h_root
         offset_x, offset_y = 0, 0
         search_full_area = True # 기본값은 전체 영역 검색
 
-        # 1. Determine Capture Monitor and Offset
-        # Try to use ROI if previous successful position exists
-        if self.previous_bobber_image and self.previous_bobber_image[2]:
+        # 1. Determine ROI within the casting area
+        # Try to use ROI if previous successful position exists. A periodic re-anchor searches the
+        # full area, so a tracker that drifted onto (or anchored on) the wrong spot cannot keep it.
+        reanchor_due = self.BOBBER_TRACKING and self.bobber_tracker.reanchor_due
+        if self.previous_bobber_image and self.previous_bobber_image[2] and not reanchor_due:
             last_center_rel = self.previous_bobber_image[2]
             monitor_roi, offset = self._get_roi_coordinates(area, last_center_rel, self.ROI_PADDING)
             
             if monitor_roi:
-                monitor_to_use = monitor_roi
+                roi_w, roi_h = monitor_roi["width"], monitor_roi["height"]
                 offset_x, offset_y = offset
                 search_full_area = False # ROI 검색 모드
-        
-        if search_full_area:
-            # ROI가 없거나 실패하면 전체 영역 검색
-            monitor_to_use = {"top": y_root, "left": x_root, "width": w_root, "height": h_root}
-            offset_x, offset_y = 0, 0
 
-        # 2. Capture Screenshot and Process
-        with mss.mss() as sct_local:
-            try:
-                # Capture the defined area (either full area or ROI)
-                capture_img = sct_local.grab(monitor_to_use)
-                
-                img_array = np.array(capture_img, dtype=np.uint8)
-                img_array_bgr = cv2.cvtColor(img_array, cv2.COLOR_BGRA2BGR)
-                gray_img = cv2.cvtColor(img_array_bgr, cv2.COLOR_BGR2GRAY)
-                
-                result = cv2.matchTemplate(gray_img, self.bobber_template, cv2.TM_CCOEFF_NORMED)
-                _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if not self.previous_bobber_image:
+            self.bobber_tracker.reset() # New cast: no position to track from
+
+        # 2. Capture the casting area once; ROI and debug view are both slices of this frame
+        try:
+            monitor_root = {"top": y_root, "left": x_root, "width": w_root, "height": h_root}
+            frame = self._next_frame(monitor_root)
+            
+            best_rect_rel_full = None
+            bobber_center_rel_full = None
+            bobber_crop_gray = None
+            tracked = None
+            
+            # 2-A. Incremental tracking from the last position (small window around it)
+            if self.BOBBER_TRACKING and self.bobber_tracker.is_active:
+                with self.metrics.span("track"):
+                    tracked = self.bobber_tracker.track(frame)
+            
+            if tracked:
+                best_rect_rel_full, max_val = tracked
+                x, y, w, h = best_rect_rel_full
+                t_w, t_h = w, h
+                bobber_center_rel_full = (x + w // 2, y + h // 2)
+                with self.metrics.span("convert"):
+                    bobber_crop_gray = self.buffers.gray(frame[y:y + h, x:x + w], "bobber_crop")
+                self.consecutive_match_fail_count = 0
+            else:
+                # 2-B. Template bank match over the ROI (or full area); re-anchors the tracker
+                roi_view = frame[offset_y:offset_y + roi_h, offset_x:offset_x + roi_w]
+                with self.metrics.span("convert"):
+                    gray_img = self.buffers.gray(roi_view, "bobber_roi")
                 
-                best_rect_rel_full = None
-                bobber_center_rel_full = None
+                with self.metrics.span("template_match"):
+                    max_val, max_loc, template_index = self.bobber_bank.match(gray_img)
                 
                 if max_val >= self.MATCH_THRESHOLD:
-                    # Coordinates are relative to the monitor_to_use area
+                    t_w, t_h = self.bobber_bank.size(template_index)
+                    self.bobber_template_name = self.bobber_bank.names[template_index]
+                    # Coordinates are relative to the ROI
                     top_left_roi = max_loc
                     x_roi, y_roi = top_left_roi
                     w, h = t_w, t_h
@@ -256,52 +429,86 @@ class FishingBotCore:
                     y_center = y_full_rel + h // 2
                     bobber_center_rel_full = (x_center, y_center)
                     
+                    # Grayscale view of the matched bobber (slice of the ROI gray image)
+                    bobber_crop_gray = gray_img[y_roi:y_roi + t_h, x_roi:x_roi + t_w]
+                    
                     self.consecutive_match_fail_count = 0
-                
-                
-                # 3. Generate debug image (always capture the full casting area for consistent UI output)
-                monitor_root = {"top": y_root, "left": x_root, "width": w_root, "height": h_root}
-                full_screenshot_debug = sct_local.grab(monitor_root)
-                
-                img_array_debug = np.array(full_screenshot_debug, dtype=np.uint8)
-                img_array_bgr_debug = cv2.cvtColor(img_array_debug, cv2.COLOR_BGRA2BGR)
-                full_pil_img_debug = Image.fromarray(cv2.cvtColor(img_array_bgr_debug, cv2.COLOR_BGR2RGB))
+                    
+                    if self.BOBBER_TRACKING:
+                        # Only a confident match is tracked; weak ones are re-matched every frame
+                        if max_val >= self.TRACK_ANCHOR_THRESHOLD:
+                            self.bobber_tracker.anchor(frame, best_rect_rel_full)
+                        else:
+                            self.bobber_tracker.reset()
+            
+            
+            if not best_rect_rel_full:
+                self.consecutive_match_fail_count += 1
 
-                
-                debug_img = full_pil_img_debug.copy()
-                draw = ImageDraw.Draw(debug_img)
-                
+            # 3. Debug preview from the same frame (full casting area); drawn on the preview worker
+            if self.debug_preview.wants_frame():
+                overlays = []
                 if best_rect_rel_full:
                     # 녹색 박스 (성공)
-                    x, y, w, h = best_rect_rel_full
-                    draw.rectangle([x, y, x + w, y + h], outline=(0, 255, 0), width=2)
+                    overlays.append(("rect", best_rect_rel_full, (0, 255, 0), 2))
                 else:
-                    self.consecutive_match_fail_count += 1
                     cx, cy = w_root // 2, h_root // 2
-                    draw.rectangle([cx-10, cy-10, cx+10, cy+10], outline=(255, 0, 0), width=2)
-                    draw.text((10, 10), f"Match FAIL ({max_val:.2f})", fill=(255, 0, 0))
+                    overlays.append(("rect", (cx - 10, cy - 10, 20, 20), (255, 0, 0), 2))
+                    overlays.append(("text", (10, 10), f"Match FAIL ({max_val:.2f})", (255, 0, 0)))
                 
                 # ROI 검색 시 ROI 영역을 파란색으로 표시 (디버깅용)
-                if not search_full_area:
-                    draw.rectangle([offset_x, offset_y, offset_x + monitor_to_use["width"], offset_y + monitor_to_use["height"]], outline=(0, 0, 255), width=1)
+                if not tracked and not search_full_area:
+                    overlays.append(("rect", (offset_x, offset_y, roi_w, roi_h), (0, 0, 255), 1))
+                
+                self.debug_preview.submit(frame, overlays)
 
+            if best_rect_rel_full:
+                # Returns a grayscale view of the bobber (overwritten by the next frame).
+                return bobber_crop_gray, (t_w, t_h), bobber_center_rel_full
+            
+            return None, None, None
 
-                self.debug_img_callback(debug_img)
+        except Exception as e:
+            self.log(f"Error during capture and template matching: {e}")
+            if area:
+                 self.debug_preview.submit_blank()
+            return None, None, None
 
-                if best_rect_rel_full:
-                    # Returns a grayscale cropped image around the bobber.
-                    x, y, w, h = best_rect_rel_full
-                    bobber_crop_pil = full_pil_img_debug.crop((x, y, x + w, y + h)).convert('L')
-                    return bobber_crop_pil, (t_w, t_h), bobber_center_rel_full
-                
-                return None, None, None
 
-            except Exception as e:
-                self.log(f"Error during capture and template matching: {e}")
-                if area:
-                     self.debug_img_callback(Image.new('RGB', (w_root, h_root), color = 'black'))
-                return None, None, None
+    def _wait_for_landing(self):
+        """
+        Polls the casting area from the end of the cast until the bobber holds still.
+        The bobber counts as landed once LANDING_STABLE_FRAMES consecutive detections stay within
+        LANDING_STABLE_PX of the first one; previous_bobber_image then holds the last detection.
+        Returns the landing latency in seconds, or None on timeout or stop.
+        """
+        start = time.perf_counter()
+        self.previous_bobber_image = None
+        self.pacer.begin("landing")
+        settle_center = None # First position of the current still run
+        still_frames = 0
+
+        while self.is_running.is_set() and time.perf_counter() - start < self.LANDING_TIMEOUT:
+            current_bobber_image, current_search_size, current_center = self._get_bobber_image()
 
+            if current_bobber_image is None:
+                # In flight or hidden by the splash: search the whole casting area next time
+                self.previous_bobber_image = None
+                settle_center, still_frames = None, 0
+            else:
+                self.previous_bobber_image = (current_bobber_image, current_search_size, current_center)
+                if settle_center is not None and max(abs(current_center[0] - settle_center[0]),
+                                                     abs(current_center[1] - settle_center[1])) <= self.LANDING_STABLE_PX:
+                    still_frames += 1
+                else:
+                    settle_center, still_frames = current_center, 1
+                if still_frames >= self.LANDING_STABLE_FRAMES:
+                    return time.perf_counter() - start
+
+            self.pacer.wait()
+
+        self.previous_bobber_image = None
+        return None
 
     def _check_for_bite(self):
         """
@@ -361,13 +568,13 @@ class FishingBotCore:
         target_x = center_x + offset_x
         target_y = center_y + offset_y
         
-        pyautogui.moveTo(target_x, target_y, duration=0.1)
-        pyautogui.mouseDown(button='left')
+        self.input.move_to(target_x, target_y, duration=0.1)
+        self.input.mouse_down('left', force=True)
         time.sleep(hold_time)
-        pyautogui.mouseUp(button='left')
+        self.input.mouse_up('left', force=True)
         
         self.log(f"✅ Fishing bobber cast complete. Hold time: {hold_time:.2f} seconds.")
-        pyautogui.moveTo(self.SAFE_MOUSE_POS[0], self.SAFE_MOUSE_POS[1], duration=0.01)
+        self.input.move_to(self.SAFE_MOUSE_POS[0], self.SAFE_MOUSE_POS[1], duration=0.01)
 
     def _get_roi_coordinates(self, full_area, last_center_rel, padding):
         """
@@ -394,7 +601,8 @@ class FishingBotCore:
         final_h = roi_y2_clamped - roi_y1_clamped
 
         # If ROI is too small (e.g., bobber near edge), fallback to full area
-        if final_w < self.bobber_template.shape[1] or final_h < self.bobber_template.shape[0]:
+        t_w, t_h = self.bobber_bank.max_size
+        if final_w < t_w or final_h < t_h:
             return None, (0, 0) # Fallback indicator
 
         # Absolute screen coordinates for mss
@@ -419,26 +627,65 @@ class FishingBotCore:
 
         t_w, t_h = self.minigame_bar_template.shape[::-1]
         
-        with mss.mss() as sct_local:
-            monitor_full = sct_local.monitors[0]
-            full_screenshot = sct_local.grab(monitor_full)
-            
-            img_array = np.array(full_screenshot, dtype=np.uint8)
-            img_array_bgr = cv2.cvtColor(img_array, cv2.COLOR_BGRA2BGR)
-            gray_img = cv2.cvtColor(img_array_bgr, cv2.COLOR_BGR2GRAY)
-            
-            # Change MATCH_THRESHOLD to 0.5 (0.5 is appropriate if the template matches well)
-            result = cv2.matchTemplate(gray_img, self.minigame_bar_template, cv2.TM_CCOEFF_NORMED)
-            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        monitor_full = self.frame_source.monitors[0]
+        # Grabbed directly: a one-off desktop grab must not retarget the capture stage
+        with self.metrics.span("capture"):
+            img_array = self.frame_source.grab(monitor_full)
+        
+        with self.metrics.span("convert"):
+            gray_img = self.buffers.gray(img_array, "desktop")
+        
+        # Coarse-to-fine search: downscaled match first, full-resolution refinement around the candidates
+        max_val, max_loc = self.bar_matcher.match(gray_img)
+        
+        if max_val >= self.BAR_MATCH_THRESHOLD:
+            # Match location is relative to the desktop image; convert to absolute screen coordinates
+            x, y = max_loc
+            region = (x + monitor_full["left"], y + monitor_full["top"], t_w, t_h)
+            self.current_minigame_region = region # Store in class variable
+            return region
             
-            if max_val >= 0.75:
-                x, y = max_loc
-                region = (x, y, t_w, t_h)
-                self.current_minigame_region = region # Store in class variable
-                return region
-                
+        return None
+
+    def _bar_prior_key(self):
+        return BarLocationPrior.make_key(self.casting_area_ref["area"], self.frame_source.monitors[0])
+
+    def _watch_minigame_bar(self, predicted):
+        """Polls a small window around the predicted bar position until the bar appears or BAR_WATCH_TIMEOUT passes."""
+        if self.minigame_bar_template is None:
             return None
 
+        t_w, t_h = self.minigame_bar_template.shape[::-1]
+        desktop = self.frame_source.monitors[0]
+        
+        # Watch window (absolute), clamped to the desktop
+        left = max(desktop["left"], predicted[0] - self.BAR_WATCH_MARGIN)
+        top = max(desktop["top"], predicted[1] - self.BAR_WATCH_MARGIN)
+        right = min(desktop["left"] + desktop["width"], predicted[0] + t_w + self.BAR_WATCH_MARGIN)
+        bottom = min(desktop["top"] + desktop["height"], predicted[1] + t_h + self.BAR_WATCH_MARGIN)
+        if right - left < t_w or bottom - top < t_h:
+            return None
+        watch_monitor = {"top": top, "left": left, "width": right - left, "height": bottom - top}
+
+        watch_start = time.perf_counter()
+        try:
+            while self.is_running.is_set() and time.perf_counter() - watch_start < self.BAR_WATCH_TIMEOUT:
+                window = self._next_frame(watch_monitor)
+                with self.metrics.span("convert"):
+                    gray_window = self.buffers.gray(window, "bar_watch")
+                result = self.buffers.match(gray_window, self.minigame_bar_template, "bar_watch")
+                _, max_val, _, max_loc = cv2.minMaxLoc(result)
+                
+                if max_val >= self.BAR_MATCH_THRESHOLD:
+                    region = (left + max_loc[0], top + max_loc[1], t_w, t_h)
+                    self.current_minigame_region = region
+                    return region
+                
+                time.sleep(self.BAR_WATCH_INTERVAL)
+        finally:
+            self._pause_capture()
+        return None
+
     # --- Minigame Loop (based on blog rolling() logic) ---
     def minigame_loop(self):
         """Implements the rolling() function logic from the blog (reflects 1/3 probability delay upon reeling release)"""
@@ -450,240 +697,398 @@ class FishingBotCore:
             self.log("🛑 Minigame region is not set, cannot start loop.")
             return False
 
-        # Create local capture instance (to prevent thread errors)
-        try:
-            sct_local = mss.mss()
-        except Exception as e:
-            self.log(f"🛑 Minigame capture initialization error: {e}")
-            return False
-
-        # Call mouseUp just in case of a previous click
-        pyautogui.mouseUp(button='left')
+        # Release just in case of a previous click
+        self.input.mouse_up('left', force=True)
+        self.reel_held = False
+        self.input.reset_stats()
+        self.minigame_controller.reset()
         
         # Absolute coordinates of the bar
         x_bar, y_bar, w_bar, h_bar = self.current_minigame_region
+        self.scanline_analyzer.reset_stats()
+        self.pacer.begin("minigame")
         
         while self.is_running.is_set() and (time.time() - minigame_start_time) < self.MINIGAME_TIMEOUT:
+            iteration_start = time.perf_counter()
+            hold_delay = 0.0
             
             # Calculate capture region
             center_x = x_bar + w_bar // 2
             x_scan_start = center_x - self.MINIGAME_SCAN_WIDTH // 2
-            y_scan_start = y_bar + self.MINIGAME_SCAN_Y_OFFSET
+            y_scan_start = y_bar + self.MINIGAME_SCAN_Y_OFFSET - self.MINIGAME_SCAN_ROWS // 2
             
             scan_monitor = {
                 "top": y_scan_start,
                 "left": x_scan_start,
                 "width": self.MINIGAME_SCAN_WIDTH,
-                "height": 1
+                "height": self.MINIGAME_SCAN_ROWS
             }
 
             try:
-                # 1. Capture 1-pixel line
-                sct_img = sct_local.grab(scan_monitor)
-                img_pil = Image.frombytes('RGB', (self.MINIGAME_SCAN_WIDTH, 1), sct_img.rgb)
+                # 1. Capture scan line(s)
+                scan_lines = self._next_frame(scan_monitor)
+                frame_time = time.perf_counter()
+                if self.pipeline is not None and self.pipeline.is_running:
+                    frame_time -= self.pipeline.frame_age.last # When the frame was captured
                 
-                found_bright_pixel = False
+                # 2. Vectorized scan and control
+                scan = self.scanline_analyzer.analyze(scan_lines)
+                found_bright_pixel = scan.found
                 
-                # 2. Pixel scan and control
-                for i in range(self.MINIGAME_SCAN_WIDTH):
-                    r, g, b = img_pil.getpixel((i, 0))
-                    
-                    if r + g + b > self.ROLL_LIMIT:
-                        
-                        found_bright_pixel = True
+                if scan.found:
+                    if self.minigame_controller.update(scan.position, frame_time, self._input_lead()):
+                        self._set_reel(True)
                         
-                        if i <= self.MINIGAME_REEL_STOP_X:
-                            pyautogui.mouseDown(button='left')
-                            
-                        elif i > self.MINIGAME_REEL_STOP_X:
-                            # Release reeling
-                            pyautogui.mouseUp(button='left')
-                            
-                            # 🚨 Apply 0.2~0.3 second delay with 1/3 probability after reeling release (hold)
-                            if random.random() < (1/3):
-                                delay = random.uniform(0.2, 0.3)
-                                # self.log(f"   [Minigame] Applying random delay: {delay:.2f}s") # Commented out for loop speed
-                                time.sleep(delay)
-                            
-                        break
+                    else:
+                        # Release reeling
+                        self._set_reel(False)
                         
+                        # 🚨 Apply 0.2~0.3 second delay with 1/3 probability after reeling release (hold)
+                        if random.random() < (1/3):
+                            delay = random.uniform(0.2, 0.3)
+                            hold_delay = delay
+                            # self.log(f"   [Minigame] Applying random delay: {delay:.2f}s") # Commented out for loop speed
+                            self.pacer.delay(delay)
                 
                 # When scanning to the end without finding a bright pixel (window closed due to minigame success/failure)
                 if not found_bright_pixel:
-                    pyautogui.mouseUp(button='left')
-                    pyautogui.leftClick() # Interpreted as clicking the fishing end button (safe reeling release)
+                    self._pause_capture()
+                    self._wait_input_idle()
+                    self.input.mouse_up('left')
+                    self.input.click('left') # Interpreted as clicking the fishing end button (safe reeling release)
                     self.log("🎉 Target area disappearance detected! Minigame loop terminated.")
+                    self.log(f"📏 Scanline cost: {self.scanline_analyzer.mean_cost_us:.1f} µs/iteration ({self.scanline_analyzer.scan_count} scans).")
+                    self.log(f"⏲️ Minigame pacing: {self.pacer.format_stats()}")
+                    self.log(f"🖱️ Minigame input: {self.input.format_stats()}")
+                    self._report_minigame_controller()
                     return True
                 
             except Exception as e:
                 self.log(f"Minigame tracking error: {e}")
-                pyautogui.mouseUp(button='left')
+                self._pause_capture()
+                self._wait_input_idle()
+                self.input.mouse_up('left', force=True)
                 return False
             
-            time.sleep(0.001)
+            # Capture + scan + input, without the deliberate hold delay
+            self.metrics.observe("minigame_iteration", time.perf_counter() - iteration_start - hold_delay)
+            self.pacer.wait()
 
         self.log("🛑 Minigame timeout or stop requested.")
-        pyautogui.mouseUp(button='left')
+        self.log(f"⏲️ Minigame pacing: {self.pacer.format_stats()}")
+        self._pause_capture()
+        self._wait_input_idle()
+        self.input.mouse_up('left', force=True)
+        self.log(f"🖱️ Minigame input: {self.input.format_stats()}")
+        self._report_minigame_controller()
         return False
 
-    # --- Main Loop ---
-    def fishing_loop(self):
-        self.log("🤖 Entering fishing loop.")
-        
-        if self.bobber_template is None:
-             self.log("🛑 Cannot start fishing loop due to template load failure.")
-             self.is_running.clear()
-             return
-
-        while self.is_running.is_set():
-            start_time = time.time()
+    def _report_minigame_controller(self):
+        self.log(f"🎮 Minigame controller {self.minigame_controller.format_summary()}")
+        if self.MINIGAME_TRAJECTORY_DIR and self.minigame_controller.trajectory:
             try:
-                self.previous_bobber_image = None
-                self.consecutive_match_fail_count = 0
-                self.current_minigame_region = None
-                self.initial_bobber_y = None # 🚨 Initialization at loop start
-                
-                # 1. Cast bobber
-                self.cast_fishing_rod()
-                time.sleep(2.0)
-                if not self.is_running.is_set(): break
+                path = self.minigame_controller.write_trajectory(self.MINIGAME_TRAJECTORY_DIR)
+                self.log(f"📝 Marker trajectory saved to {path}")
+            except OSError as e:
+                self.log(f"❌ Marker trajectory write error: {e}")
 
-                # 2. Detect initial bobber image
-                initial_check_success = False
-                MAX_ATTEMPTS = 5
-                self.log("⏳ Attempting bobber landing and initial image detection...")
-                
-                self.previous_bobber_image = None
+    # --- Session Statistics ---
+    def _session_settings(self):
+        return {
+            "area": list(self.casting_area_ref["area"]),
+            "cast_time": [self.min_cast_time, self.max_cast_time],
+            "drop_threshold": self.POSITION_DIFF_THRESHOLD,
+            "match_threshold": self.MATCH_THRESHOLD,
+        }
 
-                for attempt in range(MAX_ATTEMPTS):
-                    current_bobber_image, current_search_size, current_center = self._get_bobber_image()
-                    
-                    if current_bobber_image is not None:
-                        self.previous_bobber_image = (current_bobber_image, current_search_size, current_center)
-                        self.initial_bobber_y = current_center[1] # 🚨 Store initial Y coordinate
-                        self.log(f"✅ Bobber landing and initial image save successful (Initial Y: {self.initial_bobber_y}).")
-                        initial_check_success = True
-                        break
-                    
-                    if not self.is_running.is_set(): break
-                    time.sleep(0.2)
-
-                if not initial_check_success:
-                    if self.is_running.is_set():
-                        self.log(f"⚠️ Initial bobber landing detection failed. Recasting in 1 seconds.")
-                        time.sleep(1.0)
-                    if not self.is_running.is_set(): break
-                    continue
+    def _record_cycle(self, cycle):
+        if cycle is None or self.session_store is None:
+            return
+        cycle["cycle_s"] = time.time() - cycle["started_at"]
+        self.session_store.record_cycle(cycle)
+
+    # --- Fishing States ---
+    def _build_state_machine(self):
+        """One State per phase of the cycle; each handler returns the next state's name (None = stop)."""
+        machine = StateMachine([
+            State("cast", self._state_cast),
+            State("landing", self._state_landing),
+            State("recast_delay", self._state_recast_delay),
+            State("bite_wait", self._state_bite_wait),
+            State("hook", self._state_hook),
+            State("bar_search", self._state_bar_search),
+            State("bar_failed", self._state_bar_failed),
+            State("minigame", self._state_minigame),
+            State("cleanup", self._state_cleanup),
+            State("timeout", self._state_timeout),
+        ], "cast")
+        machine.add_hook(lambda state, next_name: self.metrics.observe(f"state_{state.name}", state.last_duration))
+        return machine
+
+    def _state_cast(self):
+        # A new cycle starts here; the previous one is complete
+        self.cycle_start_time = time.time()
+        self._record_cycle(self.cycle)
+        self.cycle = {"started_at": self.cycle_start_time, "outcome": "stopped"}
+        self.previous_bobber_image = None
+        self.consecutive_match_fail_count = 0
+        self.current_minigame_region = None
+        self.initial_bobber_y = None # 🚨 Initialization at loop start
+
+        cast_start = time.perf_counter()
+        self.cast_fishing_rod()
+        self.cycle["cast_s"] = time.perf_counter() - cast_start
+        return "landing" if self.is_running.is_set() else None
+
+    def _state_landing(self):
+        # Bobber position stable for a few frames
+        self.log("⏳ Attempting bobber landing and initial image detection...")
+        landing_time = self._wait_for_landing()
+        self.cycle["landing_s"] = landing_time
+        if landing_time is None:
+            if not self.is_running.is_set(): return None
+            self.cycle["outcome"] = "landing_failed"
+            return "recast_delay"
+
+        self.initial_bobber_y = self.previous_bobber_image[2][1] # 🚨 Store initial Y coordinate
+        self.metrics.observe("landing", landing_time)
+        self.log(f"✅ Bobber landed after {landing_time * 1000:.0f} ms (Initial Y: {self.initial_bobber_y}, template: {self.bobber_template_name}).")
+        self.log(f"✅ Minimum drop threshold: {self.POSITION_DIFF_THRESHOLD} pixels.")
+        return "bite_wait"
+
+    def _state_recast_delay(self):
+        self._pause_capture()
+        self.log(f"⚠️ Initial bobber landing detection failed. Recasting in 1 seconds.")
+        time.sleep(1.0)
+        return "cast" if self.is_running.is_set() else None
+
+    def _state_bite_wait(self):
+        # Wait for bite detection (max BITE_TIMEOUT seconds)
+        self.is_bite_detected.clear()
+        
+        bite_start_time = time.time()
+        if self.pipeline is not None:
+            self.pipeline.reset_metrics()
+        else:
+            self.capture.reset_stats()
+        self.bobber_tracker.reset_stats()
+        self.pacer.begin("bite")
+        
+        while self.is_running.is_set() and (time.time() - bite_start_time) < self.BITE_TIMEOUT:
+            
+            with self.metrics.span("bite_check"):
+                bitten = self._check_for_bite()
+            if bitten:
+                self.is_bite_detected.set()
+                break
                 
-                self.log(f"✅ Minimum drop threshold: {self.POSITION_DIFF_THRESHOLD} pixels.")
+            # 🚨 Logging is handled inside _check_for_bite, so only time measurement is done here.
+            self.pacer.wait() # Next deadline of the bite-watch rate
+            
+        self.cycle["bite_wait_s"] = time.time() - bite_start_time
+        self._pause_capture()
+        if self.pipeline is not None:
+            self.log(f"📊 Bite loop pipeline: {self.pipeline.format_metrics()}")
+        else:
+            self.log(f"📷 Bite loop capture rate: {self.capture.grabs_per_sec:.1f} grabs/sec ({self.capture.grab_count} frames).")
+        self.log(f"⏲️ Bite loop pacing: {self.pacer.format_stats()}")
+        if self.BOBBER_TRACKING:
+            tracker = self.bobber_tracker
+            self.log(f"🎯 Bobber tracker: {tracker.tracked_frames} tracked, {tracker.lost_frames} lost ({tracker.loss_rate * 100:.1f}%), {tracker.anchors} anchors, {tracker.mean_cost_us:.0f} µs/frame.")
+        if not self.is_running.is_set(): return None
+
+        if self.is_bite_detected.is_set():
+            return "hook"
+        self.cycle["outcome"] = "bite_timeout"
+        return "timeout"
+
+    def _state_hook(self):
+        # Apply 0.5 ~ 1.0 second random delay
+        click_delay = random.uniform(0.5, 1.0)
+        self.log(f"🚨 Bite detection successful! Clicking after {click_delay:.2f} seconds.")
+        time.sleep(click_delay)
 
-                # 3. Wait for bite detection (max 30 seconds)
-                max_wait_time = 30
-                self.is_bite_detected.clear()
+        # Calculate bobber center click position and random adjustment
+        if self.previous_bobber_image and len(self.previous_bobber_image) > 2:
+             x_root, y_root, _, _ = self.casting_area_ref["area"]
+             
+             # Bobber center coordinates (relative coordinates)
+             center_x_rel = self.previous_bobber_image[2][0]
+             center_y_rel = self.previous_bobber_image[2][1]
+
+             # 🎣 Random offset (reduced to +-5 pixels for improved accuracy)
+             offset_x = random.randint(-5, 5)
+             offset_y = random.randint(-5, 5)
+
+             # Final click coordinates (absolute coordinates)
+             click_x = x_root + center_x_rel + offset_x
+             click_y = y_root + center_y_rel + offset_y
+
+             self.input.move_to(click_x, click_y, duration=0.1)
+             self.input.click('left')
+             self.log(f"✅ Click around bobber complete. (offset: {offset_x}, {offset_y})")
+        else:
+             self.input.click('left')
+             self.log("✅ Last cast position click complete.")
+
+        self.bite_click_time = time.perf_counter()
+        return "bar_search"
+
+    def _state_bar_search(self):
+        # 1. Watch the learned bar position first
+        bar_region = None
+        bar_found_by = None
+        prior_key = self._bar_prior_key()
+        predicted = self.bar_prior.predict(prior_key)
+        
+        bar_attempts = 0
+        if predicted is not None:
+            bar_attempts += 1
+            with self.metrics.span("bar_watch"):
+                bar_region = self._watch_minigame_bar(predicted)
+            if bar_region is not None:
+                bar_found_by = "watcher"
+                self.log(f"✅ Minigame bar found at the learned position {predicted}.")
+            elif self.is_running.is_set():
+                self.log(f"  [Bar Detection] Not at the learned position {predicted}. Falling back to full-screen search.")
+        
+        if not self.is_running.is_set(): return None
+
+        # 2. Find minigame bar position on the whole screen (retry logic added)
+        if bar_region is None:
+            self.log(f"🔍 Dynamically searching for minigame bar location (max {self.MAX_BAR_SEARCH_ATTEMPTS} retries)...")
+            
+            for attempt in range(self.MAX_BAR_SEARCH_ATTEMPTS):
+                bar_attempts += 1
+                with self.metrics.span("bar_search"):
+                    bar_region = self._find_minigame_bar_region()
                 
-                bite_start_time = time.time()
+                if bar_region is not None:
+                    self.current_minigame_region = bar_region
+                    bar_found_by = "full search"
+                    self.log(f"✅ Minigame bar detection successful. (Attempt {attempt+1})")
+                    break
                 
-                while self.is_running.is_set() and (time.time() - bite_start_time) < max_wait_time:
-                    
-                    if self._check_for_bite():
-                        self.is_bite_detected.set()
-                        break
-                        
-                    # 🚨 Logging is handled inside _check_for_bite, so only time measurement is done here.
-                    time.sleep(0.001) # Minimum wait time to reduce CPU load
-                    
                 if not self.is_running.is_set(): break
+                
+                # Wait briefly if not found
+                time.sleep(self.BAR_SEARCH_INTERVAL)
+                self.log(f"  [Bar Detection] Failed. {attempt+1} / {self.MAX_BAR_SEARCH_ATTEMPTS} retrying...")
+        
+        self.cycle["bar_search_s"] = time.perf_counter() - self.bite_click_time
+        self.cycle["bar_search_attempts"] = bar_attempts
+        self.cycle["bar_found_by"] = bar_found_by
+        if not self.is_running.is_set(): return None
 
-                # 4. Confirm bite and enter minigame
-                if self.is_bite_detected.is_set():
-                    
-                    # 4-A. Apply 0.5 ~ 1.0 second random delay
-                    click_delay = random.uniform(0.5, 1.0)
-                    self.log(f"🚨 Bite detection successful! Clicking after {click_delay:.2f} seconds.")
-                    time.sleep(click_delay)
-
-                    # 4-B. Calculate bobber center click position and random adjustment
-                    if self.previous_bobber_image and len(self.previous_bobber_image) > 2:
-                         x_root, y_root, _, _ = self.casting_area_ref["area"]
-                         
-                         # Bobber center coordinates (relative coordinates)
-                         center_x_rel = self.previous_bobber_image[2][0]
-                         center_y_rel = self.previous_bobber_image[2][1]
-
-                         # 🎣 Random offset (reduced to +-5 pixels for improved accuracy)
-                         offset_x = random.randint(-5, 5)
-                         offset_y = random.randint(-5, 5)
-
-                         # Final click coordinates (absolute coordinates)
-                         click_x = x_root + center_x_rel + offset_x
-                         click_y = y_root + center_y_rel + offset_y
-
-                         pyautogui.moveTo(click_x, click_y, duration=0.1)
-                         pyautogui.click()
-                         self.log(f"✅ Click around bobber complete. (offset: {offset_x}, {offset_y})")
-                    else:
-                         pyautogui.click()
-                         self.log("✅ Last cast position click complete.")
+        if bar_region is None:
+            self.cycle["outcome"] = "bar_not_found"
+            return "bar_failed"
 
-                    
-                    # 4-1. Find minigame bar position (retry logic added)
-                    self.log(f"🔍 Dynamically searching for minigame bar location (max {self.MAX_BAR_SEARCH_ATTEMPTS} retries)...")
-                    
-                    bar_region = None
-                    for attempt in range(self.MAX_BAR_SEARCH_ATTEMPTS):
-                        bar_region = self._find_minigame_bar_region()
-                        
-                        if bar_region is not None:
-                            self.current_minigame_region = bar_region
-                            self.log(f"✅ Minigame bar detection successful. (Attempt {attempt+1})")
-                            break
-                        
-                        if not self.is_running.is_set(): return
-                        
-                        # Wait briefly if not found
-                        time.sleep(self.BAR_SEARCH_INTERVAL)
-                        self.log(f"  [Bar Detection] Failed. {attempt+1} / {self.MAX_BAR_SEARCH_ATTEMPTS} retrying...")
-                    
-                    if bar_region is None:
-                        self.log("🛑 Minigame bar detection failed finally! Skipping minigame.")
-                        # Maintain 5.0 seconds wait time until the minigame window closes
-                        time.sleep(5.0)
-                        # Post-minigame failure process (move to the next fishing loop)
-                    else:
-                        # 4-2. Call minigame loop
-                        detection_delay = time.time() - start_time
-                        self.log(f"Delay: {detection_delay:.3f} seconds. Starting minigame.")
-                        self.minigame_loop()
-                    
-                    if not self.is_running.is_set(): break
+        self.bar_prior.update(prior_key, bar_region)
+        bar_delay = self.cycle["bar_search_s"]
+        self.metrics.observe("bite_to_minigame", bar_delay)
+        self.log(f"⏱️ Bite click → minigame start: {bar_delay * 1000:.0f} ms ({bar_found_by}).")
+        return "minigame"
 
-                    # 4-3. Post-processing
-                    self.log("🔑 Post-processing: Press Cancel key (S) and wait 1 second.")
-                    pyautogui.press('s')
-                    time.sleep(1.0)
-                    
-                    # Randomly set rest time after fishing
-                    sleep_duration = random.uniform(0.5, 1.2)
-                    self.log(f"😴 Resting for {sleep_duration:.2f} seconds...")
-                    time.sleep(sleep_duration)
-                    if not self.is_running.is_set(): break
-
-                elif self.is_running.is_set():
-                    self.log("⌛ Bite detection time exceeded (30 seconds).")
-                    
-                    self.log("🔑 Press Cancel key (S) and wait 1 second after timeout.")
-                    pyautogui.press('s')
-                    time.sleep(1.0)
-                    
-                    self.log("Waiting 2 seconds for the next loop.")
-                    time.sleep(2.0)
-                    if not self.is_running.is_set(): break
+    def _state_bar_failed(self):
+        self.log("🛑 Minigame bar detection failed finally! Skipping minigame.")
+        # Maintain 5.0 seconds wait time until the minigame window closes
+        time.sleep(5.0)
+        return "cleanup" if self.is_running.is_set() else None
 
-            except Exception as e:
-                self.log(f"❌ Error occurred during fishing loop: {e}")
-                self.log(traceback.format_exc())
-                self.is_running.clear()
-                break
+    def _state_minigame(self):
+        detection_delay = time.time() - self.cycle_start_time
+        self.metrics.observe("cast_to_minigame", detection_delay)
+        self.log(f"Delay: {detection_delay:.3f} seconds. Starting minigame.")
+        if self.pipeline is not None:
+            self.pipeline.reset_metrics()
+        minigame_start = time.perf_counter()
+        completed = self.minigame_loop()
+        self.cycle["minigame_s"] = time.perf_counter() - minigame_start
+        self.cycle["outcome"] = "minigame_closed" if completed else "minigame_failed"
+        if self.pipeline is not None:
+            self.log(f"📊 Minigame pipeline: {self.pipeline.format_metrics()}")
+        return "cleanup" if self.is_running.is_set() else None
+
+    def _state_cleanup(self):
+        # Post-processing
+        self.log("🔑 Post-processing: Press Cancel key (S) and wait 1 second.")
+        self.input.press('s')
+        time.sleep(1.0)
+        
+        # Randomly set rest time after fishing
+        sleep_duration = random.uniform(0.5, 1.2)
+        self.log(f"😴 Resting for {sleep_duration:.2f} seconds...")
+        time.sleep(sleep_duration)
+        return "cast" if self.is_running.is_set() else None
+
+    def _state_timeout(self):
+        self.log(f"⌛ Bite detection time exceeded ({self.BITE_TIMEOUT} seconds).")
+        
+        self.log("🔑 Press Cancel key (S) and wait 1 second after timeout.")
+        self.input.press('s')
+        time.sleep(1.0)
+        
+        self.log("Waiting 2 seconds for the next loop.")
+        time.sleep(2.0)
+        return "cast" if self.is_running.is_set() else None
+
+    # --- Main Loop ---
+    def _calibrate_bobber_match(self):
+        """Times direct vs FFT bobber matching on one casting-area frame, so no detection frame pays for it."""
+        x, y, w, h = self.casting_area_ref["area"]
+        try:
+            frame = self.frame_source.grab({"top": y, "left": x, "width": w, "height": h})
+            crossovers = self.bobber_bank.calibrate(cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY))
+        except Exception as e:
+            self.log(f"⚠️ Bobber match calibration failed, matching directly: {e}")
+            return
+        used = [c for c in crossovers if c is not None]
+        self.log(f"📐 Bobber match: FFT from {min(used)} px" if used else "📐 Bobber match: direct (FFT was not faster)")
+
+    def fishing_loop(self):
+        self.log("🤖 Entering fishing loop.")
+        
+        if self.bobber_template is None:
+             self.log("🛑 Cannot start fishing loop due to template load failure.")
+             self.is_running.clear()
+             return
+
+        if self.BOBBER_MATCH_METHOD == "auto":
+            self._calibrate_bobber_match()
+        if self.pipeline is not None:
+            self.pipeline.start()
+        if self.METRICS_HTTP_PORT or self.METRICS_SNAPSHOT_PATH:
+            self.metrics_exporter = MetricsExporter(self.metrics, port=self.METRICS_HTTP_PORT, snapshot_path=self.METRICS_SNAPSHOT_PATH,
+                                                    interval=self.METRICS_SNAPSHOT_INTERVAL, log=self.log)
+            self.metrics_exporter.start()
+        if self.SESSION_DB_PATH:
+            self.session_store = SessionStore(self.SESSION_DB_PATH, log=self.log)
+            self.session_store.start_session(self._session_settings())
+
+        self.cycle = None
+        self.state_machine.reset()
+        try:
+            self.state_machine.run(self.is_running.is_set)
+        except Exception as e:
+            if self.cycle is not None:
+                self.cycle["outcome"] = "error"
+            self.log(f"❌ Error occurred during fishing loop: {e}")
+            self.log(traceback.format_exc())
+            self.is_running.clear()
         
+        self._record_cycle(self.cycle)
+        self.cycle = None
+        self.log(f"🧭 Time per state: {self.state_machine.format_stats()}")
+        self._pause_capture()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+        if self.session_store is not None:
+            self.session_store.close()
+            self.session_store = None
+            self.log(f"🗃️ Session statistics saved to {self.SESSION_DB_PATH} (python session_store.py report).")
         self.is_running.clear()
         self.log("😴 Fishing bot routine terminated finally.")
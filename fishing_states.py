@@ -0,0 +1,111 @@
+import time
+
+
+class State:
+    """One phase of the fishing cycle.
+
+    `handler()` does the work of the phase and returns the name of the next
+    state (None stops the machine). The machine stamps `entered_at` and
+    `exited_at` (perf_counter) and keeps the visit count and total time.
+    """
+
+    def __init__(self, name, handler):
+        self.name = name
+        self.handler = handler
+        self.entered_at = None
+        self.exited_at = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.visits = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    @property
+    def last_duration(self):
+        if self.entered_at is None or self.exited_at is None or self.exited_at < self.entered_at:
+            return 0.0
+        return self.exited_at - self.entered_at
+
+    @property
+    def mean_time(self):
+        return self.total_time / self.visits if self.visits else 0.0
+
+
+class StateMachine:
+    """Runs States one step at a time and aggregates the time spent in each.
+
+        machine = StateMachine([State("cast", cast), State("landing", landing), ...], "cast")
+        while machine.current is not None:
+            machine.step()
+
+    Transition hooks are called after every step as hook(state, next_name),
+    where `state` is the State that just exited (its last_duration is set).
+    `transitions` counts (from, to) pairs and their total time in `from`, so
+    slow transitions stand out.
+    """
+
+    def __init__(self, states, initial, clock=time.perf_counter):
+        self.states = {state.name: state for state in states}
+        self.initial = initial
+        self.clock = clock
+        self.hooks = []
+        self.reset()
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def reset(self, initial=None):
+        """Back to the initial state with fresh statistics."""
+        self.current = self.states[initial or self.initial]
+        self.transitions = {} # (from, to) -> [count, total seconds in `from`]
+        for state in self.states.values():
+            state.entered_at = state.exited_at = None
+            state.reset_stats()
+
+    def stop(self):
+        self.current = None
+
+    def step(self):
+        """Runs the current state's handler once, then moves to the state it returned. Returns that name (None when stopped)."""
+        state = self.current
+        if state is None:
+            return None
+        state.entered_at = self.clock()
+        try:
+            next_name = state.handler()
+        except Exception:
+            self._exit(state, None)
+            raise
+        self._exit(state, next_name)
+        return next_name
+
+    def run(self, should_continue=lambda: True):
+        while self.current is not None and should_continue():
+            self.step()
+
+    def _exit(self, state, next_name):
+        state.exited_at = self.clock()
+        duration = state.last_duration
+        state.visits += 1
+        state.total_time += duration
+        state.max_time = max(state.max_time, duration)
+
+        entry = self.transitions.setdefault((state.name, next_name), [0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+
+        self.current = self.states[next_name] if next_name is not None else None
+        for hook in self.hooks:
+            hook(state, next_name)
+
+    def stats(self):
+        """{state: {visits, total_s, mean_s, max_s}} for the states visited so far."""
+        return {
+            name: {"visits": s.visits, "total_s": s.total_time, "mean_s": s.mean_time, "max_s": s.max_time}
+            for name, s in self.states.items() if s.visits
+        }
+
+    def format_stats(self):
+        visited = sorted((s for s in self.states.values() if s.visits), key=lambda s: -s.total_time)
+        return ", ".join(f"{s.name} {s.total_time:.1f} s ({s.visits}x, mean {s.mean_time * 1000:.0f} ms)" for s in visited)
@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class FrameBuffers:
+    """Reusable output arrays for the per-frame OpenCV calls.
+
+    gray(), match() and pyr_down() write into an array kept per (name,
+    shape), so a steady loop allocates nothing after its first frame. The
+    name identifies the call site or template, so every (image size,
+    template) pair gets its own match-result buffer.
+
+    A returned array is overwritten by the next call with the same name and
+    shape. Copy anything that must outlive the frame. Concurrent callers
+    (e.g. TemplateBank's pool) must use different names. At most
+    MAX_BUFFERS arrays are kept; the least recently used is dropped first.
+    With reuse=False every call allocates, as plain cv2 calls do.
+    """
+
+    MAX_BUFFERS = 64
+
+    def __init__(self, reuse=True):
+        self.reuse = reuse
+        self._buffers = OrderedDict()
+        self._lock = threading.Lock()
+        self.allocations = 0 # Arrays created (every call when reuse is off)
+
+    def get(self, name, shape, dtype=np.uint8):
+        key = (name, shape, dtype)
+        with self._lock:
+            if not self.reuse:
+                self.allocations += 1
+                return np.empty(shape, dtype)
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = np.empty(shape, dtype)
+                self.allocations += 1
+                if len(self._buffers) > self.MAX_BUFFERS:
+                    self._buffers.popitem(last=False)
+            else:
+                self._buffers.move_to_end(key)
+        return buffer
+
+    def gray(self, bgra, name):
+        """BGRA (or a view of one) straight to grayscale."""
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY, dst=self.get(name, bgra.shape[:2]))
+
+    def match(self, image, template, name, method=cv2.TM_CCOEFF_NORMED):
+        """cv2.matchTemplate into the (image size, template) result buffer."""
+        shape = (image.shape[0] - template.shape[0] + 1, image.shape[1] - template.shape[1] + 1)
+        return cv2.matchTemplate(image, template, method, result=self.get(name, shape, np.float32))
+
+    def pyr_down(self, image, name):
+        shape = ((image.shape[0] + 1) // 2, (image.shape[1] + 1) // 2)
+        return cv2.pyrDown(image, dst=self.get(name, shape, image.dtype))
+
+    def clear(self):
+        with self._lock:
+            self._buffers.clear()
+
+    @property
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer in self._buffers.values())
@@ -0,0 +1,123 @@
+import time
+
+from pipeline import RunningStat
+
+
+class FramePacer:
+    """Paces a detection loop at a target rate per phase using monotonic deadlines.
+
+    The loop calls begin(phase) once, then wait() at the end of every
+    iteration. wait() sleeps until the next deadline. Deadlines advance by one
+    period each time, so a slow iteration does not shift the iterations after
+    it. An iteration that overruns its deadline counts as missed, and the
+    schedule restarts from the current time instead of bursting to catch up.
+
+    The CPU time the loop thread spends per period (time.thread_time) is
+    smoothed into `load`. When it exceeds `cpu_budget` (fraction of one core),
+    the rate backs off by BACKOFF down to `min_fraction` of the phase target.
+    It recovers by RECOVER while the load stays under half the budget.
+    """
+
+    BACKOFF = 0.8        # Rate multiplier when the CPU budget is exceeded
+    RECOVER = 1.05       # Rate multiplier while well under budget
+    LOAD_SMOOTHING = 0.1 # EWMA weight of the newest load sample
+
+    def __init__(self, rates, cpu_budget=0.5, min_fraction=0.25, on_rate_change=None):
+        self.rates = dict(rates) # phase -> target Hz
+        self.cpu_budget = cpu_budget
+        self.min_fraction = min_fraction
+        self.on_rate_change = on_rate_change # Called with the new rate (Hz) whenever it changes
+
+        self.phase = None
+        self.target_hz = 0.0
+        self.rate = 0.0
+        self.jitter = RunningStat() # Seconds woken after the deadline
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.iterations = 0
+        self.missed = 0
+        self.backoffs = 0
+        self.load = 0.0
+        self.jitter.reset()
+        self._start = time.monotonic()
+
+    def begin(self, phase):
+        """Starts pacing `phase` at its configured rate and resets the statistics."""
+        self.phase = phase
+        self.target_hz = float(self.rates[phase])
+        self.reset_stats()
+        self._set_rate(self.target_hz)
+        self._deadline = time.monotonic() + self.period
+        self._cpu_mark = time.thread_time()
+
+    @property
+    def period(self):
+        return 1.0 / self.rate if self.rate > 0 else 0.0
+
+    @property
+    def achieved_hz(self):
+        elapsed = time.monotonic() - self._start
+        return self.iterations / elapsed if elapsed > 0 else 0.0
+
+    def _set_rate(self, rate):
+        if rate != self.rate:
+            self.rate = rate
+            if self.on_rate_change:
+                self.on_rate_change(rate)
+
+    def _adapt(self, cpu_seconds):
+        period = self.period
+        if period <= 0:
+            return
+        self.load += self.LOAD_SMOOTHING * (cpu_seconds / period - self.load)
+
+        floor = self.target_hz * self.min_fraction
+        if self.load > self.cpu_budget and self.rate > floor:
+            self._set_rate(max(floor, self.rate * self.BACKOFF))
+            self.backoffs += 1
+            self.load = self.cpu_budget # Re-measure at the new rate before backing off again
+        elif self.load < self.cpu_budget / 2 and self.rate < self.target_hz:
+            self._set_rate(min(self.target_hz, self.rate * self.RECOVER))
+
+    def wait(self):
+        """Ends one iteration: adapts the rate, then sleeps until the next deadline."""
+        self.iterations += 1
+        cpu_now = time.thread_time()
+        self._adapt(cpu_now - self._cpu_mark)
+
+        now = time.monotonic()
+        if now > self._deadline:
+            self.missed += 1
+            self._deadline = now + self.period
+        else:
+            time.sleep(self._deadline - now)
+            self.jitter.add(max(0.0, time.monotonic() - self._deadline))
+            self._deadline += self.period
+        self._cpu_mark = time.thread_time()
+
+    def delay(self, seconds):
+        """Deliberate pause inside an iteration; the schedule restarts after it instead of counting a miss."""
+        time.sleep(seconds)
+        self._deadline = max(self._deadline, time.monotonic() + self.period)
+
+    def stats(self):
+        return {
+            "phase": self.phase,
+            "target_hz": self.target_hz,
+            "rate_hz": self.rate,
+            "achieved_hz": self.achieved_hz,
+            "iterations": self.iterations,
+            "missed_deadlines": self.missed,
+            "jitter_ms_mean": self.jitter.mean * 1000,
+            "jitter_ms_max": self.jitter.max * 1000,
+            "cpu_load": self.load,
+            "backoffs": self.backoffs,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"{s['achieved_hz']:.1f} Hz achieved (target {s['target_hz']:.0f}, now {s['rate_hz']:.0f}), "
+                f"{s['missed_deadlines']}/{s['iterations']} deadlines missed, "
+                f"jitter {s['jitter_ms_mean']:.2f}/{s['jitter_ms_max']:.2f} ms (mean/max), "
+                f"CPU {s['cpu_load'] * 100:.0f}% of a core ({s['backoffs']} backoffs)")
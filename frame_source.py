@@ -0,0 +1,271 @@
+import json
+import mmap
+import struct
+import threading
+import time
+
+import numpy as np
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+
+# --- 1. Frame Source Interface ---
+class FrameSource:
+    """Base class for everything FishingBotCore captures from.
+
+    grab() takes an mss-style monitor dict ({"top", "left", "width", "height"})
+    and returns an (height, width, 4) uint8 BGRA array, the same layout as
+    np.array(mss_screenshot).
+    """
+
+    def grab(self, monitor):
+        raise NotImplementedError
+
+    @property
+    def monitors(self):
+        """mss-style monitor list (index 0 is the full virtual desktop)"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+
+# --- 2. Live Screen Capture (mss) ---
+class MssFrameSource(FrameSource):
+    """Captures the live screen with mss, keeping one persistent handle per thread.
+
+    mss handles are not safe to share between threads, so each thread that
+    grabs gets its own handle on first use and keeps it until close().
+    """
+
+    def __init__(self):
+        if mss is None:
+            raise RuntimeError("mss is not installed; live screen capture is unavailable.")
+        self._local = threading.local()
+        self._handles = []
+        self._handles_lock = threading.Lock()
+        self._monitors = None
+
+    def _handle(self):
+        sct_local = getattr(self._local, "sct", None)
+        if sct_local is None:
+            sct_local = mss.mss()
+            self._local.sct = sct_local
+            with self._handles_lock:
+                self._handles.append(sct_local)
+        return sct_local
+
+    def grab(self, monitor):
+        return np.asarray(self._handle().grab(monitor), dtype=np.uint8)
+
+    @property
+    def monitors(self):
+        if self._monitors is None:
+            self._monitors = [dict(m) for m in self._handle().monitors]
+        return self._monitors
+
+    def close(self):
+        with self._handles_lock:
+            handles, self._handles = self._handles, []
+        for sct_local in handles:
+            try:
+                sct_local.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+
+# --- 3. Session Recording File Format ---
+# File layout:
+#   MAGIC | uint32 header length | JSON header ({"monitors": [...]})
+#   then one record per frame:
+#   float64 timestamp | int32 left | int32 top | uint32 width | uint32 height | BGRA bytes
+# The file is grown ahead of the frames and zero-filled; a frame header with
+# zero width or height ends the recording (an unclosed file keeps that padding).
+RECORDING_MAGIC = b"AFBREC01"
+_HEADER_LEN = struct.Struct("<I")
+_FRAME_HEADER = struct.Struct("<diiII")
+
+
+class FrameRecorder(FrameSource):
+    """Passes grabs through to another source and streams every frame into a memory-mapped file."""
+
+    INITIAL_CAPACITY = 16 * 1024 * 1024  # Initial file size (bytes); doubled when full
+
+    def __init__(self, source, path):
+        self.source = source
+        self.path = path
+        self._lock = threading.Lock()
+        self._start_time = time.perf_counter()
+        self.frame_count = 0
+
+        header = json.dumps({"monitors": source.monitors}).encode("utf-8")
+        self._file = open(path, "w+b")
+        self._capacity = max(self.INITIAL_CAPACITY, len(RECORDING_MAGIC) + _HEADER_LEN.size + len(header))
+        self._file.truncate(self._capacity)
+        self._mm = mmap.mmap(self._file.fileno(), self._capacity)
+
+        self._pos = 0
+        self._write(RECORDING_MAGIC)
+        self._write(_HEADER_LEN.pack(len(header)))
+        self._write(header)
+
+    @property
+    def monitors(self):
+        return self.source.monitors
+
+    def _ensure_capacity(self, size):
+        if self._pos + size <= self._capacity:
+            return
+        new_capacity = self._capacity
+        while self._pos + size > new_capacity:
+            new_capacity *= 2
+        self._mm.flush()
+        self._mm.close()
+        self._file.truncate(new_capacity)
+        self._mm = mmap.mmap(self._file.fileno(), new_capacity)
+        self._capacity = new_capacity
+
+    def _write(self, data):
+        self._ensure_capacity(len(data))
+        self._mm[self._pos:self._pos + len(data)] = data
+        self._pos += len(data)
+
+    def grab(self, monitor):
+        frame = self.source.grab(monitor)
+        self.record(frame, monitor)
+        return frame
+
+    def record(self, frame, monitor, timestamp=None):
+        """Appends one BGRA frame captured at `monitor` to the recording."""
+        if timestamp is None:
+            timestamp = time.perf_counter() - self._start_time
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        height, width = frame.shape[:2]
+        if not width or not height:
+            return # A zero-size header marks the end of the recording
+
+        with self._lock:
+            if self._mm is None:
+                return
+            self._write(_FRAME_HEADER.pack(timestamp, monitor["left"], monitor["top"], width, height))
+            self._write(frame.reshape(-1).data)
+            self.frame_count += 1
+
+    def close(self):
+        """Trims the file to the recorded size, closes it and closes the wrapped source."""
+        with self._lock:
+            if self._mm is None:
+                return
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+            self._file.truncate(self._pos)
+            self._file.close()
+        self.source.close()
+
+
+# --- 4. Session Replay ---
+class ReplayFrameSource(FrameSource):
+    """Serves frames from a FrameRecorder file, in order, as zero-copy views into the mapping.
+
+    With realtime=True each frame is held back until its recorded timestamp;
+    otherwise frames are served as fast as they are requested. A requested
+    monitor that lies inside the recorded frame is returned as a slice of it.
+    """
+
+    def __init__(self, path, realtime=False, loop=False):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(RECORDING_MAGIC)] != RECORDING_MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a frame recording.")
+
+        pos = len(RECORDING_MAGIC)
+        (header_len,) = _HEADER_LEN.unpack_from(self._mm, pos)
+        pos += _HEADER_LEN.size
+        header = json.loads(self._mm[pos:pos + header_len].decode("utf-8"))
+        pos += header_len
+        self._monitors = header["monitors"]
+
+        # Frame index: (timestamp, left, top, width, height, data offset)
+        self.frames = []
+        # Stops at the zero padding of an unclosed recording or at a frame cut short
+        while pos + _FRAME_HEADER.size <= len(self._mm):
+            timestamp, left, top, width, height = _FRAME_HEADER.unpack_from(self._mm, pos)
+            pos += _FRAME_HEADER.size
+            if not width or not height or pos + width * height * 4 > len(self._mm):
+                break
+            self.frames.append((timestamp, left, top, width, height, pos))
+            pos += width * height * 4
+
+        self._index = 0
+        self._lock = threading.Lock()
+        self._replay_start = None
+
+    @property
+    def monitors(self):
+        return self._monitors
+
+    def __len__(self):
+        return len(self.frames)
+
+    def rewind(self):
+        with self._lock:
+            self._index = 0
+            self._replay_start = None
+
+    def frame(self, index):
+        """Returns (timestamp, monitor, BGRA view) of a recorded frame without advancing."""
+        timestamp, left, top, width, height, offset = self.frames[index]
+        view = np.frombuffer(self._mm, dtype=np.uint8, count=width * height * 4, offset=offset)
+        monitor = {"top": top, "left": left, "width": width, "height": height}
+        return timestamp, monitor, view.reshape(height, width, 4)
+
+    def grab(self, monitor):
+        with self._lock:
+            if self._index >= len(self.frames):
+                if not self.loop or not self.frames:
+                    raise EOFError(f"Replay of '{self.path}' is exhausted.")
+                self._index = 0
+                self._replay_start = None
+            index = self._index
+            self._index += 1
+
+            timestamp, recorded, frame = self.frame(index)
+            if self._replay_start is None:
+                self._replay_start = time.perf_counter() - timestamp
+
+        if self.realtime:
+            wait = self._replay_start + timestamp - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+
+        x = monitor["left"] - recorded["left"]
+        y = monitor["top"] - recorded["top"]
+        if x < 0 or y < 0 or x + monitor["width"] > recorded["width"] or y + monitor["height"] > recorded["height"]:
+            raise ValueError(f"Replay diverged at frame {index}: requested {monitor}, recorded {recorded}.")
+        return frame[y:y + monitor["height"], x:x + monitor["width"]]
+
+    def close(self):
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # Frames handed out are still alive; the mapping is released with them
+            self._mm = None
+        self._file.close()
@@ -13,18 +13,45 @@ except ImportError:
 
 # --- 1. Standard Output/Error Redirection Class ---
 class RedirectText(object):
-    """Redirects print/stderr output to a wx.TextCtrl"""
-    def __init__(self, aWxTextCtrl):
-        self.out = aWxTextCtrl
+    """Redirects print/stderr output into a LogSink (shown by LogFlushTimer)"""
+    def __init__(self, log_sink):
+        self.out = log_sink
     def write(self, string):
         if self.out:
-            # Safely append text from a non-main thread
-            wx.CallAfter(self.out.AppendText, string)
-            # Safely scroll to the end
-            wx.CallAfter(self.out.ShowPosition, self.out.GetLastPosition()) 
+            # Thread safe: only buffers the text, the GUI flushes it in batches
+            self.out.write(string)
     def flush(self):
         pass
 
+class LogFlushTimer(wx.Timer):
+    """Moves buffered LogSink lines into a wx.TextCtrl in one batch every interval (main thread)"""
+    def __init__(self, aWxTextCtrl, log_sink, interval_ms=100):
+        super(LogFlushTimer, self).__init__()
+        self.out = aWxTextCtrl
+        self.sink = log_sink
+        self.visible_lines = 0
+        self.max_visible_lines = log_sink.history.maxlen + log_sink.history.maxlen // 2
+        self.Start(interval_ms)
+
+    def Notify(self):
+        lines = self.sink.drain()
+        if not lines or not self.out:
+            return
+        
+        self.out.Freeze()
+        try:
+            self.visible_lines += len(lines)
+            if self.visible_lines > self.max_visible_lines:
+                # Cap the visible history: redraw from the sink's ring buffer
+                history = self.sink.history_text()
+                self.out.SetValue(history + "\n")
+                self.visible_lines = history.count("\n") + 1
+            else:
+                self.out.AppendText("\n".join(lines) + "\n")
+            self.out.ShowPosition(self.out.GetLastPosition())
+        finally:
+            self.out.Thaw()
+
 # --- 2. Global Hotkey Listener Class ---
 class GlobalHotkeyListener:
     """Detects F1, F2 key presses regardless of program focus"""
@@ -0,0 +1,191 @@
+"""Headless entry point: runs FishingBotCore without the GUI (no wx / OpenGL imports).
+
+    python headless.py --area X,Y,W,H [--cast-time MIN,MAX] [--drop-threshold PX] [--config FILE] ...
+
+Settings come from the defaults, then the JSON config file (if any), then
+the command-line arguments. Example config:
+
+    {"area": [800, 300, 300, 200], "min_cast_time": 0.15, "max_cast_time": 0.35,
+     "drop_threshold": 6, "log_file": "fishing_bot.log"}
+
+Ctrl+C (or SIGTERM) stops the bot after the current step.
+"""
+import argparse
+import json
+import logging
+import logging.handlers
+import signal
+import sys
+import threading
+import time
+
+from fishing_bot_core import FishingBotCore
+from frame_source import FrameRecorder, MssFrameSource
+
+DEFAULTS = {
+    "area": None,
+    "min_cast_time": 0.15,
+    "max_cast_time": 0.35,
+    "drop_threshold": FishingBotCore.POSITION_DIFF_THRESHOLD,
+    "match_threshold": FishingBotCore.MATCH_THRESHOLD,
+    "window_title": "Albion Online Client",
+    "log_file": "fishing_bot.log",
+    "start_delay": 3.0,
+    "duration": 0.0,
+    "metrics_port": None,
+    "metrics_json": None,
+    "session_db": FishingBotCore.SESSION_DB_PATH,
+    "record": None,
+}
+
+
+def parse_numbers(text, count, cast):
+    values = [cast(v) for v in text.replace(" ", "").split(",")]
+    if len(values) != count:
+        raise argparse.ArgumentTypeError(f"expected {count} comma-separated numbers, got '{text}'")
+    return values
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description="Run the fishing bot without the GUI.")
+    parser.add_argument("--config", help="JSON config file (command-line arguments override it)")
+    parser.add_argument("--area", type=lambda s: parse_numbers(s, 4, int), help="Casting area X,Y,W,H (screen pixels)")
+    parser.add_argument("--cast-time", type=lambda s: parse_numbers(s, 2, float), help="Cast hold time MIN,MAX (seconds)")
+    parser.add_argument("--drop-threshold", type=int, help="Vertical bobber drop (pixels) that counts as a bite")
+    parser.add_argument("--match-threshold", type=float, help="Bobber template match score threshold")
+    parser.add_argument("--window-title", help="Game window to focus on start (Windows)")
+    parser.add_argument("--log-file", help="Rotating log file ('' disables it)")
+    parser.add_argument("--start-delay", type=float, help="Seconds to wait before starting (to switch to the game)")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds (0 = run until stopped)")
+    parser.add_argument("--metrics-port", type=int, help="Serve stage latency metrics at http://127.0.0.1:PORT/metrics (Prometheus)")
+    parser.add_argument("--metrics-json", help="Write a stage latency JSON snapshot to this file periodically")
+    parser.add_argument("--session-db", help="SQLite file for per-cycle session statistics (off by default)")
+    parser.add_argument("--record", metavar="PATH", help="Record every captured frame to PATH (replay with benchmarks --recording)")
+    parser.add_argument("--quiet", action="store_true", help="Do not log to stdout")
+    return parser
+
+
+def load_settings(args, parser):
+    settings = dict(DEFAULTS)
+    if args.config:
+        try:
+            with open(args.config, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read config '{args.config}': {e}")
+        unknown = set(config) - set(DEFAULTS)
+        if unknown:
+            parser.error(f"unknown config keys: {', '.join(sorted(unknown))}")
+        settings.update(config)
+
+    overrides = {
+        "area": args.area,
+        "drop_threshold": args.drop_threshold,
+        "match_threshold": args.match_threshold,
+        "window_title": args.window_title,
+        "log_file": args.log_file,
+        "start_delay": args.start_delay,
+        "duration": args.duration,
+        "metrics_port": args.metrics_port,
+        "metrics_json": args.metrics_json,
+        "session_db": args.session_db,
+        "record": args.record,
+    }
+    if args.cast_time:
+        overrides["min_cast_time"], overrides["max_cast_time"] = args.cast_time
+    settings.update({k: v for k, v in overrides.items() if v is not None})
+
+    if not settings["area"] or len(settings["area"]) != 4 or min(settings["area"][2:]) <= 0:
+        parser.error("a casting area is required (--area X,Y,W,H or \"area\" in the config file)")
+    if not 0 < settings["min_cast_time"] <= settings["max_cast_time"]:
+        parser.error("cast time must satisfy 0 < MIN <= MAX")
+    return settings
+
+
+def make_logger(log_file, quiet):
+    """Same line format as the GUI log: '[HH:MM:SS] message'."""
+    logger = logging.getLogger("fishing_bot")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    formatter = logging.Formatter("[%(asctime)s] %(message)s", datefmt="%H:%M:%S")
+    handlers = []
+    if not quiet:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    if log_file:
+        handlers.append(logging.handlers.RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
+
+
+def main():
+    parser = make_parser()
+    args = parser.parse_args()
+    settings = load_settings(args, parser)
+    logger = make_logger(settings["log_file"], args.quiet)
+    log = logger.info
+
+    casting_area_ref = {"area": tuple(settings["area"])}
+    recorder = None
+    if settings["record"]:
+        recorder = FrameRecorder(MssFrameSource(), settings["record"])
+        log(f"⏺️ Recording captured frames to {settings['record']}")
+    bot_core = FishingBotCore(casting_area_ref, log_callback=log, game_window_title=settings["window_title"],
+                              frame_source=recorder)
+    bot_core.set_cast_time(settings["min_cast_time"], settings["max_cast_time"])
+    bot_core.set_diff_threshold(settings["drop_threshold"])
+    bot_core.MATCH_THRESHOLD = settings["match_threshold"]
+    bot_core.METRICS_HTTP_PORT = settings["metrics_port"]
+    bot_core.METRICS_SNAPSHOT_PATH = settings["metrics_json"]
+    bot_core.SESSION_DB_PATH = settings["session_db"] or None
+
+    x, y, w, h = casting_area_ref["area"]
+    log(f"--- Fishing Bot headless (area X: {x}, Y: {y}, W: {w}, H: {h}; cast {settings['min_cast_time']}~{settings['max_cast_time']}s; "
+        f"drop {settings['drop_threshold']}px) ---")
+
+    stop_requested = threading.Event()
+
+    def request_stop(signum=None, frame=None):
+        if not stop_requested.is_set():
+            log("🛑 Stop requested.")
+        stop_requested.set()
+        bot_core.stop_bot()
+
+    signal.signal(signal.SIGINT, request_stop)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, request_stop)
+
+    try:
+        if settings["start_delay"] > 0:
+            log(f"⏳ Starting in {settings['start_delay']:.1f} seconds...")
+            if stop_requested.wait(settings["start_delay"]):
+                return 0
+
+        bot_core.start_bot()
+        if not bot_core.is_running.is_set():
+            return 1
+
+        deadline = time.monotonic() + settings["duration"] if settings["duration"] > 0 else None
+        while bot_core.fishing_thread.is_alive():
+            if deadline is not None and time.monotonic() >= deadline and not stop_requested.is_set():
+                log("⏰ Duration reached.")
+                request_stop()
+            # Short waits keep the main thread responsive to Ctrl+C
+            bot_core.fishing_thread.join(timeout=0.5)
+    finally:
+        bot_core.stop_bot()
+        if bot_core.fishing_thread and bot_core.fishing_thread.is_alive():
+            bot_core.fishing_thread.join(timeout=2.0)
+        bot_core.debug_preview.stop()
+        if bot_core.bobber_bank is not None:
+            bot_core.bobber_bank.close()
+        if recorder is not None:
+            recorder.close()
+            log(f"⏺️ Recorded {recorder.frame_count} frames to {settings['record']}")
+        logging.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
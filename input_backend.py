@@ -0,0 +1,177 @@
+import threading
+import time
+
+from pipeline import RunningStat
+
+try:
+    import pyautogui
+except Exception: # Needs a display; optional so the detection path can run headless
+    pyautogui = None
+
+# PyAutoGUI Fail-safe setting
+if pyautogui:
+    pyautogui.FAILSAFE = True
+
+
+# --- 1. Input Backend Interface ---
+class InputBackend:
+    """Base class for everything FishingBotCore sends input through.
+
+    Button state is tracked per button. mouse_down() / mouse_up() only send
+    real transitions: holding an already held button (or releasing a
+    released one) is counted as suppressed and costs nothing. force=True
+    sends anyway, for when the real state is unknown (start of the minigame,
+    error recovery). The state only changes once the event was sent, so a
+    backend call that raises leaves it as it was.
+
+    Every event that is sent is timed (perf_counter around the OS call) into
+    `latency[event]`; `on_event(event, seconds)` is called with the same
+    value when given.
+    """
+
+    def __init__(self, on_event=None):
+        self.on_event = on_event
+        self._lock = threading.Lock()
+        self.buttons = {}
+        self.latency = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.sent = 0
+        self.suppressed = 0
+        for stat in self.latency.values():
+            stat.reset()
+
+    # Backend primitives (no implicit pauses)
+    def _move(self, x, y, duration):
+        raise NotImplementedError
+
+    def _button(self, down, button):
+        raise NotImplementedError
+
+    def _click(self, button):
+        raise NotImplementedError
+
+    def _press(self, key):
+        raise NotImplementedError
+
+    def size(self):
+        """(width, height) of the primary screen"""
+        raise NotImplementedError
+
+    def _send(self, event, fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.sent += 1
+            stat = self.latency.get(event)
+            if stat is None:
+                stat = self.latency[event] = RunningStat()
+            stat.add(elapsed)
+        if self.on_event:
+            self.on_event(event, elapsed)
+
+    def event_latency(self, event):
+        """Mean dispatch latency of `event` so far (seconds; 0 before the first one)."""
+        stat = self.latency.get(event)
+        return stat.mean if stat is not None else 0.0
+
+    def is_down(self, button="left"):
+        return self.buttons.get(button, False)
+
+    def move_to(self, x, y, duration=0.0):
+        self._send("move", self._move, x, y, duration)
+
+    def mouse_down(self, button="left", force=False):
+        """Presses `button` unless it is already held. Returns True if an event was sent."""
+        return self._set_button(True, button, force)
+
+    def mouse_up(self, button="left", force=False):
+        """Releases `button` unless it is already released. Returns True if an event was sent."""
+        return self._set_button(False, button, force)
+
+    def _set_button(self, down, button, force):
+        with self._lock:
+            if not force and self.buttons.get(button, False) == down:
+                self.suppressed += 1
+                return False
+        self._send("mouse_down" if down else "mouse_up", self._button, down, button)
+        with self._lock: # Only once the event went out: a failed send leaves the state as it was
+            self.buttons[button] = down
+        return True
+
+    def click(self, button="left"):
+        self._send("click", self._click, button)
+        with self._lock:
+            self.buttons[button] = False
+
+    def press(self, key):
+        self._send("press", self._press, key)
+
+    def format_stats(self):
+        events = ", ".join(f"{event} {stat.count}x {stat.mean * 1000:.2f} ms" for event, stat in sorted(self.latency.items()) if stat.count)
+        return f"{self.sent} sent, {self.suppressed} redundant skipped" + (f" ({events})" if events else "")
+
+
+# --- 2. PyAutoGUI ---
+class PyAutoGuiBackend(InputBackend):
+    """Sends input with pyautogui, without its PAUSE after every call (_pause=False)."""
+
+    def __init__(self, on_event=None):
+        if pyautogui is None:
+            raise RuntimeError("pyautogui is not available; input automation is disabled.")
+        super().__init__(on_event)
+
+    def _move(self, x, y, duration):
+        pyautogui.moveTo(x, y, duration=duration, _pause=False)
+
+    def _button(self, down, button):
+        if down:
+            pyautogui.mouseDown(button=button, _pause=False)
+        else:
+            pyautogui.mouseUp(button=button, _pause=False)
+
+    def _click(self, button):
+        pyautogui.click(button=button, _pause=False)
+
+    def _press(self, key):
+        pyautogui.press(key, _pause=False)
+
+    def size(self):
+        return tuple(pyautogui.size())
+
+
+# --- 3. Recording (tests / benchmarks) ---
+class RecordingInputBackend(InputBackend):
+    """Records events instead of sending them: `events` is a list of (perf_counter time, event, args).
+
+    `event_cost` (seconds) is slept per event to stand in for a real backend's
+    OS call (or pyautogui's PAUSE) in benchmarks.
+    """
+
+    def __init__(self, screen_size=(1920, 1080), event_cost=0.0, on_event=None):
+        super().__init__(on_event)
+        self.screen_size = screen_size
+        self.event_cost = event_cost
+        self.events = []
+
+    def _record(self, event, *args):
+        if self.event_cost > 0:
+            time.sleep(self.event_cost)
+        self.events.append((time.perf_counter(), event, args))
+
+    def _move(self, x, y, duration):
+        self._record("move", x, y)
+
+    def _button(self, down, button):
+        self._record("mouse_down" if down else "mouse_up", button)
+
+    def _click(self, button):
+        self._record("click", button)
+
+    def _press(self, key):
+        self._record("press", key)
+
+    def size(self):
+        return self.screen_size
@@ -0,0 +1,77 @@
+import logging
+import logging.handlers
+import queue
+import threading
+from collections import deque
+
+
+class LogSink:
+    """Thread-safe, bounded log buffer shared by the bot log and redirected stdout/stderr.
+
+    Writers only take a lock and append to deques. A reader (the GUI flush
+    timer) drains the pending lines in batches. `history` keeps the last
+    `history_lines` lines for redrawing a capped view. With a `log_path`, every
+    line is also written to a rotating file by a background QueueListener
+    thread.
+    """
+
+    def __init__(self, history_lines=1000, log_path=None, max_bytes=5 * 1024 * 1024, backup_count=3):
+        self._lock = threading.Lock()
+        self._partial = ""
+        self.history = deque(maxlen=history_lines)
+        self._pending = deque(maxlen=history_lines)
+        self.dropped = 0 # Lines that were never drained before falling out of the pending buffer
+
+        self._listener = None
+        self._file_handler = None
+        self._file_logger = None
+        if log_path:
+            self._file_handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            self._file_handler.setFormatter(logging.Formatter("%(message)s"))
+            log_queue = queue.SimpleQueue()
+            self._listener = logging.handlers.QueueListener(log_queue, self._file_handler)
+            self._listener.start()
+
+            self._file_logger = logging.getLogger(f"{__name__}.{id(self)}")
+            self._file_logger.propagate = False
+            self._file_logger.setLevel(logging.INFO)
+            self._file_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    def write(self, text):
+        """Appends a chunk of text; complete lines become visible to drain() and the log file."""
+        with self._lock:
+            lines = (self._partial + text).split("\n")
+            self._partial = lines.pop()
+            for line in lines:
+                if len(self._pending) == self._pending.maxlen:
+                    self.dropped += 1
+                self._pending.append(line)
+                self.history.append(line)
+
+        file_logger = self._file_logger
+        if file_logger:
+            for line in lines:
+                file_logger.info(line)
+
+    def drain(self):
+        """Returns (and removes) every line written since the last drain."""
+        with self._lock:
+            lines = list(self._pending)
+            self._pending.clear()
+            return lines
+
+    def history_text(self):
+        with self._lock:
+            return "\n".join(self.history)
+
+    def close(self):
+        """Flushes any unterminated line and stops the file writer."""
+        with self._lock:
+            partial, self._partial = self._partial, ""
+        if partial:
+            self.write(partial + "\n")
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
+            self._file_handler.close()
+            self._file_logger = None
@@ -1,12 +1,10 @@
+import time
+_STARTUP_T0 = time.perf_counter() # Reference point of the startup probe (before any heavy import)
+
 import wx
 import sys
 import threading
 import os # os 모듈 추가
-from PIL import Image
-import time
-import io 
-import numpy as np
-import cv2 
 
 # --- Resource Path Utility (Crucial for PyInstaller) ---
 def resource_path(relative_path):
@@ -15,26 +13,29 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 # --- End of Resource Path Utility ---
 
-# --- Import 3D Fish Logo Module ---
-try:
-    from fish import FishGLCanvas
-except ImportError:
-    print("Error: fish_logo_3d.py not found. Please ensure it is in the same directory.")
-    sys.exit(1)
-# --- End of Fish Logo Import ---
+# The 3D fish logo (fish.py, PyOpenGL) is imported when the Settings tab is first shown, and
+# the detection engine (fishing_bot_core.py: cv2, numpy, mss, pyautogui) on a background thread
+# after the window is up; see FishingBotFrame._show_fish_canvas / _load_bot_core.
 
-# Separated module import (gui_components.py and fishing_bot_core.py must be in the same directory)
+# Separated module import (gui_components.py and log_sink.py must be in the same directory)
 try:
-    from gui_components import RedirectText, GlobalHotkeyListener, RegionSelector
-    from fishing_bot_core import FishingBotCore
+    from gui_components import RedirectText, LogFlushTimer, GlobalHotkeyListener, RegionSelector
+    from log_sink import LogSink
 except ImportError:
     # Log in English as per previous instruction
-    print("Error: gui_components.py or fishing_bot_core.py file is missing or not in the path.")
+    print("Error: gui_components.py or log_sink.py file is missing or not in the path.")
     sys.exit(1)
 
 
 class FishingBotFrame(wx.Frame):
     
+    LOG_FILE_PATH = "fishing_bot.log"  # Rotating full log (5 MB x 3 backups)
+    LOG_HISTORY_LINES = 1000           # Lines kept in the log TextCtrl
+    LOG_FLUSH_INTERVAL_MS = 100        # Batch interval for the log TextCtrl
+    DEFAULT_CAST_TIME = (0.15, 0.35)   # Initial cast hold time fields (applied to the core on START)
+    FISH_GL_SIZE = (200, 150)
+    STARTUP_PROBE_ENV = "FISHING_BOT_STARTUP_PROBE" # Set by benchmarks.startup: print startup times, then close
+    
     def __init__(self, parent, title):
         # 1. Window title set to IOSTREAM
         super(FishingBotFrame, self).__init__(parent, title='IOSTREAM', size=(300, 650)) 
@@ -51,14 +52,17 @@ class FishingBotFrame(wx.Frame):
         self.casting_area_ref = {"area": None} 
         
         self.log_text = None 
+        # Bot log + stdout/stderr: batched into the log TextCtrl, full log in a rotating file
+        self.log_sink = LogSink(history_lines=self.LOG_HISTORY_LINES, log_path=self.LOG_FILE_PATH)
         self.debug_img_bitmap = None
         self.DEBUG_IMG_SIZE = (150, 150) 
 
-        self.bot_core = FishingBotCore(
-            casting_area_ref=self.casting_area_ref,
-            log_callback=self._log_message,
-            debug_img_callback=self._update_debug_image 
-        )
+        # Created by _load_bot_core once the window is shown (None until then)
+        self.bot_core = None
+        self.fish_canvas = None
+        self._fish_canvas_failed = False
+        self._logo_frames_at_start = 0
+        self._startup_times = {}
         
         # --- GUI Setup Start ---
         panel = wx.Panel(self)
@@ -87,8 +91,9 @@ class FishingBotFrame(wx.Frame):
         self.Show()
         
         # Redirect sys.stdout/stderr after the log TextCtrl is created
-        sys.stdout = RedirectText(self.log_text)
-        sys.stderr = RedirectText(self.log_text)
+        self.log_flush_timer = LogFlushTimer(self.log_text, self.log_sink, self.LOG_FLUSH_INTERVAL_MS)
+        sys.stdout = RedirectText(self.log_sink)
+        sys.stderr = RedirectText(self.log_sink)
         
         self.hotkey_listener = GlobalHotkeyListener(
             start_callback=self.on_start_bot,
@@ -100,6 +105,74 @@ class FishingBotFrame(wx.Frame):
         self._log_message("💡 Before starting the bot, please set the fishing area and time in the [⚙️ Settings] tab.")
         
         self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Bind(wx.EVT_ICONIZE, self.on_iconize)
+        self.notebook.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, self.on_page_changed)
+        if os.environ.get(self.STARTUP_PROBE_ENV):
+            self.control_panel.Bind(wx.EVT_PAINT, self._on_first_paint)
+        
+        # Heavy imports, template loading and capture setup happen off the GUI thread
+        self.start_button.Disable()
+        self._log_message("⏳ Loading detection engine...")
+        threading.Thread(target=self._load_bot_core, daemon=True, name="CoreLoader").start()
+
+    # --- Deferred Startup ---
+    def _load_bot_core(self):
+        """Imports the detection engine and builds FishingBotCore (templates, capture) in the background"""
+        try:
+            from fishing_bot_core import FishingBotCore
+            bot_core = FishingBotCore(
+                casting_area_ref=self.casting_area_ref,
+                log_callback=self._log_message,
+                debug_img_callback=self._update_debug_image 
+            )
+            bot_core.debug_preview.size = self.DEBUG_IMG_SIZE
+        except Exception as e:
+            self._log_message(f"🛑 Detection engine failed to load: {e}")
+            return
+        wx.CallAfter(self._on_bot_core_ready, bot_core)
+
+    def _on_bot_core_ready(self, bot_core):
+        if not self: # Window closed while loading
+            bot_core.debug_preview.stop()
+            return
+        self.bot_core = bot_core
+        self.start_button.Enable()
+        self._update_debug_preview_state()
+        self._log_message("✅ Detection engine ready.")
+        self._record_startup_time("core_ready_ms")
+
+    def _on_first_paint(self, event):
+        event.Skip()
+        self.control_panel.Unbind(wx.EVT_PAINT, handler=self._on_first_paint)
+        self._record_startup_time("first_paint_ms")
+
+    def _record_startup_time(self, name):
+        """Startup probe: prints the times (ms since main.py started importing) once both are known, then closes"""
+        if not os.environ.get(self.STARTUP_PROBE_ENV) or name in self._startup_times:
+            return
+        self._startup_times[name] = (time.perf_counter() - _STARTUP_T0) * 1000
+        if len(self._startup_times) == 2:
+            times = " ".join(f"{k}={v:.1f}" for k, v in sorted(self._startup_times.items()))
+            sys.__stdout__.write(f"STARTUP {times}\n")
+            sys.__stdout__.flush()
+            wx.CallAfter(self.Close)
+
+    def _show_fish_canvas(self):
+        """Creates the 3D logo (importing PyOpenGL) the first time the Settings tab is shown"""
+        if self.fish_canvas is not None or self._fish_canvas_failed:
+            return
+        try:
+            from fish import FishGLCanvas
+        except ImportError as e:
+            self._fish_canvas_failed = True
+            self._log_message(f"⚠️ 3D logo unavailable: {e}")
+            return
+        self.fish_canvas = FishGLCanvas(self.settings_panel, size=self.FISH_GL_SIZE)
+        # Replace the placeholder spacer (index 1, between the stretch spacers)
+        self.fish_canvas_hbox.Insert(1, self.fish_canvas, 0, wx.ALL | wx.FIXED_MINSIZE, 5)
+        self.fish_canvas_hbox.Remove(2)
+        self.settings_panel.Layout()
+        self._update_fish_canvas_state()
 
     def set_window_icon(self):
         """Sets the window icon using the resource_path utility."""
@@ -118,47 +191,76 @@ class FishingBotFrame(wx.Frame):
             
     # --- Log and Image Update Methods ---
     def _log_message(self, message):
-        """Outputs messages received from BotCore to the GUI log (thread safe)"""
-        if self.log_text and self.log_text.IsShown():
-            wx.CallAfter(self._append_log_text, message)
-    
-    def _append_log_text(self, message):
+        """Outputs messages received from BotCore to the GUI log (thread safe, flushed in batches)"""
         timestamp = time.strftime("[%H:%M:%S] ")
-        self.log_text.AppendText(timestamp + message + "\n")
-        self.log_text.ShowPosition(self.log_text.GetLastPosition())
+        self.log_sink.write(timestamp + message + "\n")
 
-    def _update_debug_image(self, pil_image: Image):
-        """Displays the PIL Image passed from BotCore on wxStaticBitmap. (thread safe)"""
-        wx.CallAfter(self._apply_debug_image_to_wx, pil_image)
+    def _update_debug_image(self, rgb_image):
+        """Displays the RGB preview rendered by BotCore's debug preview worker on wxStaticBitmap. (thread safe)"""
+        wx.CallAfter(self._apply_debug_image_to_wx, rgb_image)
 
-    def _apply_debug_image_to_wx(self, pil_image: Image):
-        """Applies the PIL image to wxStaticBitmap on the main thread"""
+    def _apply_debug_image_to_wx(self, rgb_image):
+        """Applies the RGB array (already DEBUG_IMG_SIZE) to wxStaticBitmap on the main thread"""
         try:
-            # STYLE: Use a simple, smaller font for better retro look
-            font = self.debug_img_label.GetFont()
-            font.SetPointSize(9) 
-            self.debug_img_label.SetFont(font)
-            
-            resized_img = pil_image.resize(self.DEBUG_IMG_SIZE, Image.LANCZOS)
-            wx_image = wx.Image(resized_img.width, resized_img.height)
-            wx_image.SetData(resized_img.convert("RGB").tobytes()) 
-
+            height, width = rgb_image.shape[:2]
+            wx_image = wx.Image(width, height, rgb_image.tobytes())
             self.debug_img_bitmap = wx.Bitmap(wx_image)
             self.debug_img_label.SetBitmap(self.debug_img_bitmap)
             
-            self.control_panel.Layout()
-            
         except Exception as e:
             self._log_message(f"❌ Debug image display error: {e}")
 
+    def _update_debug_preview_state(self, selection=None, iconized=None):
+        """Debug preview only runs while the Control tab is visible and the window is not minimized"""
+        if self.bot_core is None:
+            return
+        if selection is None:
+            selection = self.notebook.GetSelection()
+        if iconized is None:
+            iconized = self.IsIconized()
+        visible = selection == self.notebook.FindPage(self.control_panel) and not iconized
+        self.bot_core.debug_preview.set_enabled(visible)
+
+    def _update_fish_canvas_state(self, selection=None, iconized=None):
+        """3D logo animates only while the Settings tab is visible, slowly while the bot is running"""
+        if self.fish_canvas is None:
+            return
+        if selection is None:
+            selection = self.notebook.GetSelection()
+        if iconized is None:
+            iconized = self.IsIconized()
+        self.fish_canvas.set_shown(selection == self.notebook.FindPage(self.settings_panel) and not iconized)
+        self.fish_canvas.set_low_power(self.bot_core is not None and self.bot_core.is_running.is_set())
+
+    def on_page_changed(self, event):
+        self._update_debug_preview_state(selection=event.GetSelection())
+        if event.GetSelection() == self.notebook.FindPage(self.settings_panel):
+            self._show_fish_canvas()
+        self._update_fish_canvas_state(selection=event.GetSelection())
+        event.Skip()
+
+    def on_iconize(self, event):
+        self._update_debug_preview_state(iconized=event.IsIconized())
+        self._update_fish_canvas_state(iconized=event.IsIconized())
+        event.Skip()
+
     # --- Window/Bot Control Methods ---
     def on_close(self, event):
         """Handles window close event"""
-        self.bot_core.stop_bot()
         self.hotkey_listener.stop() 
-        
-        if self.bot_core.fishing_thread and self.bot_core.fishing_thread.is_alive():
-            self.bot_core.fishing_thread.join(timeout=1.0) 
+        if self.bot_core is not None:
+            self.bot_core.stop_bot()
+            self.bot_core.debug_preview.stop()
+            
+            if self.bot_core.fishing_thread and self.bot_core.fishing_thread.is_alive():
+                self.bot_core.fishing_thread.join(timeout=1.0) 
+            if self.bot_core.bobber_bank is not None:
+                self.bot_core.bobber_bank.close()
+        
+        self.log_flush_timer.Stop()
+        sys.stdout = sys.__stdout__
+        sys.stderr = sys.__stderr__
+        self.log_sink.close()
         self.Destroy()
 
     def on_start_setting_area(self, event):
@@ -183,6 +285,9 @@ class FishingBotFrame(wx.Frame):
 
     def on_start_bot(self, event=None):
         """Bot Start button/hotkey"""
+        if self.bot_core is None:
+            self._log_message("⏳ Detection engine is still loading, please wait.")
+            return
         if self.bot_core.is_running.is_set():
             self._log_message("⚠️ Bot is already running.")
             return
@@ -199,11 +304,14 @@ class FishingBotFrame(wx.Frame):
         self.stop_button.Enable()
         
         self.bot_core.start_bot()
+        self._logo_frames_at_start = self.fish_canvas.frames_rendered if self.fish_canvas else 0
+        wx.CallAfter(self._update_fish_canvas_state)
         threading.Timer(0.1, self._check_bot_thread).start()
 
     def on_stop_bot(self, event=None):
         """Bot Stop button/hotkey"""
-        self.bot_core.stop_bot()
+        if self.bot_core is not None:
+            self.bot_core.stop_bot()
 
     def _check_bot_thread(self):
         """Checks if the bot thread has finished and updates the GUI state"""
@@ -216,6 +324,9 @@ class FishingBotFrame(wx.Frame):
         """Clean up GUI after bot loop finishes"""
         self.start_button.Enable()
         self.stop_button.Disable()
+        if self.fish_canvas is not None:
+            self._log_message(f"🐟 Logo frames rendered during the run: {self.fish_canvas.frames_rendered - self._logo_frames_at_start}")
+        self._update_fish_canvas_state()
 
     # --- UI/Area Setup Functions ---
     def _setup_settings_tab(self):
@@ -225,16 +336,13 @@ class FishingBotFrame(wx.Frame):
 
         # ----------------------------------------
         # NEW: 3D Fish Logo Canvas (NO STATIC BOX BORDER)
+        # Placeholder of the canvas size; _show_fish_canvas swaps in the canvas when the tab is first shown
         # ----------------------------------------
-        FISH_GL_SIZE = (200, 150)
-        if 'FishGLCanvas' in globals():
-            self.fish_canvas = FishGLCanvas(self.settings_panel, size=FISH_GL_SIZE)
-            
-            canvas_hbox = wx.BoxSizer(wx.HORIZONTAL)
-            canvas_hbox.AddStretchSpacer(1)
-            canvas_hbox.Add(self.fish_canvas, 0, wx.ALL | wx.FIXED_MINSIZE, 5) 
-            canvas_hbox.AddStretchSpacer(1)
-            vbox.Add(canvas_hbox, 0, wx.EXPAND | wx.ALL, 5)
+        self.fish_canvas_hbox = wx.BoxSizer(wx.HORIZONTAL)
+        self.fish_canvas_hbox.AddStretchSpacer(1)
+        self.fish_canvas_hbox.Add(self.FISH_GL_SIZE[0], self.FISH_GL_SIZE[1], 0, wx.ALL, 5)
+        self.fish_canvas_hbox.AddStretchSpacer(1)
+        vbox.Add(self.fish_canvas_hbox, 0, wx.EXPAND | wx.ALL, 5)
         # ----------------------------------------
 
         # Simplified label
@@ -281,7 +389,7 @@ class FishingBotFrame(wx.Frame):
         min_label.SetFont(standard_font)
         time_group.Add(min_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.LEFT, 5)
         
-        self.min_time_ctrl = wx.TextCtrl(self.settings_panel, value=str(self.bot_core.min_cast_time), size=(60, -1), style=wx.TE_RIGHT | wx.BORDER_SUNKEN) # Sunken border
+        self.min_time_ctrl = wx.TextCtrl(self.settings_panel, value=str(self.DEFAULT_CAST_TIME[0]), size=(60, -1), style=wx.TE_RIGHT | wx.BORDER_SUNKEN) # Sunken border
         time_group.Add(self.min_time_ctrl, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 10)
         
         # FIX: Max label
@@ -289,7 +397,7 @@ class FishingBotFrame(wx.Frame):
         max_label.SetFont(standard_font)
         time_group.Add(max_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.LEFT, 5)
 
-        self.max_time_ctrl = wx.TextCtrl(self.settings_panel, value=str(self.bot_core.max_cast_time), size=(60, -1), style=wx.TE_RIGHT | wx.BORDER_SUNKEN) # Sunken border
+        self.max_time_ctrl = wx.TextCtrl(self.settings_panel, value=str(self.DEFAULT_CAST_TIME[1]), size=(60, -1), style=wx.TE_RIGHT | wx.BORDER_SUNKEN) # Sunken border
         time_group.Add(self.max_time_ctrl, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
         
         vbox.Add(area_group, 0, wx.EXPAND | wx.ALL, 10)
@@ -305,6 +413,10 @@ class FishingBotFrame(wx.Frame):
         debug_group = wx.StaticBoxSizer(wx.VERTICAL, self.control_panel, label="Bobber Detection Real-time Debug")
         
         self.debug_img_label = wx.StaticBitmap(self.control_panel, size=self.DEBUG_IMG_SIZE)
+        # STYLE: Use a simple, smaller font for better retro look
+        font = self.debug_img_label.GetFont()
+        font.SetPointSize(9) 
+        self.debug_img_label.SetFont(font)
         self.set_default_preview_image(self.debug_img_label, self.DEBUG_IMG_SIZE[0], self.DEBUG_IMG_SIZE[1], "Detection Area (150x150)", text_color=wx.Colour(100, 100, 100))
         
         debug_hbox = wx.BoxSizer(wx.HORIZONTAL)
@@ -371,20 +483,22 @@ class FishingBotFrame(wx.Frame):
         static_bitmap.SetBitmap(bmp)
     
     def capture_and_display_preview(self, x, y, width, height):
+        if self.bot_core is None:
+            self._log_message("⏳ Detection engine is still loading; preview skipped.")
+            return
         try:
-            monitor = {"top": y, "left": x, "width": width, "height": height}
-            # The bot_core.sct must be initialized (it is in FishingBotCore)
-            sct_img = self.bot_core.sct.grab(monitor) 
+            import cv2 # Already loaded by the detection engine
             
-            # Capture data -> PIL Image conversion (stabilization)
-            img_array = np.array(sct_img, dtype=np.uint8)
+            monitor = {"top": y, "left": x, "width": width, "height": height}
+            # Capture through the bot's frame source (live, recorded or replayed)
+            img_array = self.bot_core.frame_source.grab(monitor) 
             img_array_rgb = cv2.cvtColor(img_array, cv2.COLOR_BGRA2RGB)
-            pil_img = Image.fromarray(img_array_rgb)
             
             preview_width, preview_height = 280, 140 # Adjusted to fit GUI size
-            ratio = min(preview_width / pil_img.width, preview_height / pil_img.height)
-            new_width = int(pil_img.width * ratio)
-            new_height = int(pil_img.height * ratio)
+            src_height, src_width = img_array_rgb.shape[:2]
+            ratio = min(preview_width / src_width, preview_height / src_height)
+            new_width = max(1, int(src_width * ratio))
+            new_height = max(1, int(src_height * ratio))
             
             bmp = wx.Bitmap(preview_width, preview_height)
             dc = wx.MemoryDC(bmp)
@@ -392,10 +506,8 @@ class FishingBotFrame(wx.Frame):
             dc.SetBackground(wx.Brush(wx.SystemSettings.GetColour(wx.SYS_COLOUR_WINDOW)))
             dc.Clear()
             
-            pil_img = pil_img.resize((new_width, new_height), Image.LANCZOS)
-            
-            wx_img = wx.Image(pil_img.width, pil_img.height)
-            wx_img.SetData(pil_img.convert("RGB").tobytes()) 
+            resized = cv2.resize(img_array_rgb, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
+            wx_img = wx.Image(new_width, new_height, resized.tobytes())
 
             x_offset = (preview_width - new_width) // 2
             y_offset = (preview_height - new_height) // 2
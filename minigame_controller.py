@@ -0,0 +1,124 @@
+import os
+import time
+from collections import deque
+
+
+# --- 1. Threshold Controller (original behaviour) ---
+class ThresholdController:
+    """Holds the reel while the marker is at or left of `stop_x`, releases it otherwise.
+
+    update(position, timestamp, lead) returns whether the reel should be
+    held. Every call is kept in `trajectory` as (time, position, predicted,
+    held), and changes of the held state are counted in `transitions`.
+    """
+
+    name = "threshold"
+    MAX_TRAJECTORY = 20000 # Samples kept per minigame (~2 min at 144/s)
+
+    def __init__(self, stop_x):
+        self.stop_x = stop_x
+        self.trajectory = deque(maxlen=self.MAX_TRAJECTORY)
+        self.reset()
+
+    def reset(self):
+        self.held = False
+        self.transitions = 0
+        self.trajectory.clear()
+
+    def decide(self, position, timestamp, lead):
+        return position, position <= self.stop_x
+
+    def update(self, position, timestamp=None, lead=0.0):
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        predicted, held = self.decide(position, timestamp, lead)
+        if held != self.held:
+            self.transitions += 1
+            self.held = held
+        self.trajectory.append((timestamp, position, predicted, held))
+        return held
+
+    def summary(self):
+        if not self.trajectory:
+            return {"controller": self.name, "samples": 0, "transitions": 0}
+        positions = [sample[1] for sample in self.trajectory]
+        duration = self.trajectory[-1][0] - self.trajectory[0][0]
+        return {
+            "controller": self.name,
+            "samples": len(positions),
+            "transitions": self.transitions,
+            "transitions_per_sec": self.transitions / duration if duration > 0 else 0.0,
+            "max_past_stop_px": max(0, max(positions) - self.stop_x),
+            "mean_abs_error_px": sum(abs(p - self.stop_x) for p in positions) / len(positions),
+        }
+
+    def format_summary(self):
+        s = self.summary()
+        if not s["samples"]:
+            return f"{self.name}: no samples"
+        return (f"{self.name}: {s['transitions']} transitions ({s['transitions_per_sec']:.1f}/s) over {s['samples']} samples, "
+                f"max {s['max_past_stop_px']} px past the stop column, mean error {s['mean_abs_error_px']:.1f} px")
+
+    def write_trajectory(self, directory):
+        """Writes the trajectory as CSV (t_s, position, predicted, held) into `directory`; returns the path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime("minigame_%Y%m%d_%H%M%S.csv"))
+        t0 = self.trajectory[0][0] if self.trajectory else 0.0
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("t_s,position,predicted,held\n")
+            for timestamp, position, predicted, held in self.trajectory:
+                f.write(f"{timestamp - t0:.4f},{position},{predicted:.1f},{int(held)}\n")
+        return path
+
+
+# --- 2. Predictive Controller ---
+class PredictiveController(ThresholdController):
+    """Decides on where the marker will be when the input lands, with hysteresis.
+
+    Velocity is the least-squares slope of the last `window` (time, position)
+    samples. The predicted position is position + velocity * lead, where
+    `lead` is the capture-to-input latency in seconds. The reel is released
+    once the prediction passes stop_x + hysteresis, and held again once it
+    falls below stop_x - hysteresis. Between the two bands the current state
+    is kept, so jitter around the stop column does not toggle the button.
+    """
+
+    name = "predictive"
+
+    def __init__(self, stop_x, hysteresis=1, window=5):
+        self.hysteresis = hysteresis
+        self.history = deque(maxlen=window)
+        super().__init__(stop_x)
+
+    def reset(self):
+        super().reset()
+        self.history.clear()
+        self.velocity = 0.0 # px/s
+
+    def _estimate_velocity(self):
+        n = len(self.history)
+        if n < 2:
+            return 0.0
+        mean_t = sum(t for t, _ in self.history) / n
+        mean_x = sum(x for _, x in self.history) / n
+        var_t = sum((t - mean_t) ** 2 for t, _ in self.history)
+        if var_t <= 0:
+            return 0.0
+        return sum((t - mean_t) * (x - mean_x) for t, x in self.history) / var_t
+
+    def decide(self, position, timestamp, lead):
+        self.history.append((timestamp, position))
+        self.velocity = self._estimate_velocity()
+        predicted = position + self.velocity * lead
+        if self.held:
+            held = predicted <= self.stop_x + self.hysteresis
+        else:
+            held = predicted < self.stop_x - self.hysteresis
+        return predicted, held
+
+
+def make_controller(kind, stop_x, hysteresis=1, window=5):
+    if kind == "predictive":
+        return PredictiveController(stop_x, hysteresis, window)
+    if kind == "threshold":
+        return ThresholdController(stop_x)
+    raise ValueError(f"Unknown minigame controller '{kind}' (expected 'predictive' or 'threshold').")
@@ -0,0 +1,63 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# found: a bright marker is on the line; position/width: first bright column and
+# length of its bright run; confidence: share of rows that agree on that run (0~1)
+ScanResult = namedtuple("ScanResult", ["found", "position", "width", "confidence"])
+
+
+class ScanlineAnalyzer:
+    """Finds the minigame marker (first bright column) on one or more raw BGRA scan lines.
+
+    A column counts as bright when B+G+R exceeds `roll_limit` in a majority of
+    the scanned rows, so a single noisy row cannot move the marker. The whole
+    scan is a handful of vectorized NumPy operations on the capture buffer.
+    """
+
+    def __init__(self, roll_limit):
+        self.roll_limit = roll_limit
+
+        # Per-call cost (microseconds)
+        self.last_cost_us = 0.0
+        self.total_cost_us = 0.0
+        self.scan_count = 0
+
+    def analyze(self, scan_lines):
+        """Analyzes a (rows, width, 4) BGRA array and returns a ScanResult."""
+        start = time.perf_counter()
+
+        if scan_lines.ndim == 2:
+            scan_lines = scan_lines[np.newaxis]
+        rows = scan_lines.shape[0]
+
+        rgb_sum = scan_lines[..., :3].sum(axis=2, dtype=np.uint16)
+        if rows == 1:
+            votes = (rgb_sum[0] > self.roll_limit).astype(np.uint8)
+        else:
+            votes = np.count_nonzero(rgb_sum > self.roll_limit, axis=0)
+        bright = votes * 2 > rows
+
+        position = int(bright.argmax())
+        if not bright[position]:
+            result = ScanResult(False, -1, 0, 0.0)
+        else:
+            run = bright[position:]
+            width = int(run.argmin()) if not run.all() else len(run)
+            confidence = float(votes[position:position + width].mean()) / rows
+            result = ScanResult(True, position, width, confidence)
+
+        self.last_cost_us = (time.perf_counter() - start) * 1e6
+        self.total_cost_us += self.last_cost_us
+        self.scan_count += 1
+        return result
+
+    @property
+    def mean_cost_us(self):
+        return self.total_cost_us / self.scan_count if self.scan_count else 0.0
+
+    def reset_stats(self):
+        self.last_cost_us = 0.0
+        self.total_cost_us = 0.0
+        self.scan_count = 0
@@ -0,0 +1,319 @@
+import threading
+import time
+import traceback
+from collections import deque
+
+
+# --- 1. Streaming Metric ---
+class RunningStat:
+    """Count / mean / max / last of a stream of samples (no history kept)."""
+
+    def __init__(self):
+        self.reset()
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+
+# --- 2. Frame Ring Buffer (capture -> detect) ---
+class FrameRing:
+    """Small ring of timestamped frames; the consumer always takes the newest one.
+
+    Frames that were overwritten or skipped before the consumer got to them are
+    counted as dropped.
+    """
+
+    def __init__(self, capacity=3):
+        self._frames = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._last_taken = 0
+        self.dropped = 0
+
+    def push(self, frame, monitor, timestamp):
+        with self._cond:
+            self._seq += 1
+            self._frames.append((self._seq, timestamp, monitor, frame))
+            self._cond.notify_all()
+
+    def latest(self, monitor, timeout=1.0):
+        """Waits for a frame of `monitor` newer than the last one taken and returns (timestamp, frame)."""
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while True:
+                if self._frames:
+                    seq, timestamp, frame_monitor, frame = self._frames[-1]
+                    if seq > self._last_taken and frame_monitor == monitor:
+                        if self._last_taken:
+                            self.dropped += seq - self._last_taken - 1
+                        self._last_taken = seq
+                        self._frames.clear()
+                        return timestamp, frame
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None, None
+                self._cond.wait(remaining)
+
+    def clear(self):
+        with self._cond:
+            self._frames.clear()
+            self._last_taken = self._seq
+
+    @property
+    def depth(self):
+        return len(self._frames)
+
+
+# --- 3. Capture Stage ---
+class CaptureStage(threading.Thread):
+    """Grabs the current target region in a loop and fills the frame ring.
+
+    Grabs are paced on monotonic deadlines `interval` seconds apart (see
+    FramePipeline.set_rate).
+    """
+
+    IDLE_SLEEP = 0.001  # Minimum interval between grabs (seconds)
+
+    def __init__(self, capture_engine, ring, log):
+        super().__init__(daemon=True, name="CaptureStage")
+        self.capture = capture_engine
+        self.ring = ring
+        self.log = log
+        self.running = threading.Event()
+        self._target = None
+        self._target_cond = threading.Condition()
+        self.interval = self.IDLE_SLEEP
+
+    def set_target(self, monitor):
+        with self._target_cond:
+            self._target = monitor
+            self._target_cond.notify_all()
+
+    def stop(self):
+        self.running.clear()
+        self.set_target(None)
+
+    def run(self):
+        self.running.set()
+        next_grab = time.monotonic()
+        while self.running.is_set():
+            with self._target_cond:
+                while self._target is None and self.running.is_set():
+                    self._target_cond.wait(0.1)
+                monitor = self._target
+            if monitor is None:
+                next_grab = time.monotonic()
+                continue
+
+            try:
+                frame = self.capture.grab(monitor)
+                self.ring.push(frame, monitor, self.capture.timestamp)
+            except Exception as e:
+                self.log(f"❌ Capture stage error: {e}")
+                time.sleep(0.1)
+                next_grab = time.monotonic()
+                continue
+
+            next_grab += max(self.IDLE_SLEEP, self.interval)
+            delay = next_grab - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_grab = time.monotonic() # Behind schedule: restart instead of bursting
+
+
+# --- 4. Actuator Stage ---
+class ActuatorStage(threading.Thread):
+    """Runs input actions off the detection thread, in submission order.
+
+    Actions submitted with the same `key` replace each other while still
+    pending, so only the latest desired state (e.g. mouse held / released)
+    is sent.
+    """
+
+    def __init__(self, log, max_pending=8):
+        super().__init__(daemon=True, name="ActuatorStage")
+        self.log = log
+        self.max_pending = max_pending
+        self.running = threading.Event()
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self.action_latency = RunningStat()  # submit -> executed (seconds)
+        self.coalesced = 0
+
+    def submit(self, fn, *args, key=None, **kwargs):
+        with self._cond:
+            if key is not None:
+                for i, item in enumerate(self._pending):
+                    if item[0] == key:
+                        del self._pending[i]
+                        self.coalesced += 1
+                        break
+            while len(self._pending) >= self.max_pending and self.running.is_set():
+                self._cond.wait(0.1)
+            self._pending.append((key, fn, args, kwargs, time.perf_counter()))
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout=2.0):
+        """Blocks until every submitted action has run."""
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while (self._pending or self._busy) and time.perf_counter() < deadline:
+                self._cond.wait(max(0.0, deadline - time.perf_counter()))
+            return not self._pending and not self._busy
+
+    def stop(self):
+        self.running.clear()
+        with self._cond:
+            self._cond.notify_all()
+
+    @property
+    def depth(self):
+        return len(self._pending)
+
+    def run(self):
+        self.running.set()
+        while True:
+            with self._cond:
+                while not self._pending and self.running.is_set():
+                    self._cond.wait(0.1)
+                if not self._pending:
+                    break
+                _, fn, args, kwargs, submitted = self._pending.popleft()
+                self._busy = True
+                self._cond.notify_all()
+
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                self.log(f"❌ Input action error: {e}")
+                self.log(traceback.format_exc())
+            finally:
+                self.action_latency.add(time.perf_counter() - submitted)
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+# --- 5. Pipeline ---
+class FramePipeline:
+    """capture -> detect -> decide -> act, with the detector on the caller's thread.
+
+    The capture stage keeps a ring of the newest frames of the current target
+    region; next_frame() hands the detector the newest one (older ones are
+    dropped), and dispatch() queues input on the actuator stage.
+    """
+
+    CAPTURE_RATE_HEADROOM = 1.5  # Capture this much faster than the detector consumes, so a fresh frame is usually waiting
+
+    def __init__(self, capture_engine, log, ring_capacity=3):
+        self.capture = capture_engine
+        self.log = log
+        self.ring = FrameRing(ring_capacity)
+        self.frame_age = RunningStat()  # capture -> decision (seconds)
+        self.capture_interval = CaptureStage.IDLE_SLEEP
+        self._capture_stage = None
+        self._actuator_stage = None
+
+    @property
+    def is_running(self):
+        return self._capture_stage is not None
+
+    def start(self):
+        if self.is_running:
+            return
+        self._capture_stage = CaptureStage(self.capture, self.ring, self.log)
+        self._actuator_stage = ActuatorStage(self.log)
+        self._capture_stage.interval = self.capture_interval
+        self._capture_stage.start()
+        self._actuator_stage.start()
+
+    def stop(self):
+        if not self.is_running:
+            return
+        self._capture_stage.stop()
+        self._actuator_stage.stop()
+        self._capture_stage.join(timeout=1.0)
+        self._actuator_stage.join(timeout=1.0)
+        self._capture_stage = None
+        self._actuator_stage = None
+        self.ring.clear()
+
+    def set_target(self, monitor):
+        """Sets the region the capture stage grabs (None pauses capture)."""
+        if self._capture_stage:
+            self._capture_stage.set_target(monitor)
+        self.ring.clear()
+
+    def set_rate(self, hz):
+        """Paces the capture stage for a detector running at `hz` (0 = as fast as IDLE_SLEEP allows)."""
+        self.capture_interval = 1.0 / (hz * self.CAPTURE_RATE_HEADROOM) if hz > 0 else CaptureStage.IDLE_SLEEP
+        if self._capture_stage:
+            self._capture_stage.interval = self.capture_interval
+
+    def next_frame(self, monitor, timeout=1.0):
+        """Returns the newest captured frame of `monitor` (None on timeout)."""
+        timestamp, frame = self.ring.latest(monitor, timeout)
+        if frame is not None:
+            self.frame_age.add(time.perf_counter() - timestamp)
+        return frame
+
+    @property
+    def action_latency(self):
+        """Mean submit -> executed time of input actions (seconds)."""
+        return self._actuator_stage.action_latency.mean if self._actuator_stage else 0.0
+
+    def dispatch(self, fn, *args, key=None, **kwargs):
+        self._actuator_stage.submit(fn, *args, key=key, **kwargs)
+
+    def wait_idle(self, timeout=2.0):
+        return self._actuator_stage.wait_idle(timeout) if self._actuator_stage else True
+
+    def reset_metrics(self):
+        self.frame_age.reset()
+        self.ring.dropped = 0
+        self.capture.reset_stats()
+        if self._actuator_stage:
+            self._actuator_stage.action_latency.reset()
+            self._actuator_stage.coalesced = 0
+
+    def metrics(self):
+        """Snapshot of per-stage queue depth, frame age and action latency."""
+        actuator = self._actuator_stage
+        return {
+            "capture_queue_depth": self.ring.depth,
+            "actuator_queue_depth": actuator.depth if actuator else 0,
+            "frames_captured": self.capture.grab_count,
+            "frames_dropped": self.ring.dropped,
+            "grabs_per_sec": self.capture.grabs_per_sec,
+            "frame_age_ms_mean": self.frame_age.mean * 1000,
+            "frame_age_ms_max": self.frame_age.max * 1000,
+            "decisions": self.frame_age.count,
+            "actions": actuator.action_latency.count if actuator else 0,
+            "actions_coalesced": actuator.coalesced if actuator else 0,
+            "action_latency_ms_mean": actuator.action_latency.mean * 1000 if actuator else 0.0,
+            "action_latency_ms_max": actuator.action_latency.max * 1000 if actuator else 0.0,
+        }
+
+    def format_metrics(self):
+        m = self.metrics()
+        return (f"captured {m['frames_captured']} ({m['grabs_per_sec']:.1f}/s), dropped {m['frames_dropped']}, "
+                f"frame age {m['frame_age_ms_mean']:.1f}/{m['frame_age_ms_max']:.1f} ms (mean/max), "
+                f"actions {m['actions']} (coalesced {m['actions_coalesced']}), "
+                f"action latency {m['action_latency_ms_mean']:.1f} ms, "
+                f"queues capture={m['capture_queue_depth']} actuator={m['actuator_queue_depth']}")
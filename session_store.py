@@ -0,0 +1,210 @@
+"""Per-cycle fishing statistics in SQLite, plus a throughput report.
+
+    python session_store.py report [--db fishing_sessions.db] [--sessions N]
+
+FishingBotCore records one row per cast cycle through SessionStore. Writes
+go through a background thread that commits in batches, so the fishing
+loop never waits on disk.
+"""
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    settings TEXT
+);
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL REFERENCES sessions(id),
+    started_at REAL NOT NULL,
+    cast_s REAL,
+    landing_s REAL,
+    bite_wait_s REAL,
+    bar_search_s REAL,
+    bar_search_attempts INTEGER,
+    bar_found_by TEXT,
+    minigame_s REAL,
+    cycle_s REAL,
+    outcome TEXT
+);
+CREATE INDEX IF NOT EXISTS cycles_session ON cycles(session_id);
+"""
+
+CYCLE_FIELDS = ("started_at", "cast_s", "landing_s", "bite_wait_s", "bar_search_s", "bar_search_attempts",
+                "bar_found_by", "minigame_s", "cycle_s", "outcome")
+
+# Phases of a cycle in order (column, report label)
+PHASES = (("cast_s", "cast"), ("landing_s", "landing"), ("bite_wait_s", "bite wait"),
+          ("bar_search_s", "bar search"), ("minigame_s", "minigame"))
+
+# Outcomes where the minigame window closed by itself. The window closes whether
+# the fish was caught or escaped, so these count minigames played, not fish.
+# "minigame_completed" is the same outcome in databases written before the rename.
+MINIGAME_OUTCOMES = ("minigame_closed", "minigame_completed")
+
+
+class SessionStore:
+    """Batched background writer for session and cycle rows.
+
+    start_session() and record_cycle() only put rows on a queue. The
+    writer thread owns the SQLite connection and commits every BATCH_SIZE
+    rows or BATCH_INTERVAL seconds, whichever comes first. close() flushes
+    the rest.
+    """
+
+    BATCH_SIZE = 20
+    BATCH_INTERVAL = 5.0 # Seconds
+
+    def __init__(self, path, log=print):
+        self.path = path
+        self.log = log
+        self.session_id = None
+        self._queue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._run, daemon=True, name="SessionStore")
+        self._writer.start()
+
+    def start_session(self, settings=None):
+        self.session_id = uuid.uuid4().hex[:12]
+        self._queue.put(("INSERT INTO sessions (id, started_at, settings) VALUES (?, ?, ?)",
+                         (self.session_id, time.time(), json.dumps(settings or {}))))
+        return self.session_id
+
+    def record_cycle(self, cycle):
+        """Queues one cycle (a dict with CYCLE_FIELDS keys; missing ones are stored as NULL)."""
+        if self.session_id is None:
+            return
+        columns = ", ".join(("session_id",) + CYCLE_FIELDS)
+        placeholders = ", ".join("?" * (len(CYCLE_FIELDS) + 1))
+        values = (self.session_id,) + tuple(cycle.get(field) for field in CYCLE_FIELDS)
+        self._queue.put((f"INSERT INTO cycles ({columns}) VALUES ({placeholders})", values))
+
+    def end_session(self):
+        if self.session_id is not None:
+            self._queue.put(("UPDATE sessions SET ended_at = ? WHERE id = ?", (time.time(), self.session_id)))
+            self.session_id = None
+
+    def close(self, timeout=5.0):
+        self.end_session()
+        self._queue.put(None)
+        self._writer.join(timeout)
+
+    def _run(self):
+        try:
+            conn = sqlite3.connect(self.path)
+            conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            self.log(f"❌ Session database unavailable ({self.path}): {e}")
+            return
+
+        pending = 0
+        last_commit = time.monotonic()
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.BATCH_INTERVAL)
+            except queue.Empty:
+                item = False # Timer tick: commit whatever is pending
+            if item is None:
+                stopping = True
+            elif item:
+                try:
+                    conn.execute(*item)
+                    pending += 1
+                except sqlite3.Error as e:
+                    self.log(f"❌ Session database write error: {e}")
+
+            if pending and (stopping or pending >= self.BATCH_SIZE or time.monotonic() - last_commit >= self.BATCH_INTERVAL):
+                try:
+                    conn.commit()
+                except sqlite3.Error as e:
+                    self.log(f"❌ Session database commit error: {e}")
+                pending = 0
+                last_commit = time.monotonic()
+        conn.close()
+
+
+# --- Report ---
+def load_sessions(path, last=None):
+    """[(session row dict, [cycle row dicts])] for the `last` most recent sessions (all if None)."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        query = "SELECT * FROM sessions ORDER BY started_at DESC"
+        sessions = [dict(row) for row in conn.execute(query + (" LIMIT ?" if last else ""), (last,) if last else ())]
+        result = []
+        for session in reversed(sessions):
+            cycles = [dict(row) for row in conn.execute("SELECT * FROM cycles WHERE session_id = ? ORDER BY started_at", (session["id"],))]
+            result.append((session, cycles))
+        return result
+    finally:
+        conn.close()
+
+
+def phase_breakdown(cycles):
+    """{label: total seconds} over cycles, with the unaccounted rest of the cycle time as 'other'."""
+    totals = {label: sum(c[column] or 0.0 for c in cycles) for column, label in PHASES}
+    cycle_total = sum(c["cycle_s"] or 0.0 for c in cycles)
+    totals["other (post-processing, rest)"] = max(0.0, cycle_total - sum(totals.values()))
+    return totals, cycle_total
+
+
+def format_report(sessions):
+    lines = []
+    all_cycles = []
+    for session, cycles in sessions:
+        all_cycles += cycles
+        end = session["ended_at"] or (cycles[-1]["started_at"] + (cycles[-1]["cycle_s"] or 0.0) if cycles else session["started_at"])
+        hours = max(1e-9, (end - session["started_at"]) / 3600.0)
+        minigames = sum(1 for c in cycles if c["outcome"] in MINIGAME_OUTCOMES)
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(session["started_at"]))
+        lines.append(f"{session['id']}  {started}  {hours * 60:7.1f} min  {len(cycles):4d} cycles  {minigames:4d} minigames  {minigames / hours:6.1f} minigames/h")
+
+    if not all_cycles:
+        lines.append("No cycles recorded.")
+        return "\n".join(lines)
+
+    totals, cycle_total = phase_breakdown(all_cycles)
+    lines.append("")
+    lines.append(f"Time per phase over {len(all_cycles)} cycles:")
+    for label, seconds in sorted(totals.items(), key=lambda item: -item[1]):
+        share = seconds / cycle_total * 100 if cycle_total else 0.0
+        lines.append(f"  {label:<32} {seconds / len(all_cycles):7.2f} s/cycle  {share:5.1f}%")
+    limiting = max(totals.items(), key=lambda item: item[1])[0]
+    lines.append(f"Limiting phase: {limiting}")
+
+    outcomes = {}
+    for c in all_cycles:
+        outcomes[c["outcome"]] = outcomes.get(c["outcome"], 0) + 1
+    lines.append("")
+    lines.append("Outcomes: " + ", ".join(f"{name} {count}" for name, count in sorted(outcomes.items(), key=lambda item: -item[1])))
+    attempts = [c["bar_search_attempts"] for c in all_cycles if c["bar_search_attempts"]]
+    if attempts:
+        lines.append(f"Bar search attempts: {sum(attempts) / len(attempts):.2f} per bite")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fishing session statistics.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report_parser = subparsers.add_parser("report", help="Minigames/hour per session and time per phase")
+    report_parser.add_argument("--db", default="fishing_sessions.db", help="Session database")
+    report_parser.add_argument("--sessions", type=int, help="Only the N most recent sessions")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"No session database at {args.db}")
+    print(format_report(load_sessions(args.db, args.sessions)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import bisect
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# --- 1. Streaming Histogram ---
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (seconds); no samples are kept.
+
+    Buckets grow by sqrt(2) from 10 µs to about 10 s, so quantiles are
+    estimated within one bucket (interpolated linearly). Count, sum and max
+    are exact.
+    """
+
+    BOUNDS = tuple(10e-6 * 2 ** (k / 2) for k in range(41)) # 10 µs .. ~10.5 s
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buckets = [0] * (len(self.BOUNDS) + 1) # Last bucket: above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.BOUNDS, seconds)
+        with self._lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q):
+        with self._lock:
+            buckets, count, max_value = list(self.buckets), self.count, self.max
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for index, n in enumerate(buckets):
+            if n and seen + n >= rank:
+                lower = self.BOUNDS[index - 1] if index > 0 else 0.0
+                upper = self.BOUNDS[index] if index < len(self.BOUNDS) else max_value
+                return min(max_value, lower + (upper - lower) * (rank - seen) / n)
+            seen += n
+        return max_value
+
+    def summary(self):
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "sum_s": self.total,
+            "mean_ms": mean * 1000,
+            "p50_ms": self.quantile(0.50) * 1000,
+            "p95_ms": self.quantile(0.95) * 1000,
+            "p99_ms": self.quantile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class _Span:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+# --- 2. Stage Metrics ---
+class StageMetrics:
+    """Named latency histograms fed by perf_counter spans.
+
+        with metrics.span("capture"):
+            frame = grab()
+
+    Histograms are cumulative from creation, as Prometheus counters expect.
+    """
+
+    def __init__(self, prefix="fishing_bot"):
+        self.prefix = prefix
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.histograms = {}
+
+    def histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def span(self, stage):
+        return _Span(self.histogram(stage))
+
+    def observe(self, stage, seconds):
+        self.histogram(stage).observe(seconds)
+
+    def _items(self):
+        """(stage, histogram) pairs, copied under the lock (stages are added by other threads on first use)."""
+        with self._lock:
+            return sorted(self.histograms.items())
+
+    def snapshot(self):
+        return {
+            "timestamp": time.time(),
+            "uptime_s": time.time() - self.started,
+            "stages": {stage: h.summary() for stage, h in self._items()},
+        }
+
+    def prometheus_text(self):
+        name = f"{self.prefix}_stage_seconds"
+        lines = [f"# HELP {name} Latency of fishing bot pipeline stages.", f"# TYPE {name} histogram"]
+        for stage, h in self._items():
+            with h._lock:
+                buckets, count, total = list(h.buckets), h.count, h.total
+            cumulative = 0
+            for bound, n in zip(h.BOUNDS, buckets):
+                cumulative += n
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+# --- 3. Exporter ---
+class MetricsExporter:
+    """Serves StageMetrics on a local HTTP port and/or writes periodic JSON snapshots.
+
+    GET /metrics returns the Prometheus text format and GET /metrics.json the
+    JSON snapshot. The server binds to 127.0.0.1 unless another `host` is
+    given. The snapshot file is replaced atomically every `interval` seconds
+    and once more on stop().
+    """
+
+    def __init__(self, metrics, port=None, host="127.0.0.1", snapshot_path=None, interval=10.0, log=print):
+        self.metrics = metrics
+        self.port = port
+        self.host = host
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self.log = log
+
+        self._server = None
+        self._threads = []
+        self._stop = threading.Event()
+
+    def start(self):
+        self._stop.clear()
+        if self.port:
+            try:
+                self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+            except OSError as e:
+                self.log(f"❌ Metrics endpoint could not bind {self.host}:{self.port}: {e}")
+            else:
+                self._server.daemon_threads = True
+                self._start_thread(self._server.serve_forever, "MetricsHTTP")
+                self.log(f"📈 Metrics at http://{self.host}:{self.port}/metrics")
+        if self.snapshot_path:
+            self._start_thread(self._snapshot_loop, "MetricsSnapshot")
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+        if self.snapshot_path:
+            self.write_snapshot()
+
+    def _start_thread(self, target, name):
+        thread = threading.Thread(target=target, daemon=True, name=name)
+        thread.start()
+        self._threads.append(thread)
+
+    def _snapshot_loop(self):
+        while not self._stop.wait(self.interval):
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.metrics.snapshot(), f, indent=2)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            self.log(f"❌ Metrics snapshot write error: {e}")
+
+    def _make_handler(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = metrics.prometheus_text(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(metrics.snapshot(), indent=2), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass # Keep scrapes out of the bot log
+
+        return Handler
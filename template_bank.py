@@ -0,0 +1,84 @@
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from frame_buffers import FrameBuffers
+from template_search import FftMatcher
+
+
+class TemplateBank:
+    """A set of grayscale templates of the same object, matched concurrently.
+
+    match() runs one TM_CCOEFF_NORMED match per template on a shared thread
+    pool. cv2.matchTemplate releases the GIL, so the templates use separate
+    cores and the wall-clock cost per frame stays close to a single match.
+    Templates may differ in size. The winner is the template with the highest
+    score, and its index and name are returned with the location. Each
+    template matches into its own reused result buffer, through an FftMatcher
+    that `method` ("auto", "direct" or "fft") configures.
+    """
+
+    def __init__(self, templates, names=None, workers=None, method="auto"):
+        if not templates:
+            raise ValueError("TemplateBank needs at least one template")
+        self.templates = list(templates)
+        self.names = list(names) if names else [f"template_{i}" for i in range(len(self.templates))]
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(self.templates)))
+        self._pool = None
+        self.buffers = FrameBuffers()
+        self.matchers = [FftMatcher(template, method, self.buffers, ("bank", i)) for i, template in enumerate(self.templates)]
+
+    @classmethod
+    def load(cls, primary_path, directory=None, workers=None, method="auto"):
+        """Loads `primary_path` plus every *.png in `directory` (grayscale); unreadable files are skipped."""
+        paths = [primary_path]
+        if directory:
+            paths += sorted(glob.glob(os.path.join(directory, "*.png")))
+        templates, names = [], []
+        for path in paths:
+            template = cv2.imread(path, cv2.IMREAD_GRAYSCALE) if os.path.exists(path) else None
+            if template is not None:
+                templates.append(template)
+                names.append(os.path.basename(path))
+        return cls(templates, names, workers, method) if templates else None
+
+    def __len__(self):
+        return len(self.templates)
+
+    @property
+    def max_size(self):
+        """(width, height) that fits every template; smaller search areas cannot be matched."""
+        return max(t.shape[1] for t in self.templates), max(t.shape[0] for t in self.templates)
+
+    def size(self, index):
+        h, w = self.templates[index].shape[:2]
+        return w, h
+
+    def _match_one(self, gray, index):
+        template = self.templates[index]
+        if gray.shape[0] < template.shape[0] or gray.shape[1] < template.shape[1]:
+            return -1.0, (0, 0), index
+        _, max_val, _, max_loc = cv2.minMaxLoc(self.matchers[index].match(gray))
+        return max_val, max_loc, index
+
+    def calibrate(self, gray):
+        """Measures the direct/FFT crossover of every "auto" matcher on a sample image (slow; not per frame)."""
+        return [matcher.calibrate(gray) for matcher in self.matchers if matcher.method == "auto"]
+
+    def match(self, gray):
+        """Returns (max_val, max_loc, index) of the best-scoring template in a grayscale image."""
+        if self.workers == 1:
+            results = [self._match_one(gray, i) for i in range(len(self.templates))]
+        else:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="TemplateBank")
+            results = list(self._pool.map(lambda i: self._match_one(gray, i), range(len(self.templates))))
+
+        return max(results, key=lambda r: r[0])
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
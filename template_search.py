@@ -0,0 +1,307 @@
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from frame_buffers import FrameBuffers
+
+
+class PyramidMatcher:
+    """Coarse-to-fine TM_CCOEFF_NORMED search for one template.
+
+    The image and template are downscaled `levels` times (halving each time),
+    the best few peaks of the coarse match are kept, and each is refined with a
+    full-resolution match over a small window around it. Scores returned are
+    full-resolution TM_CCOEFF_NORMED values, so thresholds mean the same thing
+    as with a direct cv2.matchTemplate. Pyramid levels and match results are
+    written into reused buffers. The full-resolution pass (levels=0) and the
+    coarse pass run through a TiledMatcher, so large images are matched in
+    tiles on `workers` threads.
+
+    Downscaling can wash out fine detail (e.g. 1-2 px stripes), so the coarse
+    peaks may miss a template that matches perfectly at full resolution. When
+    no refined candidate reaches `min_score` (the caller's acceptance
+    threshold), the full-resolution search runs instead, so the pyramid never
+    rejects what a direct search would accept. Absent templates therefore cost
+    a full search; present ones are normally found by the coarse pass.
+    """
+
+    MIN_TEMPLATE_SIDE = 8  # Coarsest level may not shrink the template below this (pixels)
+
+    def __init__(self, template, levels=2, candidates=3, coarse_threshold=0.5, refine_margin=2, workers=1, min_score=None):
+        self.template = template
+        self.min_score = min_score # None: trust the coarse pass (no full-resolution fallback)
+        self.candidates = candidates
+        self.coarse_threshold = coarse_threshold
+        self.refine_margin = refine_margin
+        self.buffers = FrameBuffers()
+        self.tiles = TiledMatcher(workers, self.buffers)
+        self.fallbacks = 0 # Searches that fell back to full resolution
+
+        # Limit the number of levels so the coarse template keeps enough detail
+        self.levels = 0
+        self.coarse_template = template
+        while self.levels < levels and min(self.coarse_template.shape[:2]) // 2 >= self.MIN_TEMPLATE_SIDE:
+            self.coarse_template = cv2.pyrDown(self.coarse_template)
+            self.levels += 1
+
+    def _coarse_peaks(self, coarse_result):
+        """Top `candidates` peaks of the coarse result, suppressing each peak's neighbourhood."""
+        peaks = []
+        c_h, c_w = self.coarse_template.shape[:2]
+        for _ in range(self.candidates):
+            _, max_val, _, max_loc = cv2.minMaxLoc(coarse_result)
+            if max_val < self.coarse_threshold:
+                break
+            peaks.append(max_loc)
+            x, y = max_loc
+            coarse_result[max(0, y - c_h // 2):y + c_h // 2 + 1, max(0, x - c_w // 2):x + c_w // 2 + 1] = -1.0
+        return peaks
+
+    def match(self, gray):
+        """Returns (max_val, max_loc) like cv2.minMaxLoc over the full-resolution match result."""
+        t_h, t_w = self.template.shape[:2]
+        img_h, img_w = gray.shape[:2]
+        if img_h < t_h or img_w < t_w:
+            return -1.0, (0, 0)
+
+        if self.levels == 0:
+            return self.tiles.match(gray, self.template, "full")
+
+        # 1. Coarse search on the downscaled image
+        coarse = gray
+        for level in range(self.levels):
+            coarse = self.buffers.pyr_down(coarse, ("level", level))
+        c_h, c_w = self.coarse_template.shape[:2]
+        if coarse.shape[0] < c_h or coarse.shape[1] < c_w:
+            return self.tiles.match(gray, self.template, "full")
+        coarse_result = self.tiles.match_map(coarse, self.coarse_template, "coarse")
+
+        # 2. Refine each candidate at full resolution
+        scale = 1 << self.levels
+        margin = scale + self.refine_margin
+        best_val, best_loc = -1.0, (0, 0)
+        for cx, cy in self._coarse_peaks(coarse_result):
+            x0 = max(0, cx * scale - margin)
+            y0 = max(0, cy * scale - margin)
+            x1 = min(img_w, cx * scale + t_w + margin)
+            y1 = min(img_h, cy * scale + t_h + margin)
+            window = gray[y0:y1, x0:x1]
+            if window.shape[0] < t_h or window.shape[1] < t_w:
+                continue
+            _, max_val, _, max_loc = cv2.minMaxLoc(self.buffers.match(window, self.template, "refine"))
+            if max_val > best_val:
+                best_val, best_loc = max_val, (x0 + max_loc[0], y0 + max_loc[1])
+
+        # 3. Nothing acceptable among the coarse candidates: confirm with the full-resolution search
+        if self.min_score is not None and best_val < self.min_score:
+            self.fallbacks += 1
+            return self.tiles.match(gray, self.template, "full")
+        return best_val, best_loc
+
+    def close(self):
+        self.tiles.close()
+
+
+class FftMatcher:
+    """TM_CCOEFF_NORMED of one template, computed directly or by correlation in the frequency domain.
+
+    The FFT path correlates the zero-mean template with the image through
+    cv2.dft and normalises with integral images, like cv2.matchTemplate does.
+    The template's spectrum is cached per padded size (getOptimalDFTSize of
+    the image shape), so a search area of a fixed shape transforms only the
+    image. Results agree with cv2.matchTemplate to within float32 rounding,
+    and flat windows score 0 as they do there.
+
+    method="auto" picks the path by image area. calibrate() times both paths
+    on crops of a sample image, and the smallest area from which FFT stays
+    faster becomes `crossover_pixels`. It takes a few hundred milliseconds,
+    so the owner runs it off the detection path (e.g. before the first cast).
+    Until then, or when direct always won (None), every area matches
+    directly, as do areas under MIN_FFT_PIXELS such as the bobber ROI.
+    """
+
+    MIN_FFT_PIXELS = 256 * 256 # Below this the direct match is always used
+    MAX_SPECTRA = 8            # Cached template spectra (one per padded image size)
+    CALIBRATION_FRACTIONS = (0.125, 0.25, 0.5, 1.0) # Crop areas timed, as fractions of the image
+    CALIBRATION_REPEATS = 2
+
+    def __init__(self, template, method="auto", buffers=None, name="fft"):
+        if method not in ("auto", "direct", "fft"):
+            raise ValueError(f"Unknown match method '{method}' (expected 'auto', 'direct' or 'fft').")
+        self.template = template
+        self.method = method
+        self.buffers = buffers if buffers is not None else FrameBuffers()
+        self.name = name
+
+        zero_mean = template.astype(np.float32) - float(template.mean())
+        self._zero_mean = zero_mean
+        self._template_norm = float(np.sqrt(np.sum(zero_mean.astype(np.float64) ** 2)))
+        self._spectra = OrderedDict()
+
+        self.crossover_pixels = None
+        self.calibrated_pixels = 0
+        self.calibration = [] # (pixels, direct ms, fft ms) per timed crop
+
+    def _spectrum(self, shape):
+        spectrum = self._spectra.get(shape)
+        if spectrum is None:
+            t_h, t_w = self.template.shape[:2]
+            padded = np.zeros(shape, np.float32)
+            padded[:t_h, :t_w] = self._zero_mean
+            spectrum = self._spectra[shape] = cv2.dft(padded, nonzeroRows=t_h)
+            if len(self._spectra) > self.MAX_SPECTRA:
+                self._spectra.popitem(last=False)
+        else:
+            self._spectra.move_to_end(shape)
+        return spectrum
+
+    def match_direct(self, gray):
+        return self.buffers.match(gray, self.template, (self.name, "direct"))
+
+    def match_fft(self, gray):
+        t_h, t_w = self.template.shape[:2]
+        img_h, img_w = gray.shape[:2]
+        res_h, res_w = img_h - t_h + 1, img_w - t_w + 1
+        shape = (cv2.getOptimalDFTSize(img_h), cv2.getOptimalDFTSize(img_w))
+        get = lambda part, shape, dtype=np.float32: self.buffers.get((self.name, part), shape, dtype)
+
+        # 1. Numerator: correlation with the zero-mean template. Its sum is zero, so subtracting
+        #    the image mean first changes nothing but keeps the float32 transform precise.
+        padded = get("padded", shape)
+        padded[:img_h, :img_w] = gray
+        padded[:img_h, :img_w] -= float(gray.mean())
+        padded[img_h:, :] = 0
+        padded[:img_h, img_w:] = 0
+        spectrum = cv2.dft(padded, dst=get("spectrum", shape), nonzeroRows=img_h)
+        product = cv2.mulSpectrums(spectrum, self._spectrum(shape), 0, get("product", shape), conjB=True)
+        correlation = cv2.idft(product, dst=get("correlation", shape), flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)
+        numerator = correlation[:res_h, :res_w]
+
+        # 2. Denominator: window standard deviation from integral images
+        sums, sq_sums = cv2.integral2(gray, get("sum", (img_h + 1, img_w + 1), np.float64),
+                                      get("sq_sum", (img_h + 1, img_w + 1), np.float64),
+                                      sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+        window = lambda s: s[t_h:, t_w:] - s[:res_h, t_w:] - s[t_h:, :res_w] + s[:res_h, :res_w]
+        window_sum, window_sq = window(sums), window(sq_sums)
+        variance = np.maximum(window_sq - window_sum * window_sum / (t_h * t_w), 0.0)
+        # Same guard as cv2.matchTemplate: (near-)flat windows score 0
+        flat = variance <= np.minimum(0.5, 10 * np.finfo(np.float32).eps * window_sq)
+        denominator = np.sqrt(variance) * self._template_norm
+
+        result = get("result", (res_h, res_w))
+        result.fill(0.0)
+        np.divide(numerator, denominator, out=result, where=~flat, casting="unsafe")
+        return np.clip(result, -1.0, 1.0, out=result)
+
+    def calibrate(self, gray):
+        """Times both paths on crops of `gray` and sets `crossover_pixels`."""
+        t_h, t_w = self.template.shape[:2]
+        img_h, img_w = gray.shape[:2]
+        timings = []
+        for fraction in self.CALIBRATION_FRACTIONS:
+            h = max(t_h, int(img_h * fraction ** 0.5))
+            w = max(t_w, int(img_w * fraction ** 0.5))
+            crop = gray[:h, :w]
+            best = []
+            for fn in (self.match_direct, self.match_fft):
+                fn(crop) # Warm up buffers and the cached spectrum
+                elapsed = []
+                for _ in range(self.CALIBRATION_REPEATS):
+                    start = time.perf_counter()
+                    fn(crop)
+                    elapsed.append(time.perf_counter() - start)
+                best.append(min(elapsed) * 1000.0)
+            timings.append((h * w, best[0], best[1]))
+
+        self.calibration = timings
+        self.calibrated_pixels = img_h * img_w
+        self.crossover_pixels = None
+        for pixels, direct_ms, fft_ms in reversed(timings):
+            if fft_ms >= direct_ms:
+                break
+            self.crossover_pixels = pixels
+        return self.crossover_pixels
+
+    def uses_fft(self, gray):
+        if self.method != "auto":
+            return self.method == "fft"
+        pixels = gray.shape[0] * gray.shape[1]
+        if pixels < self.MIN_FFT_PIXELS:
+            return False
+        return self.crossover_pixels is not None and pixels >= self.crossover_pixels
+
+    def match(self, gray):
+        """TM_CCOEFF_NORMED result map of the template over `gray` (a reused buffer)."""
+        return self.match_fft(gray) if self.uses_fft(gray) else self.match_direct(gray)
+
+
+class TiledMatcher:
+    """TM_CCOEFF_NORMED over large images, split into overlapping row tiles matched on a thread pool.
+
+    The result map is cut into horizontal bands, one per tile. Each tile is
+    the image rows its band needs (band height + template height - 1), so
+    neighbouring tiles overlap by the template height minus one and every
+    window position is scored exactly once. Tiles write straight into their
+    slice of one shared result map. Their maxima are merged as
+    cv2.minMaxLoc would: highest score, first in row-major order on ties.
+    cv2.matchTemplate releases the GIL, so the tiles run on separate cores.
+
+    Images under MIN_TILE_PIXELS, or workers=1, are matched in one pass.
+    Bands are kept at least MIN_BAND_TEMPLATES template heights tall, which
+    caps the overlap at a fraction of each tile.
+    """
+
+    MIN_TILE_PIXELS = 512 * 512
+    MIN_BAND_TEMPLATES = 4
+
+    def __init__(self, workers=None, buffers=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.buffers = buffers if buffers is not None else FrameBuffers()
+        self._pool = None
+
+    def bands(self, image_shape, template_shape):
+        """(start, end) result rows of each tile."""
+        res_h = image_shape[0] - template_shape[0] + 1
+        tiles = 1
+        if self.workers > 1 and image_shape[0] * image_shape[1] >= self.MIN_TILE_PIXELS:
+            tiles = max(1, min(self.workers, res_h // (self.MIN_BAND_TEMPLATES * template_shape[0])))
+        edges = [res_h * i // tiles for i in range(tiles + 1)]
+        return list(zip(edges[:-1], edges[1:]))
+
+    def _match_band(self, image, template, result, band):
+        y0, y1 = band
+        view = result[y0:y1]
+        cv2.matchTemplate(image[y0:y1 + template.shape[0] - 1], template, cv2.TM_CCOEFF_NORMED, result=view)
+        _, max_val, _, max_loc = cv2.minMaxLoc(view)
+        return max_val, (max_loc[0], y0 + max_loc[1])
+
+    def _run(self, image, template, name):
+        t_h, t_w = template.shape[:2]
+        result = self.buffers.get(name, (image.shape[0] - t_h + 1, image.shape[1] - t_w + 1), np.float32)
+        bands = self.bands(image.shape, template.shape)
+        if len(bands) == 1:
+            return result, [self._match_band(image, template, result, bands[0])]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="TiledMatcher")
+        return result, list(self._pool.map(lambda band: self._match_band(image, template, result, band), bands))
+
+    def match_map(self, image, template, name="tiled"):
+        """The full result map (a reused buffer), as cv2.matchTemplate returns it."""
+        return self._run(image, template, name)[0]
+
+    def match(self, image, template, name="tiled"):
+        """(max_val, max_loc) of the full result map, merged from the tiles' maxima."""
+        best_val, best_loc = -np.inf, (0, 0)
+        for max_val, max_loc in self._run(image, template, name)[1]: # Bands are in row order: earlier wins ties
+            if max_val > best_val:
+                best_val, best_loc = max_val, max_loc
+        return best_val, best_loc
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import numpy as np
+
+from debug_preview import DebugPreviewChannel
+
+
+def preview_workers():
+    return [t for t in threading.enumerate() if t.name == "DebugPreview"]
+
+
+def test_stop_then_enable_leaves_one_worker():
+    delivered = threading.Event()
+    channel = DebugPreviewChannel(lambda image: delivered.set(), size=(16, 16), max_fps=1000)
+    try:
+        for _ in range(20):
+            channel.set_enabled(True)
+            channel.stop()
+        assert preview_workers() == []
+
+        channel.set_enabled(True)
+        channel.set_enabled(True)
+        assert len(preview_workers()) == 1
+        time.sleep(0.002)
+        channel.submit(np.zeros((32, 32, 4), np.uint8), [("rect", (4, 4, 8, 8), (0, 255, 0), 1)])
+        assert delivered.wait(1.0)
+    finally:
+        channel.stop()
+    assert preview_workers() == []
+
+
+def test_render_errors_go_to_log():
+    logged = []
+    failed = threading.Event()
+
+    def deliver(image):
+        raise RuntimeError("window closed")
+
+    channel = DebugPreviewChannel(deliver, max_fps=1000, log=lambda message: (logged.append(message), failed.set()))
+    try:
+        channel.set_enabled(True)
+        time.sleep(0.002)
+        channel.submit(np.zeros((32, 32, 4), np.uint8))
+        assert failed.wait(1.0)
+    finally:
+        channel.stop()
+    assert "window closed" in logged[0]
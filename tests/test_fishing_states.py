@@ -0,0 +1,127 @@
+import pytest
+
+import fishing_bot_core
+from benchmarks.common import SyntheticFrameSource, make_core
+from fishing_bot_core import FishingBotCore
+from fishing_states import State, StateMachine
+from input_backend import RecordingInputBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_state_machine_steps_and_times_states():
+    clock = FakeClock()
+    calls = []
+
+    def handler(name, duration, next_name):
+        def run():
+            calls.append(name)
+            clock.now += duration
+            return next_name
+        return run
+
+    machine = StateMachine([
+        State("cast", handler("cast", 0.5, "landing")),
+        State("landing", handler("landing", 1.25, "cast")),
+    ], "cast", clock=clock)
+    seen = []
+    machine.add_hook(lambda state, next_name: seen.append((state.name, next_name)))
+
+    assert machine.step() == "landing"
+    assert machine.current.name == "landing"
+    assert machine.step() == "cast"
+    assert machine.step() == "landing"
+
+    assert calls == ["cast", "landing", "cast"]
+    assert seen == [("cast", "landing"), ("landing", "cast"), ("cast", "landing")]
+    stats = machine.stats()
+    assert stats["cast"]["visits"] == 2
+    assert stats["cast"]["total_s"] == pytest.approx(1.0)
+    assert stats["landing"]["max_s"] == pytest.approx(1.25)
+    assert machine.transitions[("cast", "landing")] == [2, pytest.approx(1.0)]
+
+
+def test_state_machine_stops_on_none_and_records_failed_step():
+    clock = FakeClock()
+
+    def fail():
+        clock.now += 0.25
+        raise RuntimeError("capture failed")
+
+    machine = StateMachine([State("done", lambda: None), State("fail", fail)], "done", clock=clock)
+    assert machine.step() is None
+    assert machine.current is None
+    assert machine.step() is None
+
+    machine.reset("fail")
+    with pytest.raises(RuntimeError):
+        machine.step()
+    assert machine.current is None
+    assert machine.transitions[("fail", None)] == [1, pytest.approx(0.25)]
+
+
+def test_core_runs_a_full_cycle_on_a_synthetic_screen(tmp_path, monkeypatch):
+    # Cast hold, hook delay, cleanup and rest waits are recorded instead of slept
+    sleeps = []
+    monkeypatch.setattr(fishing_bot_core.time, "sleep", sleeps.append)
+    monkeypatch.setattr(FishingBotCore, "BAR_PRIOR_FILENAME", str(tmp_path / "bar_location_prior.json"))
+
+    casting_area = (660, 300, 600, 400)
+    source = SyntheticFrameSource((1920, 1080), casting_area)
+    minigame_open = []
+
+    backend = RecordingInputBackend()
+    core = make_core(source, casting_area, input_backend=backend)
+    observe_input = backend.on_event # The core's input latency metrics
+
+    def on_event(event, seconds):
+        observe_input(event, seconds)
+        # The first reel press ends the minigame: its window (and the bar) closes
+        if event == "mouse_down" and minigame_open:
+            source.screen[:] = source.background
+            minigame_open.clear()
+
+    backend.on_event = on_event
+    core.BITE_TIMEOUT = core.MINIGAME_TIMEOUT = 5 # Fail instead of spinning when a phase misses its cue
+    core.is_running.set()
+
+    def script(state, next_name):
+        if state.name == "landing":
+            # Bite: the bobber drops past the threshold
+            x, y = source.bobber_pos
+            source.move_bobber(x, y + core.POSITION_DIFF_THRESHOLD + 2)
+        elif state.name == "bar_search":
+            # The bar's bright pixel sits left of the stop column, so the minigame reels in
+            minigame_open.append(True)
+
+    machine = core.state_machine
+    machine.reset()
+    machine.add_hook(script)
+    visited = []
+    while not visited or visited[-1] != "cleanup":
+        visited.append(machine.current.name)
+        machine.step()
+
+    assert visited == ["cast", "landing", "bite_wait", "hook", "bar_search", "minigame", "cleanup"]
+    assert machine.current.name == "cast"
+    assert core.cycle["outcome"] == "minigame_closed"
+    assert core.cycle["bar_found_by"] == "full search"
+    bar_x, bar_y, _, _ = core.current_minigame_region
+    assert (bar_x, bar_y) == source.bar_pos
+
+    events = [(event, args) for _, event, args in backend.events]
+    assert [event for event, _ in events] == [
+        "move", "mouse_down", "mouse_up", "move", # Cast
+        "move", "click",                          # Hook at the bobber
+        "mouse_up", "mouse_down", "mouse_up", "click", # Minigame: reset, reel, window closed
+        "press",                                  # Cleanup
+    ]
+    assert events[-1] == ("press", ("s",))
+    assert not backend.is_down()
+    assert 1.0 in sleeps
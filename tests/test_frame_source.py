@@ -0,0 +1,112 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.common import SyntheticFrameSource
+from fishing_bot_core import FishingBotCore
+from frame_source import RECORDING_MAGIC, FrameRecorder, FrameSource, ReplayFrameSource
+from input_backend import RecordingInputBackend
+
+
+class CountingFrameSource(FrameSource):
+    """Frames filled with the grab number, so replayed frames can be told apart."""
+
+    def __init__(self):
+        self.grabs = 0
+        self.closed = False
+
+    @property
+    def monitors(self):
+        return [{"left": 0, "top": 0, "width": 64, "height": 48}] * 2
+
+    def grab(self, monitor):
+        self.grabs += 1
+        return np.full((monitor["height"], monitor["width"], 4), self.grabs % 256, dtype=np.uint8)
+
+    def close(self):
+        self.closed = True
+
+
+def recorded_size(source, frame_shapes):
+    header = len(RECORDING_MAGIC) + 4 + len(json.dumps({"monitors": source.monitors}).encode("utf-8"))
+    return header + sum(24 + h * w * 4 for h, w in frame_shapes)
+
+
+def test_record_and_replay_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(FrameRecorder, "INITIAL_CAPACITY", 4096) # A few frames outgrow it
+    path = str(tmp_path / "session.rec")
+    source = CountingFrameSource()
+    monitor = {"left": 8, "top": 4, "width": 32, "height": 16}
+
+    recorder = FrameRecorder(source, path)
+    frames = [recorder.grab(monitor) for _ in range(5)]
+    recorder.record(np.zeros((16, 32, 4), np.uint8), monitor, timestamp=42.5)
+    assert recorder._capacity > 4096
+    recorder.close()
+
+    assert source.closed
+    assert os.path.getsize(path) == recorded_size(source, [(16, 32)] * 6)
+
+    replay = ReplayFrameSource(path)
+    try:
+        assert len(replay) == 6
+        assert replay.monitors == source.monitors
+        timestamps = [replay.frame(i)[0] for i in range(len(replay))]
+        assert timestamps[:5] == sorted(timestamps[:5]) and timestamps[5] == 42.5
+
+        for expected in frames:
+            view = replay.grab(monitor)
+            assert np.array_equal(view, expected)
+            assert not view.flags.owndata and not view.flags.writeable # A view into the mapping
+
+        # A region inside the recorded one is served as a slice of it
+        _, recorded, first = replay.frame(0)
+        assert recorded == monitor
+        replay.rewind()
+        assert np.array_equal(replay.grab({"left": 10, "top": 6, "width": 8, "height": 8}), first[2:10, 2:10])
+    finally:
+        replay.close()
+
+
+def test_replay_of_unclosed_recording_stops_at_padding(tmp_path):
+    path = str(tmp_path / "killed.rec")
+    recorder = FrameRecorder(CountingFrameSource(), path)
+    recorder.grab({"left": 0, "top": 0, "width": 64, "height": 48})
+    recorder._mm.flush() # The process dies here: no close(), the zero-filled tail stays
+
+    replay = ReplayFrameSource(path)
+    try:
+        assert len(replay) == 1
+    finally:
+        replay.close()
+        recorder.close()
+
+
+def test_core_detects_bobber_from_replay(tmp_path):
+    casting_area = (660, 300, 600, 400)
+    x, y, w, h = casting_area
+    monitor = {"left": x, "top": y, "width": w, "height": h}
+    path = str(tmp_path / "bobber.rec")
+
+    synthetic = SyntheticFrameSource((1920, 1080), casting_area)
+    with FrameRecorder(synthetic, path) as recorder:
+        for dy in (0, 2, 4):
+            synthetic.move_bobber(synthetic.bobber_home[0], synthetic.bobber_home[1] + dy)
+            recorder.grab(monitor)
+
+    b_h, b_w = synthetic.bobber.shape
+    with ReplayFrameSource(path) as replay:
+        core = FishingBotCore({"area": casting_area}, log_callback=lambda message: None, frame_source=replay,
+                              pipelined=False, input_backend=RecordingInputBackend())
+        centers = []
+        for _ in range(3):
+            gray, size, center = core._get_bobber_image()
+            core.previous_bobber_image = (gray, size, center)
+            centers.append(center)
+        with pytest.raises(EOFError):
+            replay.grab(monitor)
+
+    home_x, home_y = synthetic.bobber_home
+    assert centers == [(home_x - x + b_w // 2, home_y - y + dy + b_h // 2) for dy in (0, 2, 4)]
@@ -0,0 +1,62 @@
+import pytest
+
+from input_backend import RecordingInputBackend
+
+
+class FailingInputBackend(RecordingInputBackend):
+    """Raises on button and click events while `failing` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.failing = False
+
+    def _button(self, down, button):
+        if self.failing:
+            raise OSError("input rejected")
+        super()._button(down, button)
+
+    def _click(self, button):
+        if self.failing:
+            raise OSError("input rejected")
+        super()._click(button)
+
+
+def test_input_backend_suppresses_redundant_button_events():
+    observed = []
+    backend = RecordingInputBackend(on_event=lambda event, seconds: observed.append(event))
+
+    assert backend.mouse_down()
+    assert not backend.mouse_down()
+    assert backend.is_down()
+    assert backend.mouse_up()
+    assert not backend.mouse_up()
+    assert backend.mouse_up(force=True)
+    backend.click()
+    assert not backend.is_down()
+
+    assert [event for _, event, _ in backend.events] == ["mouse_down", "mouse_up", "mouse_up", "click"]
+    assert observed == ["mouse_down", "mouse_up", "mouse_up", "click"]
+    assert backend.sent == 4 and backend.suppressed == 2
+    assert backend.latency["mouse_up"].count == 2
+
+
+def test_input_backend_keeps_button_state_when_send_fails():
+    backend = FailingInputBackend()
+    backend.failing = True
+    with pytest.raises(OSError):
+        backend.mouse_down()
+    assert not backend.is_down()
+    assert backend.sent == 0
+
+    backend.failing = False
+    assert backend.mouse_down() # Not suppressed: the failed press never happened
+    backend.failing = True
+    with pytest.raises(OSError):
+        backend.mouse_up()
+    with pytest.raises(OSError):
+        backend.click()
+    assert backend.is_down()
+
+    backend.failing = False
+    assert backend.mouse_up()
+    assert [event for _, event, _ in backend.events] == ["mouse_down", "mouse_up"]
@@ -0,0 +1,39 @@
+import pytest
+
+from minigame_controller import PredictiveController, ThresholdController, make_controller
+
+
+def test_predictive_controller_holds_and_releases_around_the_hysteresis_band():
+    controller = PredictiveController(stop_x=100, hysteresis=2, window=1) # window=1: no velocity, predicted == position
+
+    assert not controller.update(98, timestamp=0.0) # Released: hold only below stop - hysteresis
+    assert controller.update(97, timestamp=0.1)
+    assert controller.update(102, timestamp=0.2) # Held: release only past stop + hysteresis
+    assert not controller.update(103, timestamp=0.3)
+    assert not controller.update(100, timestamp=0.4)
+    assert controller.update(90, timestamp=0.5)
+
+    assert controller.transitions == 3
+    assert [sample[3] for sample in controller.trajectory] == [False, True, True, False, False, True]
+
+
+def test_predictive_controller_projects_the_marker_by_velocity_times_lead():
+    # Marker moving right at 200 px/s towards the stop column at 100
+    samples = [(i * 0.01, 80 + 2 * i) for i in range(5)]
+
+    leading = PredictiveController(stop_x=100, hysteresis=1, window=5)
+    held = [leading.update(position, timestamp, lead=0.1) for timestamp, position in samples]
+    assert leading.velocity == pytest.approx(200.0)
+    assert leading.trajectory[-1][2] == pytest.approx(88 + 200.0 * 0.1)
+    assert held == [True, False, False, False, False] # Released at 82 px: predicted 82 + 200 * 0.1 > 101
+
+    lagging = PredictiveController(stop_x=100, hysteresis=1, window=5)
+    assert all(lagging.update(position, timestamp, lead=0.0) for timestamp, position in samples)
+    assert lagging.trajectory[-1][2] == 88
+
+
+def test_make_controller_rejects_unknown_kinds():
+    assert isinstance(make_controller("threshold", 180), ThresholdController)
+    assert isinstance(make_controller("predictive", 180), PredictiveController)
+    with pytest.raises(ValueError):
+        make_controller("pid", 180)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from minigame_scanner import ScanlineAnalyzer
+
+
+def scan_lines(rows, width, bright_rows, start, length):
+    lines = np.zeros((rows, width, 4), dtype=np.uint8)
+    for row in bright_rows:
+        lines[row, start:start + length, :3] = 255
+    return lines
+
+
+def test_scanline_majority_vote():
+    analyzer = ScanlineAnalyzer(roll_limit=600)
+
+    result = analyzer.analyze(scan_lines(3, 100, [0, 2], 40, 6))
+    assert result.found and result.position == 40 and result.width == 6
+    assert result.confidence == pytest.approx(2 / 3)
+
+    # One noisy row out of three cannot place the marker
+    assert not analyzer.analyze(scan_lines(3, 100, [1], 10, 6)).found
+
+    noisy = scan_lines(3, 100, [0, 1, 2], 70, 4)
+    noisy[0, 20:24, :3] = 255
+    assert analyzer.analyze(noisy).position == 70
+    assert analyzer.scan_count == 3
+
+
+def test_scanline_single_row_and_empty():
+    analyzer = ScanlineAnalyzer(roll_limit=400)
+    line = scan_lines(1, 260, [0], 180, 5)[0] # A single (width, 4) line
+
+    result = analyzer.analyze(line)
+    assert result == (True, 180, 5, 1.0)
+    assert analyzer.analyze(np.zeros((1, 260, 4), np.uint8)) == (False, -1, 0, 0.0)
@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+import pytest
+
+from template_search import FftMatcher, PyramidMatcher, TiledMatcher
+
+
+def textured_image(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 255, size=(shape[0] // 4 + 1, shape[1] // 4 + 1), dtype=np.uint8)
+    return cv2.resize(noise, (shape[1], shape[0]), interpolation=cv2.INTER_LINEAR)
+
+
+def direct_match(image, template):
+    _, max_val, _, max_loc = cv2.minMaxLoc(cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED))
+    return max_val, max_loc
+
+
+def test_pyramid_matcher_finds_textured_template():
+    image = textured_image((540, 960))
+    template = image[300:344, 400:606].copy()
+    matcher = PyramidMatcher(template, levels=2, min_score=0.75)
+    max_val, max_loc = matcher.match(image)
+    assert max_loc == (400, 300) and max_val == pytest.approx(1.0, abs=1e-4)
+    assert matcher.fallbacks == 0
+
+
+@pytest.mark.parametrize("offset", [(800, 500), (801, 501), (803, 501)])
+def test_pyramid_matcher_falls_back_when_downscaling_loses_the_template(offset):
+    # 1 px stripes blur flat when halved, so the coarse pass cannot see them
+    template = np.full((40, 200), 30, dtype=np.uint8)
+    template[:, ::2] = 220
+    image = np.random.default_rng(0).integers(0, 255, size=(1080, 1920), dtype=np.uint8)
+    x, y = offset
+    image[y:y + 40, x:x + 200] = template
+
+    assert PyramidMatcher(template, levels=2).match(image)[0] < 0.75 # The coarse pass alone misses it
+    matcher = PyramidMatcher(template, levels=2, min_score=0.75)
+    max_val, max_loc = matcher.match(image)
+    direct_val, direct_loc = direct_match(image, template)
+    assert max_loc == direct_loc == offset
+    assert max_val == pytest.approx(direct_val, abs=1e-5)
+    assert matcher.fallbacks == 1
+
+
+@pytest.mark.parametrize("shape", [(120, 90), (400, 600), (257, 333)])
+def test_fft_matcher_matches_cv2(shape):
+    image = textured_image(shape)
+    template = image[40:66, 30:45].copy()
+    image[10:50, 50:80] = 77 # Flat windows score 0 in both
+
+    expected = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    result = FftMatcher(template, method="fft").match(image)
+    assert result.shape == expected.shape
+    assert np.abs(result - expected).max() < 1e-5
+    assert cv2.minMaxLoc(result)[3] == cv2.minMaxLoc(expected)[3]
+
+
+def test_fft_matcher_auto_only_calibrates_when_asked():
+    image = textured_image((300, 300))
+    matcher = FftMatcher(image[10:30, 10:30].copy(), method="auto")
+    assert not matcher.uses_fft(image) # Uncalibrated: direct, without timing anything
+    assert matcher.calibrated_pixels == 0
+
+    matcher.crossover_pixels = 200 * 200
+    assert matcher.uses_fft(image)
+    assert not matcher.uses_fft(image[:100, :100]) # Under MIN_FFT_PIXELS
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3, 8])
+def test_tiled_matcher_equals_single_pass(workers):
+    image = textured_image((700, 900), seed=1)
+    template = image[300:330, 400:460].copy()
+    _, expected_val, _, expected_loc = cv2.minMaxLoc(cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED))
+
+    matcher = TiledMatcher(workers)
+    try:
+        max_val, max_loc = matcher.match(image, template)
+        assert len(matcher.bands(image.shape, template.shape)) == (1 if workers == 1 else min(workers, 5))
+    finally:
+        matcher.close()
+    assert max_loc == expected_loc
+    assert max_val == pytest.approx(expected_val, abs=1e-5)
+
+
+def test_tiled_matcher_breaks_ties_like_min_max_loc():
+    image = textured_image((800, 800), seed=2)
+    template = image[600:620, 100:140].copy()
+    image[100:120, 300:340] = template # Identical copies in different tiles
+    image[400:420, 50:90] = template
+    _, _, _, expected_loc = cv2.minMaxLoc(cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED))
+
+    matcher = TiledMatcher(4)
+    try:
+        assert matcher.match(image, template)[1] == expected_loc == (300, 100)
+    finally:
+        matcher.close()